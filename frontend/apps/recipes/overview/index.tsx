@@ -1,5 +1,6 @@
 import { Anchor, Menu, Title } from '@mantine/core'
 import { IconEdit } from '@tabler/icons-react'
+import { useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 
 import { Button } from '../../../components/Button'
@@ -7,16 +8,18 @@ import Table from '../../../components/Table'
 import View from '../../../components/View'
 import { useCommonContext } from '../../../contexts/CommonProvider'
 import { useFetch } from '../../../hooks/fetcher'
-import { type RecipeDetailRecord, type RecipeDetailRecordListAPIResponse } from '../../../types'
+import { type RecipeListPageRecordAPIResponse, type RecipeListRecord } from '../../../types'
 import { routes as recipeRoutes } from '../../recipe/routes'
 import { urls } from '../../urls'
 import { routes } from '../routes'
 
 interface RecipeOverviewInnerProps {
-  results: { recipes: RecipeDetailRecordListAPIResponse }
+  results: { recipes: RecipeListPageRecordAPIResponse }
+  onPreviousPage?: () => void
+  onNextPage?: (cursor: string) => void
 }
 
-function RecipeOverviewInner({ results }: RecipeOverviewInnerProps) {
+function RecipeOverviewInner({ results, onPreviousPage, onNextPage }: RecipeOverviewInnerProps) {
   const { currentUser } = useCommonContext()
   const navigate = useNavigate()
 
@@ -36,7 +39,7 @@ function RecipeOverviewInner({ results }: RecipeOverviewInnerProps) {
           </div>
         )}
       </div>
-      <Table<RecipeDetailRecord>
+      <Table<RecipeListRecord>
         rowIdentifier="id"
         columns={[
           {
@@ -55,7 +58,7 @@ function RecipeOverviewInner({ results }: RecipeOverviewInnerProps) {
           { header: 'Vegetarian', accessorKey: 'isVegetarian', options: { isBoolean: true } },
           { header: 'Pescatarian', accessorKey: 'isPescatarian', options: { isBoolean: true } },
         ]}
-        data={recipes.data || []}
+        data={recipes.data?.items || []}
         actionMenuItems={({ row }) => [
           <Menu.Item
             key="delete"
@@ -66,18 +69,41 @@ function RecipeOverviewInner({ results }: RecipeOverviewInnerProps) {
           </Menu.Item>,
         ]}
       />
+      <div className="flex items-center justify-end">
+        <Button.Group>
+          <Button variant="default" disabled={!onPreviousPage} onClick={onPreviousPage}>
+            Previous
+          </Button>
+          <Button
+            variant="default"
+            disabled={!recipes.data?.nextCursor}
+            onClick={() => recipes.data?.nextCursor && onNextPage?.(recipes.data.nextCursor)}
+          >
+            Next
+          </Button>
+        </Button.Group>
+      </div>
     </div>
   )
 }
 
 function RecipeOverview() {
-  const recipes = useFetch<RecipeDetailRecordListAPIResponse>(urls.recipes.list())
+  // Cursors of the pages visited so far, the last one being the current page.
+  const [cursors, setCursors] = useState<string[]>([])
+  const cursor = cursors[cursors.length - 1]
+
+  const recipes = useFetch<RecipeListPageRecordAPIResponse>(urls.recipes.list(), {
+    query: cursor ? { cursor: cursor } : undefined,
+  })
 
   return (
     <View<object, RecipeOverviewInnerProps>
       component={RecipeOverviewInner}
       results={{ recipes: recipes }}
-      componentProps={{}}
+      componentProps={{
+        onPreviousPage: cursors.length ? () => setCursors(cursors.slice(0, -1)) : undefined,
+        onNextPage: (nextCursor) => setCursors([...cursors, nextCursor]),
+      }}
       loadingProps={{ description: 'Loading recipes' }}
       errorProps={{ description: 'There was an error getting recipes. Please try again.' }}
     />
@@ -40,7 +40,6 @@ export { RecipeCreateForm } from './models/RecipeCreateForm';
 export type { RecipeCreateIn } from './models/RecipeCreateIn';
 export type { RecipeDetailRecord } from './models/RecipeDetailRecord';
 export { RecipeDetailRecordAPIResponse } from './models/RecipeDetailRecordAPIResponse';
-export { RecipeDetailRecordListAPIResponse } from './models/RecipeDetailRecordListAPIResponse';
 export { RecipeDifficulty } from './models/RecipeDifficulty';
 export type { RecipeDurationRecord } from './models/RecipeDurationRecord';
 export type { RecipeEditIn } from './models/RecipeEditIn';
@@ -51,6 +50,9 @@ export type { RecipeIngredientItemGroupRecord } from './models/RecipeIngredientI
 export type { RecipeIngredientItemRecord } from './models/RecipeIngredientItemRecord';
 export type { RecipeIngredientRecord } from './models/RecipeIngredientRecord';
 export { RecipeIngredientRecordListAPIResponse } from './models/RecipeIngredientRecordListAPIResponse';
+export type { RecipeListPageRecord } from './models/RecipeListPageRecord';
+export { RecipeListPageRecordAPIResponse } from './models/RecipeListPageRecordAPIResponse';
+export type { RecipeListRecord } from './models/RecipeListRecord';
 export type { RecipePlanItemRecord } from './models/RecipePlanItemRecord';
 export type { RecipePlanRecord } from './models/RecipePlanRecord';
 export { RecipePlanRecordListAPIResponse } from './models/RecipePlanRecordListAPIResponse';
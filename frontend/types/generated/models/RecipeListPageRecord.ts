@@ -0,0 +1,12 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { RecipeListRecord } from './RecipeListRecord';
+
+export type RecipeListPageRecord = {
+    items: Array<RecipeListRecord>;
+    nextCursor?: string;
+};
+
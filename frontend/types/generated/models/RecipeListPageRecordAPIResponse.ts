@@ -0,0 +1,23 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { RecipeListPageRecord } from './RecipeListPageRecord';
+
+export type RecipeListPageRecordAPIResponse = {
+    status: RecipeListPageRecordAPIResponse.status;
+    message?: string;
+    data?: RecipeListPageRecord;
+};
+
+export namespace RecipeListPageRecordAPIResponse {
+
+    export enum status {
+        SUCCESS = 'success',
+        ERROR = 'error',
+    }
+
+
+}
+
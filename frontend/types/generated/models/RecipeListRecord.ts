@@ -0,0 +1,26 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { RecipeDifficulty } from './RecipeDifficulty';
+import type { RecipeDurationRecord } from './RecipeDurationRecord';
+import type { RecipeStatus } from './RecipeStatus';
+
+export type RecipeListRecord = {
+    id: number;
+    title: string;
+    slug: string;
+    defaultNumPortions: number;
+    searchKeywords?: string;
+    externalId?: string;
+    externalUrl?: string;
+    status: RecipeStatus;
+    statusDisplay: string;
+    difficulty: RecipeDifficulty;
+    difficultyDisplay: string;
+    isVegetarian: boolean;
+    isPescatarian: boolean;
+    duration: RecipeDurationRecord;
+};
+
@@ -0,0 +1,126 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from django.core.management.base import BaseCommand, CommandParser
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from store_kit.utils import camelize, decamelize, is_camelcase
+
+from nest.api.parsers import decamelize_keys
+from nest.api.renderers import camelize_keys, default
+from nest.products.core.records import ProductRecord
+from nest.recipes.core.records import RecipeDetailRecord
+
+
+def _get_fake_data(model: type[BaseModel], *, num_items: int) -> dict[str, Any]:
+    """
+    Get data shaped like a record, with num_items items in every list.
+    """
+    data: dict[str, Any] = {}
+
+    for name, field in model.__fields__.items():
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+            value: Any = _get_fake_data(field.type_, num_items=num_items)
+        else:
+            value = f"{name} value"
+
+        data[name] = value if field.shape == SHAPE_SINGLETON else [value] * num_items
+
+    return data
+
+
+def _get_best_duration(func: Callable[[], Any], *, rounds: int) -> float:
+    durations = []
+
+    for _round in range(rounds):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark translating keys of large recipe and product list payloads between "
+        "snake case and camel case, comparing store_kit's camelize and decamelize "
+        "with the cached key translation used by the API renderer and parser."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--num-recipes", dest="num_recipes", default=50, type=int)
+        parser.add_argument(
+            "--num-products", dest="num_products", default=500, type=int
+        )
+        parser.add_argument(
+            "--num-items",
+            dest="num_items",
+            default=3,
+            type=int,
+            help="Number of items in every nested list, e.g. steps of a recipe.",
+        )
+        parser.add_argument("--rounds", dest="rounds", default=5, type=int)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        payloads = {
+            "recipes": [
+                _get_fake_data(RecipeDetailRecord, num_items=options["num_items"])
+                for _index in range(options["num_recipes"])
+            ],
+            "products": [
+                _get_fake_data(ProductRecord, num_items=options["num_items"])
+                for _index in range(options["num_products"])
+            ],
+        }
+
+        lines = []
+
+        for name, items in payloads.items():
+            data = {"status": "success", "message": None, "data": items}
+            camelized_data = camelize_keys(data)
+
+            if camelized_data != camelize(data):
+                raise AssertionError(f"Camelized {name} payloads are not equal.")
+
+            if decamelize_keys(camelized_data) != decamelize(camelized_data):
+                raise AssertionError(f"Decamelized {name} payloads are not equal.")
+
+            def render_before(data: Any = data) -> bytes:
+                return orjson.dumps(camelize(data), default=default)
+
+            def render_after(data: Any = data) -> bytes:
+                return orjson.dumps(camelize_keys(data), default=default)
+
+            def parse_before(data: Any = camelized_data) -> Any:
+                return decamelize(data) if is_camelcase(data) else data
+
+            def parse_after(data: Any = camelized_data) -> Any:
+                return decamelize_keys(data)
+
+            render_before_duration = _get_best_duration(
+                render_before, rounds=options["rounds"]
+            )
+            render_after_duration = _get_best_duration(
+                render_after, rounds=options["rounds"]
+            )
+            parse_before_duration = _get_best_duration(
+                parse_before, rounds=options["rounds"]
+            )
+            parse_after_duration = _get_best_duration(
+                parse_after, rounds=options["rounds"]
+            )
+
+            lines += [
+                f"{name.capitalize()} ({len(items)} items, "
+                f"{len(render_after())} bytes)",
+                f"  Render before: {render_before_duration * 1000:8.1f} ms",
+                f"  Render after:  {render_after_duration * 1000:8.1f} ms "
+                f"({render_before_duration / render_after_duration:.1f}x)",
+                f"  Parse before:  {parse_before_duration * 1000:8.1f} ms",
+                f"  Parse after:   {parse_after_duration * 1000:8.1f} ms "
+                f"({parse_before_duration / parse_after_duration:.1f}x)",
+            ]
+
+        self.stdout.write("\n".join(lines))
@@ -0,0 +1,110 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from nest.products.oda import services
+from nest.products.oda.fakes import get_fake_oda_product_dict
+from nest.products.oda.records import OdaProductDetailRecord
+
+
+def _with_comma_decimals(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Get a copy of the payload where nutrition values use comma as decimal separator.
+    """
+
+    rows = payload["detailed_info"]["local"][0]["nutrition_info_table"]["rows"]
+
+    return {
+        **payload,
+        "detailed_info": {
+            "local": [
+                {
+                    **payload["detailed_info"]["local"][0],
+                    "nutrition_info_table": {
+                        "rows": [
+                            {**row, "value": row["value"].replace(".", ",")}
+                            for row in rows
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark extracting nutrition and content values from synthetic Oda "
+        "payloads, and verify that all values are parsed, the same regardless of "
+        "decimal separator."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--num-payloads", dest="num_payloads", default=5000, type=int
+        )
+        parser.add_argument("--rounds", dest="rounds", default=5, type=int)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        num_payloads = options["num_payloads"]
+        product_responses = []
+
+        for oda_id in range(1, num_payloads + 1):
+            payload = get_fake_oda_product_dict(id=oda_id, base_url="")
+            product_responses.append(
+                (
+                    OdaProductDetailRecord(**payload),
+                    OdaProductDetailRecord(**_with_comma_decimals(payload)),
+                )
+            )
+
+        durations = []
+
+        for _round in range(options["rounds"]):
+            start = time.perf_counter()
+
+            for product_response, _comma_product_response in product_responses:
+                services._extract_nutrition_values_from_response(
+                    product_response=product_response
+                )
+                services._extract_classifier_values_from_response(
+                    product_response=product_response
+                )
+
+            durations.append(time.perf_counter() - start)
+
+        num_mismatches = 0
+        num_missing = 0
+
+        for product_response, comma_product_response in product_responses:
+            nutrition = services._extract_nutrition_values_from_response(
+                product_response=product_response
+            )
+            comma_nutrition = services._extract_nutrition_values_from_response(
+                product_response=comma_product_response
+            )
+
+            num_mismatches += nutrition != comma_nutrition
+
+            # Energy rows holds two values, every other row holds one.
+            rows = product_response.detailed_info.local[0].nutrition_info_table.rows
+            num_values = sum(value is not None for value in nutrition.dict().values())
+            num_missing += num_values != len(rows) + 1
+
+        best_duration = min(durations)
+
+        self.stdout.write(
+            "\n".join(
+                [
+                    f"Payloads:             {num_payloads}",
+                    f"Rounds:               {options['rounds']}",
+                    f"Best round:           {best_duration * 1000:.1f} ms",
+                    f"Payloads per second:  {num_payloads / best_duration:.0f}",
+                    f"Per payload:          "
+                    f"{best_duration / num_payloads * 1_000_000:.1f} µs",
+                    f"Separator mismatches: {num_mismatches}",
+                    f"Missing values:       {num_missing}",
+                ]
+            )
+        )
@@ -0,0 +1,175 @@
+import time
+from collections.abc import Callable
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from nest.core.exceptions import ApplicationError
+from nest.products.core.models import Product
+from nest.products.oda import services
+from nest.products.oda.clients import OdaClient
+from nest.products.oda.constants import ODA_SYNC_BATCH_SIZE, ODA_SYNC_MAX_WORKERS
+from nest.products.oda.fakes import FakeOdaServer
+from nest.units.models import Unit
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    if not values:
+        return 0.0
+
+    sorted_values = sorted(values)
+    index = round(percentile / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark importing and syncing products against a local stand-in for the "
+        "Oda API. All database changes are rolled back, and images are stored in a "
+        "temporary directory."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--mode",
+            dest="mode",
+            default="sync",
+            choices=["import", "sync"],
+            help="Import products one by one, or run the bulk sync.",
+        )
+        parser.add_argument(
+            "--num-products", dest="num_products", default=200, type=int
+        )
+        parser.add_argument(
+            "--latency",
+            dest="latency",
+            default=0.02,
+            type=float,
+            help="Seconds added to every response from the fake Oda API.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            dest="error_rate",
+            default=0.0,
+            type=float,
+            help="Fraction of requests responded to with 503 Service Unavailable.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            dest="max_workers",
+            default=ODA_SYNC_MAX_WORKERS,
+            type=int,
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=ODA_SYNC_BATCH_SIZE,
+            type=int,
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        num_products = options["num_products"]
+        latencies: list[float] = []
+        errors: list[ApplicationError] = []
+
+        def timed(func: Callable[..., Any]) -> Callable[..., Any]:
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except ApplicationError as exc:
+                    errors.append(exc)
+                    raise
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+            return wrapper
+
+        with (
+            TemporaryDirectory() as media_root,
+            override_settings(
+                STORAGES={
+                    **settings.STORAGES,
+                    "default": {
+                        "BACKEND": "django.core.files.storage.FileSystemStorage"
+                    },
+                },
+                MEDIA_ROOT=media_root,
+            ),
+            FakeOdaServer(
+                num_products=num_products,
+                latency=options["latency"],
+                error_rate=options["error_rate"],
+            ) as server,
+            mock.patch.multiple(
+                OdaClient,
+                enabled=True,
+                base_url=server.base_url,
+                cache_ttl=0,
+                cache_stale_ttl=0,
+            ),
+            transaction.atomic(),
+        ):
+            unit = Unit.objects.get(abbreviation="kg")
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        name=f"Product {oda_id}",
+                        gross_price=0,
+                        unit=unit,
+                        oda_id=oda_id,
+                    )
+                    for oda_id in range(1, num_products + 1)
+                ]
+            )
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+
+                if options["mode"] == "import":
+                    import_product = timed(services.import_product_from_oda)
+
+                    for oda_id in range(1, num_products + 1):
+                        try:
+                            import_product(oda_product_id=oda_id)
+                        except ApplicationError:
+                            pass
+                else:
+                    # Time each product from request until it's ready to be saved.
+                    with mock.patch.object(
+                        services,
+                        "_fetch_product_from_oda_if_changed",
+                        timed(services._fetch_product_from_oda_if_changed),
+                    ):
+                        services.sync_products_from_oda(
+                            max_workers=options["max_workers"],
+                            batch_size=options["batch_size"],
+                        )
+
+                duration = time.perf_counter() - start
+
+            num_requests = server.num_requests
+            transaction.set_rollback(True)
+
+        OdaClient.clear()
+
+        self.stdout.write(
+            "\n".join(
+                [
+                    f"Mode:                 {options['mode']}",
+                    f"Products:             {num_products}",
+                    f"Skipped products:     {len(errors)}",
+                    f"Requests:             {num_requests}",
+                    f"Duration:             {duration:.2f} s",
+                    f"Products per second:  {num_products / duration:.1f}",
+                    f"p50 latency:          {_percentile(latencies, 50) * 1000:.1f} ms",
+                    f"p99 latency:          {_percentile(latencies, 99) * 1000:.1f} ms",
+                    f"Queries per product:  {len(queries) / num_products:.1f}",
+                ]
+            )
+        )
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from nest.homes.selectors import get_active_homes
+from nest.recipes.plans.services import create_weekly_recipe_plans_for_homes
+
+
+class Command(BaseCommand):
+    help = "Create weekly recipe plans for all active homes"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--from-date",
+            dest="from_date",
+            default=None,
+            type=date.fromisoformat,
+            help="First day of the plans, defaults to next monday.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            dest="max_workers",
+            default=None,
+            type=int,
+            help="Number of processes used to solve plans, defaults to CPU count.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from_date = options["from_date"]
+
+        if from_date is None:
+            today = timezone.localdate()
+            from_date = today + timedelta(days=7 - today.weekday())
+
+        homes = get_active_homes()
+        home_ids = create_weekly_recipe_plans_for_homes(
+            homes=homes,
+            from_date=from_date,
+            auto_generated=True,
+            max_workers=options["max_workers"],
+        )
+
+        self.stdout.write(
+            f"Created weekly recipe plans for {len(home_ids)} of {len(homes)} homes"
+        )
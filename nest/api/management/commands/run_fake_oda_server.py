@@ -0,0 +1,53 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from nest.products.oda.fakes import FakeOdaServer
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in for the Oda API, serving synthetic products"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--host", dest="host", default="127.0.0.1")
+        parser.add_argument("--port", dest="port", default=8001, type=int)
+        parser.add_argument(
+            "--num-products",
+            dest="num_products",
+            default=1000,
+            type=int,
+            help="Number of products served, with ids from 1 and up.",
+        )
+        parser.add_argument(
+            "--latency",
+            dest="latency",
+            default=0.0,
+            type=float,
+            help="Seconds added to every response.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            dest="error_rate",
+            default=0.0,
+            type=float,
+            help="Fraction of requests responded to with 503 Service Unavailable.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        server = FakeOdaServer(
+            num_products=options["num_products"],
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            host=options["host"],
+            port=options["port"],
+        )
+
+        self.stdout.write(
+            f"Serving {server.num_products} fake Oda products, "
+            f"run with ODA_SERVICE_ENABLED=true ODA_SERVICE_BASE_URL={server.base_url}"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
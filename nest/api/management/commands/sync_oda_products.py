@@ -0,0 +1,33 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from nest.products.oda.constants import ODA_SYNC_BATCH_SIZE, ODA_SYNC_MAX_WORKERS
+from nest.products.oda.services import sync_products_from_oda
+
+
+class Command(BaseCommand):
+    help = "Refresh all synced products from Oda"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--max-workers",
+            dest="max_workers",
+            default=ODA_SYNC_MAX_WORKERS,
+            type=int,
+            help="Number of concurrent requests made to Oda.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=ODA_SYNC_BATCH_SIZE,
+            type=int,
+            help="Number of products written per transaction.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        num_synced = sync_products_from_oda(
+            max_workers=options["max_workers"], batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(f"Synced {num_synced} products from Oda")
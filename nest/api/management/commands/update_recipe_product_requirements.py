@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from nest.recipes.core.models import Recipe
+from nest.recipes.plans.services import update_recipe_product_requirements
+
+
+class Command(BaseCommand):
+    help = "Recalculate product requirements used when generating recipe plans"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        recipe_ids = list(Recipe.objects.values_list("id", flat=True))
+        update_recipe_product_requirements(recipe_ids=recipe_ids)
+
+        self.stdout.write(f"Updated product requirements for {len(recipe_ids)} recipes")
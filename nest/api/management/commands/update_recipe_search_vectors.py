@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from nest.recipes.core.models import Recipe
+from nest.recipes.core.services import update_recipe_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search vectors used when searching recipes"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        recipe_ids = list(Recipe.objects.values_list("id", flat=True))
+        update_recipe_search_vectors(recipe_ids=recipe_ids)
+
+        self.stdout.write(f"Updated search vectors for {len(recipe_ids)} recipes")
@@ -1,9 +1,63 @@
+import functools
+from collections.abc import Mapping
 from typing import Any
 
 import orjson
 from django.http import HttpRequest
 from ninja.parser import Parser
-from store_kit.utils import decamelize, is_camelcase
+from store_kit.utils import camelize, decamelize
+
+# Number of distinct keys to remember the snake case version of. Keys are field
+# names of forms and schemas, so there are only a few hundred in practice.
+DECAMELIZE_KEY_CACHE_SIZE = 4096
+
+
+class _NotCamelCase(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=DECAMELIZE_KEY_CACHE_SIZE)
+def decamelize_key(key: str) -> str | None:
+    """
+    Get the snake case version of a camel case key, or None if the key isn't camel
+    case.
+    """
+    if camelize(key) != key:
+        return None
+
+    decamelized_key: str = decamelize(key)  # type: ignore
+    return decamelized_key
+
+
+def _decamelize_keys(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_decamelize_keys(value) for value in data]
+    if isinstance(data, Mapping):
+        decamelized_data = {}
+
+        for key, value in data.items():
+            decamelized_key = decamelize_key(key)
+
+            if decamelized_key is None:
+                raise _NotCamelCase
+
+            decamelized_data[decamelized_key] = _decamelize_keys(value)
+
+        return decamelized_data
+    return data
+
+
+def decamelize_keys(data: Any) -> Any:
+    """
+    Convert the keys of a dict, or list of dicts, to snake case if all keys are camel
+    case, the same way as store_kit's is_camelcase and decamelize. Otherwise, data is
+    returned as is. Each distinct key is only converted once, after that it's a dict
+    lookup.
+    """
+    try:
+        return _decamelize_keys(data)
+    except _NotCamelCase:
+        return data
 
 
 class CamelCaseParser(Parser):
@@ -15,9 +69,4 @@ class CamelCaseParser(Parser):
 
     def parse_body(self, request: HttpRequest) -> Any:
         data = orjson.loads(request.body)
-
-        if is_camelcase(data):
-            decamelized_data = decamelize(data)
-            return decamelized_data
-
-        return data
+        return decamelize_keys(data)
@@ -1,12 +1,34 @@
 import decimal
+import functools
+import gzip
+import hashlib
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import orjson
-from django.http import HttpRequest
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from ninja.renderers import BaseRenderer
+from pydantic import BaseModel
 from store_kit.utils import camelize
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+API_RESPONSE_CACHE_KEY = "api-response:{key}"
+
+# Number of distinct keys to remember the camel case version of. Keys are field
+# names of records, so there are only a few hundred in practice.
+CAMELIZE_KEY_CACHE_SIZE = 4096
+
+# Responses smaller than this are not worth compressing.
+GZIP_MIN_LENGTH = 200
+GZIP_ACCEPT_ENCODING_RE = re.compile(r"\bgzip\b")
+
 
 def default(obj: Any) -> Any:
     if isinstance(obj, decimal.Decimal):
@@ -16,6 +38,30 @@ def default(obj: Any) -> Any:
     return obj
 
 
+@functools.lru_cache(maxsize=CAMELIZE_KEY_CACHE_SIZE)
+def camelize_key(key: str) -> str:
+    camelized_key: str = camelize(key)  # type: ignore
+    return camelized_key
+
+
+def camelize_keys(data: Any) -> Any:
+    """
+    Convert the keys of a dict, or list of dicts, to camel case, the same way as
+    store_kit's camelize. Each distinct key is only converted once, after that it's
+    a dict lookup.
+    """
+    if isinstance(data, list):
+        return [camelize_keys(value) for value in data]
+    if isinstance(data, Mapping):
+        return {
+            camelize_key(key) if isinstance(key, str) else camelize(key): (
+                camelize_keys(value)
+            )
+            for key, value in data.items()
+        }
+    return data
+
+
 class CamelCaseRenderer(BaseRenderer):
     """
     Render that renders data as camel case, and uses orjson to parse it.
@@ -24,5 +70,114 @@ class CamelCaseRenderer(BaseRenderer):
     media_type = "application/json"
 
     def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
-        camelized_data = camelize(data)
+        camelized_data = camelize_keys(data)
         return orjson.dumps(camelized_data, default=default)
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """
+    A rendered response body, with a gzipped copy and ETag, as stored in the cache.
+    """
+
+    content: bytes
+    gzip_content: bytes | None
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "RenderedResponse":
+        gzip_content = (
+            gzip.compress(content, mtime=0) if len(content) >= GZIP_MIN_LENGTH else None
+        )
+
+        return cls(
+            content=content,
+            gzip_content=(
+                gzip_content
+                if gzip_content is not None and len(gzip_content) < len(content)
+                else None
+            ),
+            etag=f'"{hashlib.sha256(content).hexdigest()}"',
+        )
+
+    def to_response(self, request: HttpRequest) -> HttpResponse:
+        etags = parse_etags(request.headers.get("If-None-Match", ""))
+
+        if self.etag in etags or "*" in etags:
+            response = HttpResponse(status=304)
+        elif self.gzip_content is not None and GZIP_ACCEPT_ENCODING_RE.search(
+            request.headers.get("Accept-Encoding", "")
+        ):
+            response = HttpResponse(
+                self.gzip_content, content_type=CamelCaseRenderer.media_type
+            )
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                self.content, content_type=CamelCaseRenderer.media_type
+            )
+
+        response["ETag"] = self.etag
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        return response
+
+
+def cache_response(*, key: Callable[..., str]) -> Callable[[F], F]:
+    """
+    Decorator that caches the rendered response of an endpoint, so that repeated
+    requests skip the endpoint, serialization and rendering. The key is called with
+    the request and the endpoint's arguments, and must change whenever the response
+    does, e.g. by including a version. Responses has an ETag, and requests with a
+    matching If-None-Match header gets an empty 304 response.
+    """
+
+    renderer = CamelCaseRenderer()
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def inner(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+            cache_key = API_RESPONSE_CACHE_KEY.format(key=key(request, **kwargs))
+            rendered_response: RenderedResponse | None = cache.get(cache_key)
+
+            if rendered_response is None:
+                result = func(request, *args, **kwargs)
+
+                # Responses with custom status codes or headers are not cached.
+                if isinstance(result, (HttpResponse, tuple)):
+                    return result
+
+                rendered_response = RenderedResponse.from_content(
+                    renderer.render(request, result.dict(), response_status=200)
+                )
+                cache.set(cache_key, rendered_response)
+
+            return rendered_response.to_response(request)
+
+        return inner  # type: ignore
+
+    return decorator
+
+
+def _render_list_envelope(records: Iterable[BaseModel]) -> Iterator[bytes]:
+    yield b'{"status":"success","message":null,"data":['
+
+    separator = b""
+
+    for record in records:
+        yield separator + orjson.dumps(camelize_keys(record.dict()), default=default)
+        separator = b","
+
+    yield b"]}"
+
+
+def stream_response(*, data: Iterable[BaseModel]) -> StreamingHttpResponse:
+    """
+    Render a successful list response one record at a time, so that the full list is
+    never held in memory. The body is equal to rendering an APIResponse of the same
+    records, pass an iterator, e.g. of a queryset fetched in chunks, as data to keep
+    memory usage flat regardless of the number of records.
+    """
+    return StreamingHttpResponse(
+        _render_list_envelope(data), content_type=CamelCaseRenderer.media_type
+    )
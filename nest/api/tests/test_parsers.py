@@ -30,3 +30,25 @@ class TestAPIParsers:
         # Assert that data has been converted, matching it to the
         # snake_cased data.
         assert parsed_camel_case_data == data
+
+    def test_camel_case_parser_mixed_case(self) -> None:
+        """
+        Test that data where some keys are not camel case is left as is, also when
+        the keys are nested.
+        """
+
+        parser = CamelCaseParser()
+        data = {"firstName": "Test", "items": [{"unit_id": 1, "isActive": True}]}
+
+        request = HttpRequest()
+        request._body = orjson.dumps(data)
+
+        assert parser.parse_body(request) == data
+
+        data["items"][0] = {"unitId": 1, "isActive": True}
+        request._body = orjson.dumps(data)
+
+        assert parser.parse_body(request) == {
+            "first_name": "Test",
+            "items": [{"unit_id": 1, "is_active": True}],
+        }
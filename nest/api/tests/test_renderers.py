@@ -1,6 +1,19 @@
+import gzip
+from unittest.mock import MagicMock
+
 import orjson
+from django.core.cache import cache
+from django.test import RequestFactory
+from pydantic import BaseModel
+from store_kit.utils import camelize
 
-from nest.api.renderers import CamelCaseRenderer
+from nest.api.renderers import (
+    CamelCaseRenderer,
+    cache_response,
+    camelize_keys,
+    stream_response,
+)
+from nest.api.responses import APIResponse
 
 
 class TestAPIRenderers:
@@ -19,3 +32,89 @@ class TestAPIRenderers:
         expected_output = {"firstName": "Test", "lastName": "User", "isActive": True}
 
         assert actual_output == expected_output
+
+    def test_camelize_keys(self) -> None:
+        """
+        Test that camelize_keys converts keys the same way as store_kit's camelize,
+        leaving values as is.
+        """
+
+        data = {
+            "first_name": "snake_case_value",
+            "items": [{"is_active": True, "unit_id": 1}, "list_value", 1],
+            "nested": {"api_response": None, "ID": 1, 1: "numeric"},
+        }
+
+        assert camelize_keys(data) == camelize(data)
+        assert camelize_keys(data)["items"][0] == {"isActive": True, "unitId": 1}
+
+    def test_cache_response(self) -> None:
+        """
+        Test that the cache response decorator serves rendered responses from the
+        cache, gzipped if accepted, and responds with 304 to matching ETags.
+        """
+
+        cache.clear()
+        request_factory = RequestFactory()
+        data = {"first_name": "Test", "last_name": "User" * 100}
+        view_mock = MagicMock(return_value=APIResponse(status="success", data=data))
+        view = cache_response(key=lambda request, pk: f"test:{pk}")(view_mock)
+
+        response = view(request_factory.get("/"), pk=1)
+
+        assert orjson.loads(response.content)["data"]["firstName"] == "Test"
+        assert response["Vary"] == "Accept-Encoding"
+
+        etag = response["ETag"]
+        gzip_response = view(
+            request_factory.get("/", HTTP_ACCEPT_ENCODING="gzip, br"), pk=1
+        )
+
+        assert view_mock.call_count == 1
+        assert gzip_response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(gzip_response.content) == response.content
+        assert gzip_response["ETag"] == etag
+
+        not_modified_response = view(
+            request_factory.get("/", HTTP_IF_NONE_MATCH=etag), pk=1
+        )
+
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.content == b""
+
+        # Other keys are rendered separately.
+        view(request_factory.get("/", HTTP_IF_NONE_MATCH=etag), pk=2)
+
+        assert view_mock.call_count == 2
+
+    def test_stream_response(self) -> None:
+        """
+        Test that stream response renders records one by one, to the same body as
+        rendering a list response of the records.
+        """
+
+        class UserRecord(BaseModel):
+            first_name: str
+            is_active: bool
+
+        renderer = CamelCaseRenderer()
+        records = [
+            UserRecord(first_name="Test", is_active=True),
+            UserRecord(first_name="Other", is_active=False),
+        ]
+
+        for data in (records, records[:1], []):
+            response = stream_response(data=iter(data))
+            expected_content = renderer.render(
+                None,
+                APIResponse(status="success", data=data).dict(),
+                response_status=200,
+            )
+
+            assert response.streaming
+            assert response["Content-Type"] == "application/json"
+            assert response.getvalue() == expected_content
+
+        streamed_content = list(stream_response(data=records).streaming_content)
+
+        assert len(streamed_content) == len(records) + 2
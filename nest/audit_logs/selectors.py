@@ -1,7 +1,8 @@
 from typing import Type, TypeVar
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Model
+from django.db.models import F, Model, Window
+from django.db.models.functions import RowNumber
 
 from nest.core.types import FetchedResult
 
@@ -30,11 +31,9 @@ def get_log_entries_for_objects(
     *, model: Type[T_MODEL], ids: list[int], limit: int | None = None
 ) -> FetchedResult[list[LogEntryRecord]]:
     result: FetchedResult[list[LogEntryRecord]] = {}
-    result_count: FetchedResult[int] = {}
 
     for pk in ids:
         result[pk] = []
-        result_count[pk] = 0
 
     instance_content_type = ContentType.objects.get_for_model(model)
     log_entries = (
@@ -43,10 +42,18 @@ def get_log_entries_for_objects(
         .order_by("-created_at")
     )
 
-    for log_entry in log_entries:
-        if limit and result_count[log_entry.object_id] >= limit:
-            continue
+    # Limit the number of log entries per object in the database, rather than
+    # fetching every entry of every object.
+    if limit:
+        log_entries = log_entries.annotate(
+            object_row_number=Window(
+                RowNumber(),
+                partition_by=F("object_id"),
+                order_by=F("created_at").desc(),
+            )
+        ).filter(object_row_number__lte=limit)
 
+    for log_entry in log_entries:
         result[log_entry.object_id].append(
             LogEntryRecord(
                 id=log_entry.id,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import functools
 from types import TracebackType
-from typing import Any, Callable, Type, TypeVar, cast
+from typing import Any, Callable, Iterable, Type, TypeVar, cast
 
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Model
@@ -79,6 +79,50 @@ def log_create_or_updated(
     return created_log_entry
 
 
+def bulk_log_create_or_updated(
+    *,
+    instances: Iterable[tuple[Model | None, Model]],
+    source: str | None = None,
+    ignore_fields: set[str] | None = None,
+) -> int:
+    """
+    Same as log_create_or_updated, but for many (old, new) pairs at once. Diffs are
+    calculated in memory from concrete fields only, so related objects are never
+    fetched, and all log entries are created in a single query. Returns the number of
+    created log entries.
+    """
+
+    ignored_fields = {"updated_at", "created_at"} | (ignore_fields or set())
+    log_entries = []
+
+    for old, new in instances:
+        fields = {
+            field.name
+            for field in new._meta.get_fields()
+            if field.concrete and field.name not in ignored_fields
+        }
+        diff = calculate_models_diff(old=old, new=new, fields=fields)
+
+        if diff is None:
+            continue
+
+        instance_pk = LogEntry.objects._get_pk_value(instance=new)
+        log_entries.append(
+            LogEntry(
+                content_type=ContentType.objects.get_for_model(new),
+                object_repr=smart_str(new),
+                object_id=instance_pk if isinstance(instance_pk, int) else None,
+                action=LogEntry.ACTION_UPDATE if old else LogEntry.ACTION_CREATE,
+                changes=diff,
+                source=source,
+            )
+        )
+
+    LogEntry.objects.bulk_create(log_entries)
+
+    return len(log_entries)
+
+
 def _create_log_entry(
     *,
     request: HttpRequest | None,
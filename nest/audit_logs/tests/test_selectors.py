@@ -3,6 +3,7 @@ import pytest
 from nest.audit_logs.selectors import (
     get_log_entries_for_instance,
     get_log_entries_for_object,
+    get_log_entries_for_objects,
 )
 from nest.audit_logs.tests.utils import create_log_entry
 from nest.products.core.models import Product
@@ -63,3 +64,34 @@ class TestAuditLogsSelectors:
 
         assert len(log_entries) == 2
         assert len(no_log_entries) == 0
+
+    def test_get_log_entries_for_objects_limit(self, django_assert_max_num_queries):
+        """
+        Test that the get_log_entries_for_objects selector returns at most limit of
+        the newest log entries per object.
+        """
+        author = create_user()
+        product1 = create_product()
+        product2 = create_product()
+
+        for index in range(3):
+            create_log_entry(
+                instance=product1,
+                user=author,
+                changes={"name": (f"Name {index}", f"Name {index + 1}")},
+            )
+
+        create_log_entry(
+            instance=product2, user=author, changes={"name": ("Old name", "New name")}
+        )
+
+        with django_assert_max_num_queries(2):
+            log_entries = get_log_entries_for_objects(
+                model=Product, ids=[product1.id, product2.id], limit=2
+            )
+
+        assert [entry.changes["name"] for entry in log_entries[product1.id]] == [
+            ["Name 2", "Name 3"],
+            ["Name 1", "Name 2"],
+        ]
+        assert len(log_entries[product2.id]) == 1
@@ -6,6 +6,7 @@ from nest.audit_logs.models import LogEntry
 from nest.audit_logs.services import (
     AuditLogger,
     _create_log_entry,
+    bulk_log_create_or_updated,
     log_create,
     log_create_or_updated,
     log_delete,
@@ -45,6 +46,43 @@ class TestAuditLogServices:
 
         assert action_create_entry.action == LogEntry.ACTION_CREATE
 
+    def test_bulk_log_create_or_updated(self, django_assert_max_num_queries):
+        """
+        Test that the bulk_log_create_or_updated service creates log entries with the
+        correct action for every changed pair in a single query, and skips unchanged
+        pairs.
+        """
+        product = create_product(name="A name")
+        unchanged_product = create_product(name="Unchanged")
+        old_product = deepcopy(product)
+        product.name = "A new name"
+
+        with django_assert_max_num_queries(2):
+            num_log_entries = bulk_log_create_or_updated(
+                instances=[
+                    (old_product, product),
+                    (None, unchanged_product),
+                    (unchanged_product, unchanged_product),
+                ],
+                source="Test",
+            )
+
+        assert num_log_entries == 2
+
+        update_entry = LogEntry.objects.get(
+            object_id=product.id, action=LogEntry.ACTION_UPDATE
+        )
+        assert update_entry.changes == {"name": ["A name", "A new name"]}
+        assert update_entry.source == "Test"
+
+        create_entry = LogEntry.objects.get(
+            object_id=unchanged_product.id, action=LogEntry.ACTION_CREATE
+        )
+        assert create_entry.changes["name"] == ["None", "Unchanged"]
+        assert not LogEntry.objects.filter(
+            object_id=unchanged_product.id, action=LogEntry.ACTION_UPDATE
+        ).exists()
+
     def test__create_log_entry(self, django_assert_max_num_queries):
         """
         Test that the _create_log_entry service correctly creates a log entry with
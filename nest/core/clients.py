@@ -1,18 +1,27 @@
+import asyncio
 import functools
 import threading
 import uuid
+import weakref
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, ClassVar, Type, TypeVar
 
+import httpx
 import structlog
 from pydantic import BaseModel
 from requests import Response, Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from nest.core.records import HTTPPoolStatsRecord
+
 T_BASE_MODEL = TypeVar("T_BASE_MODEL", bound=BaseModel)
 
 logger = structlog.getLogger()
 init_lock = threading.Lock()
+transport_lock = threading.Lock()
 threadlocal = threading.local()
 
 
@@ -30,7 +39,19 @@ class BaseHTTPClient:
     # Url prepended to all calls.
     base_url: str
 
+    # Connection pooling. The transport, and its connection pools, is shared between
+    # all instances of a client class, so pool_maxsize should be at least the number
+    # of threads making concurrent requests.
+    pool_connections: int = 10  # Number of hosts to keep connection pools for.
+    pool_maxsize: int = 10  # Number of connections kept alive per host.
+
+    # Retry policy.
+    retries: int = 1
+    retry_backoff: float = 0.4
+    retry_status_forcelist: tuple[int, ...] = (502, 503, 504)
+
     _thread_prop: ClassVar[str | None]
+    _transport: ClassVar[HTTPAdapter]
 
     class RequestError(RuntimeError):
         """
@@ -60,6 +81,9 @@ class BaseHTTPClient:
             )
 
         self._session = Session()
+        transport = self.get_transport()
+        self._session.mount("http://", transport)
+        self._session.mount("https://", transport)
 
     @classmethod
     def init(cls) -> Any:
@@ -124,6 +148,57 @@ class BaseHTTPClient:
     def get_auth_token(self) -> str | None:
         return self.auth_token
 
+    def _get_request_headers(self, *, headers: dict[str, str] | None) -> dict[str, str]:
+        headers = {**headers} if headers is not None else {}
+
+        if self.auth_token_prefix is not None:
+            # Add auth token to request.
+            auth_token = self.get_auth_token()
+            if auth_token:
+                headers.update(
+                    {"Authorization": f"{self.auth_token_prefix} {auth_token}"}
+                )
+
+        return headers
+
+    @classmethod
+    @contextmanager
+    def stream(
+        cls,
+        url: str,
+        *,
+        method: str = "GET",
+        headers: dict[str, str] | None = None,
+        timeout: tuple[float, float] | None = None,
+    ) -> Iterator[Response | None]:
+        """
+        Make a request to an absolute url without reading the response body, allowing
+        it to be consumed in chunks. Yields None if the client is disabled.
+        """
+
+        instance = cls.init()
+        headers = instance._get_request_headers(headers=headers)
+
+        if not instance.enabled:
+            logger.warning(
+                "Faking HTTP request",
+                name=instance.name,
+                method=method,
+                url=url,
+                headers=headers,
+            )
+            yield None
+            return
+
+        with instance._session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            timeout=timeout if timeout is not None else instance.request_timeout,
+            stream=True,
+        ) as response:
+            yield response
+
     @classmethod
     def _request(
         cls,
@@ -146,19 +221,10 @@ class BaseHTTPClient:
         if url[0] != "/":
             raise ValueError(f"Request URL must start with a /, but the URL was: {url}")
 
-        if headers is None:
-            headers = {}
-
         if status_codes is None:
             status_codes = tuple(range(200, 300))
 
-        if cls.auth_token_prefix is not None:
-            # Add auth token to request.
-            auth_token = instance.get_auth_token()
-            if auth_token:
-                headers.update(
-                    {"Authorization": f"{instance.auth_token_prefix} {auth_token}"}
-                )
+        headers = instance._get_request_headers(headers=headers)
 
         if not instance.enabled:
             logger.warning(
@@ -174,8 +240,7 @@ class BaseHTTPClient:
             return None
 
         url = f"{instance.base_url}{url}"
-        session = cls.create_retry_session(session=instance._session)
-        response = session.request(
+        response: Response = instance._session.request(
             method=method,
             url=url,
             params=params,
@@ -205,27 +270,332 @@ class BaseHTTPClient:
     delete = functools.partialmethod(_request, method="DELETE")
 
     @classmethod
-    def create_retry_session(
-        cls,
-        session: Session,
-        retries: int = 1,
-        backoff: float = 0.4,
-        status_forcelist: tuple[int, ...] = (502, 503, 504),
-    ) -> Session:
+    def create_transport(cls) -> HTTPAdapter:
         """
-        Retry on connection failures and bad status codes.
+        Create a transport that retries on connection failures and bad status codes.
         """
 
-        session = session or Session()
         retry = Retry(
-            total=retries,
-            read=retries,
-            connect=retries,
-            backoff_factor=backoff,
-            status_forcelist=status_forcelist,
+            total=cls.retries,
+            read=cls.retries,
+            connect=cls.retries,
+            backoff_factor=cls.retry_backoff,
+            status_forcelist=cls.retry_status_forcelist,
+        )
+
+        return HTTPAdapter(
+            pool_connections=cls.pool_connections,
+            pool_maxsize=cls.pool_maxsize,
+            max_retries=retry,
+        )
+
+    @classmethod
+    def get_transport(cls) -> HTTPAdapter:
+        """
+        Get the transport for the client class, creating it on first use.
+        """
+
+        with transport_lock:
+            # Look up the class' own attribute, so that subclasses don't share the
+            # transport of their parent.
+            if "_transport" not in cls.__dict__:
+                cls._transport = cls.create_transport()
+
+        return cls._transport
+
+    @classmethod
+    def get_pool_stats(cls) -> HTTPPoolStatsRecord:
+        """
+        Get connection pool counters for the client class, useful for verifying that
+        connections are reused.
+        """
+
+        pool_manager = cls.get_transport().poolmanager
+        pools = [pool_manager.pools[key] for key in pool_manager.pools.keys()]
+        num_connections = sum(pool.num_connections for pool in pools)
+        num_requests = sum(pool.num_requests for pool in pools)
+
+        return HTTPPoolStatsRecord(
+            num_pools=len(pools),
+            num_connections=num_connections,
+            num_requests=num_requests,
+            num_reused_connections=num_requests - num_connections,
+        )
+
+
+class AsyncBaseHTTPClient:
+    """
+    Asyncio-native sibling of BaseHTTPClient. Requests made from the same event loop
+    share a connection pool, and the number of concurrent requests to a single host is
+    limited, allowing callers to fan out many requests with asyncio.gather.
+    """
+
+    name: str = "base"
+
+    # Authentication
+    auth_token_prefix: str | None = "Token"
+    auth_token: str | None = None
+
+    # Meta
+    enabled: bool = False
+    request_timeout = (5.0, 20.0)  # (Connect timeout, Read timeout).
+
+    # Url prepended to all calls.
+    base_url: str
+
+    # Connection pooling and concurrency.
+    pool_maxsize: int = 100  # Number of connections kept in the shared pool.
+    max_connections_per_host: int = 10  # Number of concurrent requests per host.
+
+    # Retry policy.
+    retries: int = 1
+    retry_backoff: float = 0.4
+    retry_status_forcelist: tuple[int, ...] = (502, 503, 504)
+
+    # Clients are bound to the event loop they're used in, so keep one per loop.
+    _clients: ClassVar[
+        weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]
+    ]
+    _host_semaphores: ClassVar[
+        weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, defaultdict[str, asyncio.Semaphore]
+        ]
+    ]
+
+    RequestError = BaseHTTPClient.RequestError
+
+    @classmethod
+    def create_client(cls) -> httpx.AsyncClient:
+        """
+        Create a client with a connection pool that retries on connection failures.
+        """
+
+        connect_timeout, read_timeout = cls.request_timeout
+        transport = httpx.AsyncHTTPTransport(
+            retries=cls.retries,
+            limits=httpx.Limits(
+                max_connections=cls.pool_maxsize,
+                max_keepalive_connections=cls.pool_maxsize,
+            ),
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
 
-        return session
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            follow_redirects=False,
+        )
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """
+        Get the client for the running event loop, creating it on first use.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        with transport_lock:
+            # Look up the class' own attribute, so that subclasses don't share the
+            # clients of their parent.
+            if "_clients" not in cls.__dict__:
+                cls._clients = weakref.WeakKeyDictionary()
+                cls._host_semaphores = weakref.WeakKeyDictionary()
+
+            if loop not in cls._clients:
+                cls._clients[loop] = cls.create_client()
+                cls._host_semaphores[loop] = defaultdict(
+                    lambda: asyncio.Semaphore(cls.max_connections_per_host)
+                )
+
+        return cls._clients[loop]
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """
+        Close the client for the running event loop.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        if "_clients" in cls.__dict__ and loop in cls._clients:
+            client = cls._clients.pop(loop)
+            cls._host_semaphores.pop(loop, None)
+            await client.aclose()
+
+    @classmethod
+    def serialize_response(
+        cls, serializer_cls: Type[T_BASE_MODEL], response: httpx.Response | None
+    ) -> T_BASE_MODEL:
+        """
+        Performs the mundane task of verifying that the response retrieved adders to
+        the expected structure, raising a pydantic.error_wrappers.ValidationError if it
+        doesn't, that the model populated with data if it does.
+        """
+
+        if not response:
+            raise cls.RequestError(
+                status_code=400, body="Response to serialize is None"
+            )
+
+        serializer: T_BASE_MODEL = serializer_cls(**response.json())
+        return serializer
+
+    @classmethod
+    def parse_response_error(cls, *, response: httpx.Response) -> None:
+        """
+        Override this method to implement a custom response parser. This can be used
+        to raise a more detailed exception than the one recieved from the response.
+        """
+
+        raise NotImplementedError()
+
+    @classmethod
+    def get_auth_token(cls) -> str | None:
+        return cls.auth_token
+
+    @classmethod
+    def _get_request_headers(cls, *, headers: dict[str, str] | None) -> dict[str, str]:
+        headers = {**headers} if headers is not None else {}
+
+        if cls.auth_token_prefix is not None:
+            # Add auth token to request.
+            auth_token = cls.get_auth_token()
+            if auth_token:
+                headers.update(
+                    {"Authorization": f"{cls.auth_token_prefix} {auth_token}"}
+                )
+
+        return headers
+
+    @classmethod
+    async def send(cls, *, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request to an absolute url, waiting for a free slot if the concurrency
+        limit for the host is reached, and retrying on bad status codes.
+        """
+
+        client = cls.get_client()
+
+        async with cls._get_host_semaphore(url=url):
+            for attempt in range(cls.retries + 1):
+                response = await client.request(method, url, **kwargs)
+
+                if (
+                    response.status_code not in cls.retry_status_forcelist
+                    or attempt == cls.retries
+                ):
+                    break
+
+                await asyncio.sleep(cls.retry_backoff * 2**attempt)
+
+        return response
+
+    @classmethod
+    @asynccontextmanager
+    async def stream(
+        cls,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response | None]:
+        """
+        Send a request to an absolute url without reading the response body, allowing
+        it to be consumed in chunks. The request counts towards the concurrency limit
+        for the host until the response is closed. Yields None if the client is
+        disabled.
+        """
+
+        headers = cls._get_request_headers(headers=headers)
+
+        if not cls.enabled:
+            logger.warning(
+                "Faking HTTP request",
+                name=cls.name,
+                method=method,
+                url=url,
+                headers=headers,
+            )
+            yield None
+            return
+
+        client = cls.get_client()
+
+        async with cls._get_host_semaphore(url=url):
+            async with client.stream(
+                method, url, headers=headers, **kwargs
+            ) as response:
+                yield response
+
+    @classmethod
+    def _get_host_semaphore(cls, *, url: str) -> asyncio.Semaphore:
+        cls.get_client()
+        return cls._host_semaphores[asyncio.get_running_loop()][httpx.URL(url).host]
+
+    @classmethod
+    async def _request(
+        cls,
+        url: str,
+        *,
+        method: str,
+        params: dict[str, str] | None = None,
+        data: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: tuple[float, float] | None = None,
+        status_codes: tuple[int, ...] | None = None,
+    ) -> httpx.Response | None:
+        """
+        Make a request with a given method and parameters.
+        """
+
+        if url[0] != "/":
+            raise ValueError(f"Request URL must start with a /, but the URL was: {url}")
+
+        if status_codes is None:
+            status_codes = tuple(range(200, 300))
+
+        headers = cls._get_request_headers(headers=headers)
+
+        if not cls.enabled:
+            logger.warning(
+                "Faking HTTP request",
+                name=cls.name,
+                method=method,
+                url=url,
+                params=params,
+                headers=headers,
+                data=data,
+                json=json,
+            )
+            return None
+
+        response = await cls.send(
+            method=method,
+            url=f"{cls.base_url}{url}",
+            params=params,
+            headers=headers,
+            data=data,
+            json=json,
+            timeout=(
+                httpx.Timeout(timeout[1], connect=timeout[0])
+                if timeout is not None
+                else httpx.USE_CLIENT_DEFAULT
+            ),
+        )
+
+        if response.status_code not in status_codes:
+            try:
+                cls.parse_response_error(response=response)
+            except NotImplementedError:
+                pass
+
+            raise cls.RequestError(status_code=response.status_code, body=response.text)
+
+        return response
+
+    get = functools.partialmethod(_request, method="GET")
+    post = functools.partialmethod(_request, method="POST")
+    put = functools.partialmethod(_request, method="PUT")
+    patch = functools.partialmethod(_request, method="PATCH")
+    delete = functools.partialmethod(_request, method="DELETE")
@@ -6,3 +6,10 @@ class TableRecord(BaseModel):
     parent_key: str | None = None
     title: str
     value: str
+
+
+class HTTPPoolStatsRecord(BaseModel):
+    num_pools: int
+    num_connections: int
+    num_requests: int
+    num_reused_connections: int
@@ -1,8 +1,14 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
 import pytest
 from pydantic import BaseModel
 from pydantic.error_wrappers import ValidationError as PydanticValidationError
 
-from nest.core.clients import BaseHTTPClient
+from nest.core.clients import AsyncBaseHTTPClient, BaseHTTPClient
 
 
 class TestClientBaseHTTPClient:
@@ -88,3 +94,204 @@ class TestClientBaseHTTPClient:
             http_client.serialize_response(
                 serializer_cls=TestModelParent, response=invalid_response
             )
+
+    def test_stream(self, http_client, request_mock, mocker):
+        """
+        Test that streamed requests go to the absolute url with auth headers applied,
+        and that a disabled client does not make the request.
+        """
+
+        request_mock.get("http://example.com/image.jpg", content=b"image")
+
+        with http_client.stream("http://example.com/image.jpg") as response:
+            assert b"".join(response.iter_content()) == b"image"
+
+        assert request_mock.call_count == 1
+        assert request_mock.request_history[0].headers["Authorization"] == (
+            "Token token"
+        )
+        assert request_mock.request_history[0].timeout == http_client.request_timeout
+
+        mocker.patch.object(http_client, "enabled", False)
+
+        with http_client.stream("http://example.com/image.jpg") as response:
+            assert response is None
+
+        assert request_mock.call_count == 1
+
+    def test_connection_reuse(self):
+        """
+        Test that the transport is shared between all instances of a client class, and
+        that connections are kept alive and reused between requests.
+        """
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        class HTTPClient(BaseHTTPClient):
+            enabled = True
+            base_url = f"http://127.0.0.1:{server.server_port}"
+
+        try:
+            for _ in range(3):
+                HTTPClient.get("/foo")
+
+            # Requests from other threads uses their own client instance, but
+            # should share the connection pool.
+            thread = threading.Thread(target=HTTPClient.get, args=("/foo",))
+            thread.start()
+            thread.join()
+
+            pool_stats = HTTPClient.get_pool_stats()
+        finally:
+            server.shutdown()
+            server.server_close()
+            HTTPClient.clear()
+
+        assert pool_stats.num_pools == 1
+        assert pool_stats.num_requests == 4
+        assert pool_stats.num_connections == 1
+        assert pool_stats.num_reused_connections == 3
+        assert HTTPClient.get_transport() is not BaseHTTPClient.get_transport()
+
+
+def _get_async_http_client(handler, **attributes):
+    class AsyncHTTPClient(AsyncBaseHTTPClient):
+        enabled = True
+        base_url = "http://127.0.0.1"
+        auth_token = "token"
+        retry_backoff = 0
+
+        @classmethod
+        def create_client(cls):
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    for key, value in attributes.items():
+        setattr(AsyncHTTPClient, key, value)
+
+    return AsyncHTTPClient
+
+
+class TestClientAsyncBaseHTTPClient:
+    @pytest.mark.parametrize(
+        "method_name,add_payload",
+        [
+            ("get", False),
+            ("post", True),
+            ("put", True),
+            ("patch", True),
+            ("delete", False),
+        ],
+    )
+    def test_requests(self, method_name, add_payload):
+        """
+        Test that the full range of methods are supported and correctly implemented, as
+        well as options being passed as expected.
+        """
+
+        payload = {"foo": "bar"}
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={})
+
+        http_client = _get_async_http_client(handler)
+        method = getattr(http_client, method_name)
+
+        async def make_request():
+            await method("/foo", json=payload if add_payload else None)
+            await http_client.aclose()
+
+        asyncio.run(make_request())
+
+        assert len(requests) == 1
+        assert requests[0].method == method_name.upper()
+        assert requests[0].url == "http://127.0.0.1/foo"
+        assert requests[0].headers["Authorization"] == "Token token"
+
+        if add_payload:
+            assert json.loads(requests[0].content) == payload
+
+    @pytest.mark.parametrize(
+        "error_status_codes", [400, 401, 403, 404, 500, 502, 503, 504]
+    )
+    def test_request_error(self, error_status_codes):
+        """
+        Test that erroneous codes correctly throws a RequestError, and that requests
+        are retried on bad gateway status codes.
+        """
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(error_status_codes)
+
+        http_client = _get_async_http_client(handler)
+
+        with pytest.raises(AsyncBaseHTTPClient.RequestError):
+            asyncio.run(http_client.get("/path"))
+
+        expected_num_requests = 2 if error_status_codes in (502, 503, 504) else 1
+        assert len(requests) == expected_num_requests
+
+    def test_serialize_response(self):
+        """
+        Test that serializing a response works as expected.
+        """
+
+        class TestModel(BaseModel):
+            id: int
+            name: str
+
+        def handler(request):
+            return httpx.Response(200, json={"id": 1, "name": "Name"})
+
+        http_client = _get_async_http_client(handler)
+        response = asyncio.run(http_client.get("/valid"))
+
+        assert http_client.serialize_response(
+            serializer_cls=TestModel, response=response
+        ) == TestModel(id=1, name="Name")
+
+    def test_host_concurrency_limit(self):
+        """
+        Test that the number of concurrent requests to a single host is limited.
+        """
+
+        num_concurrent_requests = 0
+        max_concurrent_requests = 0
+
+        async def handler(request):
+            nonlocal num_concurrent_requests, max_concurrent_requests
+
+            num_concurrent_requests += 1
+            max_concurrent_requests = max(
+                max_concurrent_requests, num_concurrent_requests
+            )
+            await asyncio.sleep(0.01)
+            num_concurrent_requests -= 1
+
+            return httpx.Response(200, json={})
+
+        http_client = _get_async_http_client(handler, max_connections_per_host=3)
+
+        async def make_requests():
+            await asyncio.gather(*[http_client.get("/foo") for _ in range(10)])
+
+        asyncio.run(make_requests())
+
+        assert max_concurrent_requests == 3
@@ -0,0 +1,23 @@
+from io import BytesIO
+
+from PIL import Image
+
+from nest.core.utils import create_webp_image
+
+
+class TestImagesUtil:
+    def test_create_webp_image(self):
+        """
+        Test that images are converted to WebP and resized to fit within max size,
+        keeping the aspect ratio.
+        """
+
+        file = BytesIO()
+        Image.new("L", size=(1200, 600)).save(file, "jpeg")
+        file.seek(0)
+
+        webp_image = create_webp_image(file=file, max_size=(400, 400))
+
+        with Image.open(BytesIO(webp_image)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (400, 200)
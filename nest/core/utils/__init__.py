@@ -1,9 +1,11 @@
 from .dates import format_date, format_datetime, format_time
+from .images import create_webp_image
 from .pydantic import Exclude, Partial
 from .requests import get_remote_request_ip, get_remote_request_user
 from .s3 import s3_asset_cleanup, s3_asset_delete
 
 __all__ = [
+    "create_webp_image",
     "Exclude",
     "Partial",
     "format_date",
@@ -0,0 +1,30 @@
+from io import BytesIO
+from typing import IO
+
+from PIL import Image
+
+
+def create_webp_image(
+    *, file: IO[bytes], max_size: tuple[int, int], quality: int = 80
+) -> bytes:
+    """
+    Create a WebP image that fits within max_size, keeping the aspect ratio of the
+    original image.
+    """
+
+    with Image.open(file) as image:
+        # Let the decoder downscale while decoding when the format supports it (e.g.
+        # JPEG), so that large images are never fully decoded.
+        image.draft("RGB", max_size)
+        image.thumbnail(max_size)
+
+        thumbnail = (
+            image
+            if image.mode in ("RGB", "RGBA")
+            else image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        )
+
+        output = BytesIO()
+        thumbnail.save(output, format="WEBP", quality=quality)
+
+    return output.getvalue()
@@ -17,6 +17,17 @@ def get_homes() -> list[HomeRecord]:
     return records
 
 
+def get_active_homes() -> list[HomeRecord]:
+    """
+    Get all active homes.
+    """
+
+    homes = Home.objects.active()
+    records = [HomeRecord.from_home(home) for home in homes]
+
+    return records
+
+
 def get_homes_for_user(*, user: UserRecord) -> list[HomeRecord]:
     """
     Get all available homes for a specific user.
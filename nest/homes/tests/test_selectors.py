@@ -1,7 +1,7 @@
 import pytest
 
 from nest.homes.records import HomeRecord
-from nest.homes.selectors import get_homes, get_homes_for_user
+from nest.homes.selectors import get_active_homes, get_homes, get_homes_for_user
 from nest.homes.tests.utils import create_home
 from nest.users.core.records import UserRecord
 from nest.users.core.tests.utils import create_user
@@ -29,6 +29,20 @@ class TestHomesSelectors:
 
         assert output == expected_output
 
+    def test_get_active_homes(self, django_assert_num_queries):
+        """
+        Test that the get_active_homes selector only returns active homes within query
+        limits.
+        """
+        home1 = create_home(street_address="Address 1")
+        create_home(street_address="Address 2", is_active=False)
+        home3 = create_home(street_address="Address 3")
+
+        with django_assert_num_queries(1):
+            output = get_active_homes()
+
+        assert output == [HomeRecord.from_home(home1), HomeRecord.from_home(home3)]
+
     def test_get_homes_for_user(self, mocker, django_assert_num_queries):
         """
         Test that the user_homes selector returns expected output within query limits.
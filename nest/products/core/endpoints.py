@@ -1,27 +1,32 @@
-from django.http import HttpRequest
+from django.http import HttpRequest, StreamingHttpResponse
 from ninja import File, Form, Router
 from store_kit.http import status
 
 from nest.api.files import UploadedFile
+from nest.api.renderers import stream_response
 from nest.api.responses import APIResponse
 from nest.core.decorators import staff_required
 from nest.core.utils import Exclude
 
+from .enums import ProductProjection
 from .forms import ProductCreateForm, ProductEditForm
 from .records import ProductRecord
-from .selectors import get_product, get_products
+from .selectors import get_product, iter_products
 from .services import create_product, edit_product
 
 router = Router(tags=["Products"])
 
 
 @router.get("/", response=APIResponse[list[ProductRecord]])
-def product_list_api(request: HttpRequest) -> APIResponse[list[ProductRecord]]:
+def product_list_api(
+    request: HttpRequest, projection: ProductProjection = ProductProjection.SUMMARY
+) -> StreamingHttpResponse:
     """
-    Get a list of all products in the application.
+    Get a list of all products in the application. Products are summaries without
+    nutrition values and audit logs, unless another projection is requested.
     """
-    products = get_products()
-    return APIResponse(status="success", data=products)
+    products = iter_products(projection=projection)
+    return stream_response(data=products)
 
 
 ProductCreateIn = Exclude("ProductCreateIn", ProductCreateForm, ["thumbnail"])
@@ -48,12 +53,14 @@ def product_create_api(
 
 @router.get("{product_id}/", response=APIResponse[ProductRecord])
 def product_detail_api(
-    request: HttpRequest, product_id: int
+    request: HttpRequest,
+    product_id: int,
+    projection: ProductProjection = ProductProjection.WITH_AUDIT,
 ) -> APIResponse[ProductRecord]:
     """
     Retrieve a single product instance based on product id.
     """
-    product = get_product(pk=product_id)
+    product = get_product(pk=product_id, projection=projection)
     return APIResponse(status="success", data=product)
 
 
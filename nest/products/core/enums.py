@@ -0,0 +1,7 @@
+from django.db.models import TextChoices
+
+
+class ProductProjection(TextChoices):
+    SUMMARY = "summary", "Summary"
+    DETAIL = "detail", "Detail"
+    WITH_AUDIT = "with_audit", "With audit"
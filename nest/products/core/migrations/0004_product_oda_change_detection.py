@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_allergens_product_carbohydrates_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='oda_content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the Oda payload the product was last synced from.', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='oda_etag',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='oda_last_modified',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
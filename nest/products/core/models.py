@@ -107,6 +107,14 @@ class Product(BaseModel):
         null=True,
         help_text="The last time the data was automatically updated.",
     )
+    oda_content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Hash of the Oda payload the product was last synced from.",
+    )
+    oda_etag = models.CharField(max_length=255, blank=True, null=True)
+    oda_last_modified = models.CharField(max_length=64, blank=True, null=True)
 
     objects = _ProductManager()
 
@@ -1,5 +1,10 @@
+import itertools
+from collections.abc import Iterator
 from decimal import Decimal
 
+from django.db.models import QuerySet
+
+from nest.audit_logs.records import LogEntryRecord
 from nest.audit_logs.selectors import get_log_entries_for_objects
 from nest.core.exceptions import ApplicationError
 from nest.core.records import TableRecord
@@ -8,37 +13,50 @@ from nest.units.enums import UnitType
 from nest.units.records import UnitRecord
 
 from ..oda.constants import PRODUCT_NUTRITION_IDENTIFIERS
+from .enums import ProductProjection
 from .models import Product
 from .records import ProductClassifiersRecord, ProductRecord
 
+# Number of products fetched at a time when iterating over all products.
+PRODUCT_LIST_CHUNK_SIZE = 500
+
 
-def get_product(*, pk: int) -> ProductRecord:
+def get_product(
+    *, pk: int, projection: ProductProjection = ProductProjection.WITH_AUDIT
+) -> ProductRecord:
     """
     Get a single product instance based on the product id.
     """
     try:
-        products = get_products(product_ids=[pk])
+        products = get_products(product_ids=[pk], projection=projection)
         return products[0]
     except IndexError as exc:
         raise ApplicationError(message="Product does not exist.") from exc
 
 
-def get_oda_product(*, oda_id: int) -> ProductRecord:
+def get_oda_product(
+    *, oda_id: int, projection: ProductProjection = ProductProjection.WITH_AUDIT
+) -> ProductRecord:
     """
     Get a single product instance based on an oda id.
     """
     try:
-        products = get_products(oda_ids=[oda_id])
+        products = get_products(oda_ids=[oda_id], projection=projection)
         return products[0]
     except IndexError as exc:
         raise ApplicationError(message="Oda product does not exist.") from exc
 
 
 def get_products(
-    *, product_ids: list[int] | None = None, oda_ids: list[int] | None = None
+    *,
+    product_ids: list[int] | None = None,
+    oda_ids: list[int] | None = None,
+    projection: ProductProjection = ProductProjection.WITH_AUDIT,
 ) -> list[ProductRecord]:
     """
-    Get a list of all products.
+    Get a list of all products. The projection decides what is included besides the
+    product itself: summaries have no nutrition values or audit logs, details have
+    nutrition values and a nutrition table, and with audit has both.
     """
 
     filters = {}
@@ -49,75 +67,117 @@ def get_products(
     if oda_ids:
         filters["oda_id__in"] = oda_ids
 
-    products = (
-        Product.objects.filter(**filters).select_related("unit").order_by("-created_at")
+    products = list(_get_products_queryset(projection=projection).filter(**filters))
+
+    return _get_product_records(products, projection=projection)
+
+
+def iter_products(
+    *,
+    projection: ProductProjection = ProductProjection.WITH_AUDIT,
+    chunk_size: int = PRODUCT_LIST_CHUNK_SIZE,
+) -> Iterator[ProductRecord]:
+    """
+    Iterate over all products, fetching chunk_size products at a time, along with
+    whatever the projection includes, so that memory usage is flat regardless of the
+    number of products.
+    """
+
+    products = _get_products_queryset(projection=projection).iterator(
+        chunk_size=chunk_size
     )
-    ids = [product.id for product in products]
 
-    log_entries = get_log_entries_for_objects(model=Product, ids=ids, limit=10)
+    while chunk := list(itertools.islice(products, chunk_size)):
+        yield from _get_product_records(chunk, projection=projection)
+
+
+def _get_products_queryset(*, projection: ProductProjection) -> QuerySet[Product]:
+    products = Product.objects.select_related("unit").order_by("-created_at")
+
+    # Summaries leave out nutrition values, so there is no need to load them.
+    if projection == ProductProjection.SUMMARY:
+        products = products.defer(*PRODUCT_NUTRITION_IDENTIFIERS)
+
+    return products
+
+
+def _get_product_records(
+    products: list[Product], *, projection: ProductProjection
+) -> list[ProductRecord]:
+    log_entries = (
+        get_log_entries_for_objects(
+            model=Product, ids=[product.id for product in products], limit=10
+        )
+        if projection == ProductProjection.WITH_AUDIT
+        else {}
+    )
 
     return [
-        ProductRecord(
-            id=product.id,
-            name=product.name,
-            full_name=product.full_name,
-            gross_price=product.gross_price,
-            gross_unit_price=product.gross_unit_price,
-            unit=UnitRecord(
-                id=product.unit.id,
-                name=product.unit.name,
-                name_pluralized=product.unit.name_pluralized,
-                abbreviation=product.unit.abbreviation,
-                unit_type=UnitType(product.unit.unit_type),
-                base_factor=product.unit.base_factor,
-                is_base_unit=product.unit.is_base_unit,
-                is_default=product.unit.is_default,
-                display_name=product.unit.display_name,
-            ),
-            unit_quantity=product.unit_quantity,
-            oda_url=product.oda_url,
-            oda_id=product.oda_id,
-            is_available=product.is_available,
-            is_synced=product.is_synced,
-            last_synced_at=product.last_synced_at,
-            thumbnail_url=product.thumbnail.url if product.thumbnail else None,
-            gtin=product.gtin,
-            supplier=product.supplier,
-            is_oda_product=product.is_oda_product,
-            last_data_update=product.last_data_update,
-            last_data_update_display=(
-                format_datetime(product.last_data_update, with_seconds=True)
-                if product.last_data_update
-                else None
-            ),
-            display_price=product.display_price,
-            ingredients=product.ingredients,
-            allergens=product.allergens,
-            classifiers=ProductClassifiersRecord(
-                contains_lactose=product.contains_lactose,
-                contains_gluten=product.contains_gluten,
-            ),
-            energy_kj=product.energy_kj,
-            energy_kcal=product.energy_kcal,
-            fat=product.fat,
-            fat_saturated=product.fat_saturated,
-            fat_monounsaturated=product.fat_monounsaturated,
-            fat_polyunsaturated=product.fat_polyunsaturated,
-            carbohydrates=product.carbohydrates,
-            carbohydrates_sugars=product.carbohydrates_sugars,
-            carbohydrates_polyols=product.carbohydrates_polyols,
-            carbohydrates_starch=product.carbohydrates_starch,
-            fibres=product.fibres,
-            protein=product.protein,
-            salt=product.salt,
-            sodium=product.sodium,
-            nutrition_table=get_nutrition_table(product=product),
-            audit_logs=log_entries[product.id],
+        _get_product_record(
+            product,
+            with_nutrition=projection != ProductProjection.SUMMARY,
+            audit_logs=log_entries.get(product.id, []),
         )
         for product in products
     ]
 
 
+def _get_product_record(
+    product: Product, *, with_nutrition: bool, audit_logs: list[LogEntryRecord]
+) -> ProductRecord:
+    nutrition: dict[str, Decimal | None] = {
+        key: getattr(product, key) if with_nutrition else None
+        for key in PRODUCT_NUTRITION_IDENTIFIERS
+    }
+
+    return ProductRecord(
+        id=product.id,
+        name=product.name,
+        full_name=product.full_name,
+        gross_price=product.gross_price,
+        gross_unit_price=product.gross_unit_price,
+        unit=UnitRecord(
+            id=product.unit.id,
+            name=product.unit.name,
+            name_pluralized=product.unit.name_pluralized,
+            abbreviation=product.unit.abbreviation,
+            unit_type=UnitType(product.unit.unit_type),
+            base_factor=product.unit.base_factor,
+            is_base_unit=product.unit.is_base_unit,
+            is_default=product.unit.is_default,
+            display_name=product.unit.display_name,
+        ),
+        unit_quantity=product.unit_quantity,
+        oda_url=product.oda_url,
+        oda_id=product.oda_id,
+        is_available=product.is_available,
+        is_synced=product.is_synced,
+        last_synced_at=product.last_synced_at,
+        thumbnail_url=product.thumbnail.url if product.thumbnail else None,
+        gtin=product.gtin,
+        supplier=product.supplier,
+        is_oda_product=product.is_oda_product,
+        last_data_update=product.last_data_update,
+        last_data_update_display=(
+            format_datetime(product.last_data_update, with_seconds=True)
+            if product.last_data_update
+            else None
+        ),
+        display_price=product.display_price,
+        ingredients=product.ingredients,
+        allergens=product.allergens,
+        classifiers=ProductClassifiersRecord(
+            contains_lactose=product.contains_lactose,
+            contains_gluten=product.contains_gluten,
+        ),
+        **nutrition,
+        nutrition_table=(
+            get_nutrition_table(product=product) if with_nutrition else []
+        ),
+        audit_logs=audit_logs,
+    )
+
+
 def get_nutrition_table(*, product: Product) -> list[TableRecord]:
     records = []
     modified_identifiers = PRODUCT_NUTRITION_IDENTIFIERS.copy()
@@ -1,14 +1,31 @@
+import copy
+import functools
+import hashlib
 from decimal import Decimal
 from typing import Any
 
 import structlog
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.core.files.images import ImageFile
 from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
+from django.db import transaction
 from django.http import HttpRequest
+from django.utils import timezone
 
-from nest.audit_logs.services import log_create_or_updated
+from nest.audit_logs.services import (
+    bulk_log_create_or_updated,
+    log_create_or_updated,
+)
+from nest.audit_logs.utils import calculate_models_diff
 from nest.core.exceptions import ApplicationError
 from nest.core.services import model_update
+from nest.core.utils import create_webp_image, s3_asset_cleanup
+from nest.recipes.core.cache import invalidate_recipe_details_for_products
+from nest.recipes.plans.services import (
+    invalidate_recipe_plan_shopping_lists_for_products,
+    update_recipe_product_requirements_for_products,
+)
 from nest.units.models import Unit
 
 from .models import Product
@@ -16,6 +33,9 @@ from .records import ProductRecord
 
 logger = structlog.getLogger()
 
+# Largest width and height of stored product thumbnails.
+PRODUCT_THUMBNAIL_SIZE = (400, 400)
+
 
 def create_product(
     *,
@@ -80,13 +100,33 @@ def edit_product(
         unit = Unit.objects.get(id=data.pop("unit_id"))
         data["unit"] = unit
 
-    product_instance, _has_updated = model_update(
+    old_unit_id, old_unit_quantity = product.unit_id, product.unit_quantity
+    old_gross_price = product.gross_price
+
+    product_instance, has_updated = model_update(
         instance=product,
         data=data,
         request=request,
         log_ignore_fields={"thumbnail"},
     )
 
+    if has_updated:
+        invalidate_recipe_details_for_products(product_ids=[product_instance.id])
+
+    # Recipes' required amount of the product depends on its unit, so they need to be
+    # recalculated if it changes.
+    if (product_instance.unit_id, product_instance.unit_quantity) != (
+        old_unit_id,
+        old_unit_quantity,
+    ):
+        update_recipe_product_requirements_for_products(
+            product_ids=[product_instance.id]
+        )
+    elif product_instance.gross_price != old_gross_price:
+        invalidate_recipe_plan_shopping_lists_for_products(
+            product_ids=[product_instance.id]
+        )
+
     return ProductRecord.from_product(product_instance)
 
 
@@ -123,14 +163,29 @@ def update_or_create_product(
             len(existing_product) == 1
         ), "Found multiple products with filters, cannot safely update."
 
+        old_unit = (existing_product[0].unit_id, existing_product[0].unit_quantity)
+        old_gross_price = existing_product[0].gross_price
+
         existing_product.update(**defaults)
         updated_product = existing_product.first()
         product = updated_product
+
+        if product is not None:
+            invalidate_recipe_details_for_products(product_ids=[product.id])
     else:
+        old_unit = None
+        old_gross_price = None
         product = Product.objects.create(**defaults)
 
     assert product
 
+    # Recipes' required amount of the product depends on its unit, so they need to be
+    # recalculated if it changes.
+    if old_unit is not None and (product.unit_id, product.unit_quantity) != old_unit:
+        update_recipe_product_requirements_for_products(product_ids=[product.id])
+    elif old_gross_price is not None and product.gross_price != old_gross_price:
+        invalidate_recipe_plan_shopping_lists_for_products(product_ids=[product.id])
+
     log_create_or_updated(
         old=existing_product.first(),
         new=product,
@@ -139,3 +194,194 @@ def update_or_create_product(
     )
 
     return ProductRecord.from_product(product)
+
+
+def bulk_update_or_create_products(
+    *,
+    products: list[dict[str, Any]],
+    source: str | None = None,
+    log_ignore_fields: set[str] | None = None,
+) -> list[ProductRecord]:
+    """
+    Update or create many products, matched on the oda_id every product dict must
+    contain. Existing products are fetched in a single query, written using
+    bulk_create/bulk_update and diffed in memory for the audit log, so the number of
+    queries does not grow with the number of products.
+    """
+
+    # Later duplicates wins, the same as calling update_or_create_product in order.
+    defaults_by_oda_id = {defaults["oda_id"]: defaults for defaults in products}
+
+    existing_products = {
+        product.oda_id: product
+        for product in Product.objects.filter(
+            oda_id__in=defaults_by_oda_id.keys()
+        ).select_related("unit")
+    }
+    units = Unit.objects.in_bulk(
+        {
+            defaults["unit_id"]
+            for defaults in defaults_by_oda_id.values()
+            if "unit_id" in defaults
+        }
+    )
+
+    now = timezone.now()
+    update_fields = {"updated_at"}
+    products_to_create: list[Product] = []
+    products_to_update: list[Product] = []
+    instances: list[tuple[Product | None, Product]] = []
+
+    for oda_id, defaults in defaults_by_oda_id.items():
+        old_product = existing_products.get(oda_id)
+        product = _get_product_with_defaults(
+            product=copy.copy(old_product) if old_product else Product(),
+            defaults=defaults,
+            units=units,
+        )
+
+        if old_product is None:
+            products_to_create.append(product)
+        else:
+            product.updated_at = now
+            update_fields |= defaults.keys() - {"oda_id"}
+            products_to_update.append(product)
+
+        instances.append((old_product, product))
+
+    with transaction.atomic():
+        Product.objects.bulk_create(products_to_create)
+        Product.objects.bulk_update(products_to_update, fields=sorted(update_fields))
+
+        bulk_log_create_or_updated(
+            instances=instances, source=source, ignore_fields=log_ignore_fields
+        )
+
+        _update_recipes_for_changed_products(
+            instances=instances, fields=update_fields - {"updated_at"}
+        )
+        _delete_replaced_product_thumbnails(instances=instances)
+
+    return [ProductRecord.from_product(product) for _old, product in instances]
+
+
+def _delete_replaced_product_thumbnails(
+    *, instances: list[tuple[Product | None, Product]]
+) -> None:
+    """
+    Delete thumbnails replaced in a bulk update, unless other products still use them.
+    Bulk updates bypass the pre_save signal doing the same for single products.
+    """
+
+    replaced_products = {
+        old_product.thumbnail.name: old_product
+        for old_product, product in instances
+        if old_product is not None
+        and old_product.thumbnail
+        and old_product.thumbnail != product.thumbnail
+    }
+
+    if not replaced_products:
+        return None
+
+    used_thumbnails = set(
+        Product.objects.filter(thumbnail__in=replaced_products.keys()).values_list(
+            "thumbnail", flat=True
+        )
+    )
+
+    for thumbnail, old_product in replaced_products.items():
+        if thumbnail not in used_thumbnails:
+            transaction.on_commit(
+                functools.partial(
+                    s3_asset_cleanup, instance=old_product, field="thumbnail"
+                )
+            )
+
+
+def _update_recipes_for_changed_products(
+    *, instances: list[tuple[Product | None, Product]], fields: set[str]
+) -> None:
+    """
+    Update or invalidate data derived from products for recipes using products that
+    changed in a bulk update.
+    """
+
+    changed_product_ids = []
+    unit_changed_product_ids = []
+    price_changed_product_ids = []
+
+    for old_product, product in instances:
+        if old_product is None:
+            continue
+
+        diff = calculate_models_diff(old=old_product, new=product, fields=fields)
+
+        if diff is None:
+            continue
+
+        changed_product_ids.append(product.id)
+
+        if diff.keys() & {"unit", "unit_id", "unit_quantity"}:
+            unit_changed_product_ids.append(product.id)
+        elif "gross_price" in diff:
+            price_changed_product_ids.append(product.id)
+
+    if changed_product_ids:
+        invalidate_recipe_details_for_products(product_ids=changed_product_ids)
+
+    # Recipes' required amount of the product depends on its unit, so they need to be
+    # recalculated if it changes.
+    if unit_changed_product_ids:
+        update_recipe_product_requirements_for_products(
+            product_ids=unit_changed_product_ids
+        )
+
+    if price_changed_product_ids:
+        invalidate_recipe_plan_shopping_lists_for_products(
+            product_ids=price_changed_product_ids
+        )
+
+
+def _get_product_with_defaults(
+    *, product: Product, defaults: dict[str, Any], units: dict[Any, Unit]
+) -> Product:
+    """
+    Set defaults on an unsaved product instance. Values are converted the same way
+    they're read back from the database, so that diffs and returned records are
+    comparable to fetched products.
+    """
+
+    for field_name, value in defaults.items():
+        field = Product._meta.get_field(field_name)
+        setattr(product, field_name, field.to_python(value))  # type: ignore
+
+    if product.unit_id in units:
+        product.unit = units[product.unit_id]
+
+    return product
+
+
+def store_product_thumbnail(*, image: File) -> str:  # type: ignore
+    """
+    Store a resized WebP thumbnail of an image, and return its storage name, which can
+    be assigned directly to a product's thumbnail. Thumbnails are named by the hash of
+    the original image, so identical images are only processed and stored once.
+    """
+
+    content_hash = hashlib.sha256()
+
+    for chunk in image.chunks():
+        content_hash.update(chunk)
+
+    storage = Product._meta.get_field("thumbnail").storage
+    name = f"products/thumbnails/{content_hash.hexdigest()}.webp"
+
+    if storage.exists(name):
+        return name
+
+    image.seek(0)
+    thumbnail = create_webp_image(file=image, max_size=PRODUCT_THUMBNAIL_SIZE)
+
+    stored_name: str = storage.save(name, ContentFile(thumbnail))
+    return stored_name
@@ -12,7 +12,7 @@ def delete_thumbnail_s3_asset(
     sender: Product, instance: Product, *args: Any, **kwargs: Any
 ) -> None:
     """
-    Delete the old thumbnail if overwritten.
+    Delete the old thumbnail if overwritten, and no other products use it.
     """
 
     if instance.id is not None:
@@ -20,5 +20,8 @@ def delete_thumbnail_s3_asset(
         if (
             previous_product.thumbnail is not None
             and previous_product.thumbnail != instance.thumbnail
+            and not sender.objects.filter(thumbnail=previous_product.thumbnail.name)
+            .exclude(id=instance.id)
+            .exists()
         ):
             s3_asset_cleanup(instance=previous_product, field="thumbnail")
@@ -1,15 +1,20 @@
+import threading
+import time
 from tempfile import NamedTemporaryFile
-from typing import ClassVar
-from urllib.request import urlopen
+from typing import Any, ClassVar
 
+import httpx
+import requests
 import structlog
 from django.conf import settings
+from django.core.cache import BaseCache, caches
 from django.core.files import File
 from pydantic.error_wrappers import ValidationError as PydanticValidationError
 
-from nest.core.clients import BaseHTTPClient
+from nest.core.clients import AsyncBaseHTTPClient, BaseHTTPClient
 from nest.core.exceptions import ApplicationError
 
+from .constants import ODA_IMAGE_CHUNK_SIZE, ODA_IMAGE_MAX_SIZE
 from .records import OdaProductDetailRecord
 
 logger = structlog.getLogger()
@@ -25,19 +30,212 @@ class OdaClient(BaseHTTPClient):
 
     headers: ClassVar = {"X-Client-Token": auth_token}
 
+    # Response cache
+    cache_alias = settings.ODA_SERVICE_CACHE_ALIAS
+    cache_ttl = settings.ODA_SERVICE_CACHE_TTL
+    cache_stale_ttl = settings.ODA_SERVICE_CACHE_STALE_TTL
+    cache_key = "oda-product:{product_id}"
+
+    @classmethod
+    def get_cache(cls) -> BaseCache:
+        cache: BaseCache = caches[cls.cache_alias]
+        return cache
+
     @classmethod
     def get_product(cls, product_id: int | str) -> OdaProductDetailRecord:
+        """
+        Get an Oda product from their API. Responses are cached, and served from cache
+        while fresh. Stale responses are served while the product is revalidated in
+        the background.
+        """
+        product_id = int(product_id)
+        cached_product: dict[str, Any] | None = cls.get_cache().get(
+            cls.cache_key.format(product_id=product_id)
+        )
+
+        if cached_product is None:
+            return cls.revalidate_product(product_id=product_id)
+
+        product_record = OdaProductDetailRecord(**cached_product["product"])
+        age = time.time() - cached_product["fetched_at"]
+
+        if age > cls.cache_ttl:
+            cls._revalidate_product_in_background(product_id=product_id)
+
+        return product_record
+
+    @classmethod
+    def revalidate_product(cls, product_id: int) -> OdaProductDetailRecord:
+        """
+        Get an Oda product from their API, bypassing and updating the cache.
+        """
+        product_record = cls.get_product_if_modified(product_id=product_id)
+        assert product_record is not None, "Unconditional request was not modified"
+
+        cls.get_cache().set(
+            cls.cache_key.format(product_id=product_id),
+            {"product": product_record.dict(), "fetched_at": time.time()},
+            timeout=cls.cache_ttl + cls.cache_stale_ttl,
+        )
+
+        return product_record
+
+    @classmethod
+    def _revalidate_product_in_background(cls, product_id: int) -> None:
+        lock_key = f"{cls.cache_key.format(product_id=product_id)}:revalidating"
+
+        # Only revalidate once, even if stale responses are served to multiple
+        # concurrent callers.
+        if not cls.get_cache().add(lock_key, True, timeout=cls.request_timeout[1] * 2):
+            return
+
+        def revalidate() -> None:
+            try:
+                cls.revalidate_product(product_id=product_id)
+            except ApplicationError:
+                logger.warning("Failed to revalidate Oda product", id=product_id)
+            finally:
+                cls.get_cache().delete(lock_key)
+
+        threading.Thread(target=revalidate, daemon=True).start()
+
+    @classmethod
+    def get_product_if_modified(
+        cls,
+        product_id: int | str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> OdaProductDetailRecord | None:
+        """
+        Get an Oda product from their API, returning None if Oda reports that the
+        product has not been modified since the given ETag or Last-Modified values.
+        """
+        product_id = int(product_id)
+        headers = cls.headers.copy()
+
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            logger.info("Getting product from Oda", id=product_id)
+            response = cls.get(
+                f"/products/{product_id}/",
+                headers=headers,
+                status_codes=(*range(200, 300), 304),
+            )
+
+            if response is not None and response.status_code == 304:
+                logger.info("Product not modified at Oda", id=product_id)
+                return None
+
+            product_record = cls.serialize_response(
+                serializer_cls=OdaProductDetailRecord, response=response
+            )
+
+            if response is not None:
+                product_record.etag = response.headers.get("ETag")
+                product_record.last_modified = response.headers.get("Last-Modified")
+
+            return product_record
+        except PydanticValidationError as pexc:
+            logger.error(
+                "Failed to serialize product with OdaProductDetailRecord",
+                serializer=OdaProductDetailRecord,
+                status_code=response.status_code if response else None,
+                error=pexc.errors(),
+            )
+            raise ApplicationError(
+                message="Failed to serialize product with OdaProductDetailRecord",
+                extra=pexc.errors(),
+            ) from pexc
+        except cls.RequestError as rexc:
+            logger.error(
+                "Request to product endpoint failed",
+                status_code=rexc.status_code,
+            )
+            raise ApplicationError(
+                message="Request to product endpoint failed",
+                status_code=rexc.status_code,
+            ) from rexc
+        except requests.RequestException as exc:
+            logger.error("Request to product endpoint failed", error=str(exc))
+            raise ApplicationError(
+                message="Request to product endpoint failed"
+            ) from exc
+
+    @classmethod
+    def get_image(
+        cls, *, url: str, filename: str, max_size: int = ODA_IMAGE_MAX_SIZE
+    ) -> File | None:  # type: ignore
+        """
+        Copy an image from an url and save it as a File object, which allows us to save
+        it directly in our model(s) as well. The image is streamed to a temporary file
+        in chunks, and skipped if it's larger than max_size.
+        """
+        logger.info("Getting product image from Oda", url=url)
+
+        img_temp = NamedTemporaryFile(delete=True)
+
+        try:
+            with cls.stream(url, headers=cls.headers) as response:
+                if response is None or response.status_code != 200:
+                    img_temp.close()
+                    return None
+
+                for chunk in response.iter_content(chunk_size=ODA_IMAGE_CHUNK_SIZE):
+                    if img_temp.tell() + len(chunk) > max_size:
+                        logger.warning(
+                            "Product image exceeds max size, skipping",
+                            url=url,
+                            max_size=max_size,
+                        )
+                        img_temp.close()
+                        return None
+
+                    img_temp.write(chunk)
+        except requests.RequestException as exc:
+            img_temp.close()
+            logger.error("Request to product image failed", url=url, error=str(exc))
+            raise ApplicationError(message="Request to product image failed") from exc
+
+        img_temp.flush()
+        img_temp.seek(0)
+
+        return File(img_temp, filename)
+
+
+class AsyncOdaClient(AsyncBaseHTTPClient):
+    name = "oda"
+    enabled = settings.ODA_SERVICE_ENABLED
+    base_url = settings.ODA_SERVICE_BASE_URL
+    auth_token_prefix = None
+    auth_token = settings.ODA_SERVICE_AUTH_TOKEN
+    request_timeout = (5, 5)
+
+    headers: ClassVar = {"X-Client-Token": auth_token}
+
+    @classmethod
+    async def get_product(cls, product_id: int | str) -> OdaProductDetailRecord:
         """
         Get an Oda product from their API.
         """
         product_id = int(product_id)
+        response = None
 
         try:
             logger.info("Getting product from Oda", id=product_id)
-            response = cls.get(f"/products/{product_id}/", headers=cls.headers)
+            response = await cls.get(f"/products/{product_id}/", headers=cls.headers)
             product_record = cls.serialize_response(
                 serializer_cls=OdaProductDetailRecord, response=response
             )
+
+            if response is not None:
+                product_record.etag = response.headers.get("ETag")
+                product_record.last_modified = response.headers.get("Last-Modified")
+
             return product_record
         except PydanticValidationError as pexc:
             logger.error(
@@ -59,21 +257,52 @@ class OdaClient(BaseHTTPClient):
                 message="Request to product endpoint failed",
                 status_code=rexc.status_code,
             ) from rexc
+        except httpx.HTTPError as exc:
+            logger.error("Request to product endpoint failed", error=str(exc))
+            raise ApplicationError(
+                message="Request to product endpoint failed"
+            ) from exc
 
     @classmethod
-    def get_image(cls, *, url: str, filename: str) -> File | None:  # type: ignore
+    async def get_image(
+        cls, *, url: str, filename: str, max_size: int = ODA_IMAGE_MAX_SIZE
+    ) -> File | None:  # type: ignore
         """
         Copy an image from an url and save it as a File object, which allows us to save
-        it directly in our model(s) as well.
+        it directly in our model(s) as well. The image is streamed to a temporary file
+        in chunks, and skipped if it's larger than max_size.
         """
         logger.info("Getting product image from Oda", url=url)
 
         img_temp = NamedTemporaryFile(delete=True)
-        with urlopen(url) as uo:
-            if uo.status != 200:
-                return None
 
-            img_temp.write(uo.read())
-            img_temp.flush()
+        try:
+            async with cls.stream(
+                method="GET", url=url, headers=cls.headers
+            ) as response:
+                if response is None or response.status_code != 200:
+                    img_temp.close()
+                    return None
+
+                async for chunk in response.aiter_bytes(
+                    chunk_size=ODA_IMAGE_CHUNK_SIZE
+                ):
+                    if img_temp.tell() + len(chunk) > max_size:
+                        logger.warning(
+                            "Product image exceeds max size, skipping",
+                            url=url,
+                            max_size=max_size,
+                        )
+                        img_temp.close()
+                        return None
+
+                    img_temp.write(chunk)
+        except httpx.HTTPError as exc:
+            img_temp.close()
+            logger.error("Request to product image failed", url=url, error=str(exc))
+            raise ApplicationError(message="Request to product image failed") from exc
+
+        img_temp.flush()
+        img_temp.seek(0)
 
         return File(img_temp, filename)
@@ -1,5 +1,17 @@
 from decimal import Decimal
 
+# Number of concurrent requests made to Oda when syncing products.
+ODA_SYNC_MAX_WORKERS = 8
+
+# Number of products written per transaction when syncing products.
+ODA_SYNC_BATCH_SIZE = 100
+
+# Product images larger than this are skipped, in bytes.
+ODA_IMAGE_MAX_SIZE = 5 * 1024 * 1024
+
+# Size of the chunks product images are streamed in, in bytes.
+ODA_IMAGE_CHUNK_SIZE = 64 * 1024
+
 PRODUCT_NUTRITION_IDENTIFIERS: dict[str, Decimal | None] = {
     "energy_kj": None,
     "energy_kcal": None,
@@ -16,3 +28,22 @@ PRODUCT_NUTRITION_IDENTIFIERS: dict[str, Decimal | None] = {
     "salt": None,
     "sodium": None,
 }
+
+# Maps keys in Oda's nutrition table, lower cased, to fields on our own product model.
+# Energy is listed in both kJ and kcal in a single row, and is handled separately.
+ODA_NUTRITION_ENERGY_KEY = "energi"
+ODA_NUTRITION_KEY_MAPPING: dict[str, str] = {
+    "fett": "fat",
+    "hvorav mettede fettsyrer": "fat_saturated",
+    "hvorav enumettede fettsyrer": "fat_monounsaturated",
+    "hvorav flerumettede fettsyrer": "fat_polyunsaturated",
+    "karbohydrater": "carbohydrates",
+    "hvorav sukkerarter": "carbohydrates_sugars",
+    "hvorav polyoler": "carbohydrates_polyols",
+    "hvorav stivelse": "carbohydrates_starch",
+    "kostfiber": "fibres",
+    "protein": "protein",
+    "salt": "salt",
+    "natrium": "sodium",
+}
+ODA_CONTENTS_INGREDIENTS_KEY = "ingredienser"
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from types import TracebackType
+from typing import Any
+
+from PIL import Image
+
+PRODUCT_PATH_RE = re.compile(r"^/products/(?P<id>\d+)/$")
+IMAGE_PATH_RE = re.compile(r"^/images/(?P<id>\d+)\.jpg$")
+
+
+def get_fake_oda_product_dict(*, id: int, base_url: str) -> dict[str, Any]:
+    """
+    Get a synthetic product payload, shaped like the product detail response from Oda.
+    """
+    gross_unit_price = 10 + id % 90
+    unit_quantity = 1 + id % 3
+
+    def row(key: str, value: str) -> dict[str, Any]:
+        return {"key": key, "value": value, "emphasis": None}
+
+    return {
+        "id": id,
+        "full_name": f"Fake product {id}",
+        "brand": "Fake brand",
+        "front_url": f"https://oda.com/no/products/{id}-fake-product/",
+        "gross_price": f"{gross_unit_price * unit_quantity}.00",
+        "gross_unit_price": f"{gross_unit_price}.00",
+        "unit_price_quantity_abbreviation": "kg",
+        "availability": {"is_available": id % 10 != 0},
+        "images": [{"thumbnail": {"url": f"{base_url}/images/{id}.jpg"}}],
+        "detailed_info": {
+            "local": [
+                {
+                    "nutrition_info_table": {
+                        "rows": [
+                            row(
+                                "Energi",
+                                f"{1000 + id % 500} kJ / {200 + id % 100} kcal",
+                            ),
+                            row("Fett", f"{id % 20}.50 g"),
+                            row("hvorav mettede fettsyrer", "0.40 g"),
+                            row("Karbohydrater", f"{id % 70}.90 g"),
+                            row("hvorav sukkerarter", "2.70 g"),
+                            row("Kostfiber", "3.60 g"),
+                            row("Protein", f"{id % 30}.20 g"),
+                            row("Salt", "0 g"),
+                        ]
+                    },
+                    "contents_table": {
+                        "rows": [
+                            {
+                                "key": "Ingredienser",
+                                "value": "Siktet mel av HVETE",
+                                "emphasis": {
+                                    "keywords": ["hvete"],
+                                    "reason": "allergens",
+                                },
+                            }
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+
+
+@lru_cache(maxsize=1024)
+def get_fake_oda_image(*, id: int, size: tuple[int, int]) -> bytes:
+    """
+    Get a synthetic JPEG image, unique per product id.
+    """
+    file = BytesIO()
+    color = (id % 256, (id // 256) % 256, (id // 65536) % 256)
+    Image.new("RGB", size=size, color=color).save(file, "jpeg")
+
+    return file.getvalue()
+
+
+class _FakeOdaRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_FakeOdaHTTPServer"
+
+    def do_GET(self) -> None:
+        fake = self.server.fake
+
+        with fake._lock:
+            fake.num_requests += 1
+
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        if fake.error_rate and random.random() < fake.error_rate:
+            self._respond(status=503, body=b"", content_type="text/plain")
+            return
+
+        if match := PRODUCT_PATH_RE.match(self.path):
+            self._respond_product(product_id=int(match.group("id")))
+        elif match := IMAGE_PATH_RE.match(self.path):
+            self._respond_image(product_id=int(match.group("id")))
+        else:
+            self._respond(status=404, body=b"", content_type="text/plain")
+
+    def _respond_product(self, *, product_id: int) -> None:
+        fake = self.server.fake
+
+        if not 0 < product_id <= fake.num_products:
+            self._respond(status=404, body=b"{}")
+            return
+
+        body = json.dumps(
+            get_fake_oda_product_dict(id=product_id, base_url=fake.base_url)
+        ).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self._respond(status=304, body=b"", headers={"ETag": etag})
+            return
+
+        self._respond(status=200, body=body, headers={"ETag": etag})
+
+    def _respond_image(self, *, product_id: int) -> None:
+        body = get_fake_oda_image(id=product_id, size=self.server.fake.image_size)
+        self._respond(status=200, body=body, content_type="image/jpeg")
+
+    def _respond(
+        self,
+        *,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _FakeOdaHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *, address: tuple[str, int], fake: "FakeOdaServer") -> None:
+        super().__init__(address, _FakeOdaRequestHandler)
+        self.fake = fake
+
+
+class FakeOdaServer:
+    """
+    A local stand-in for the Oda API, serving a configurable number of synthetic
+    products and their images, with injectable latency and error rates. Point
+    OdaClient.base_url to base_url to use it.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_products: int = 1000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        image_size: tuple[int, int] = (230, 376),
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.num_products = num_products
+        self.latency = latency
+        self.error_rate = error_rate
+        self.image_size = image_size
+        self.num_requests = 0
+
+        self._lock = threading.Lock()
+        self._server = _FakeOdaHTTPServer(address=(host, port), fake=self)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOdaServer":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
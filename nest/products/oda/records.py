@@ -1,3 +1,6 @@
+import hashlib
+from decimal import Decimal
+
 from pydantic import BaseModel
 
 ##########
@@ -65,3 +68,43 @@ class OdaProductRecord(BaseModel):
 
 class OdaProductDetailRecord(OdaProductRecord):
     detailed_info: OdaProductDetailedInfo
+
+    # Response validators, populated from response headers when provided by Oda.
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Hash of the normalized payload, used to detect if the product has changed
+        since it was last synced.
+        """
+        payload = self.json(exclude={"etag", "last_modified"}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+####################
+# Extracted values #
+####################
+
+
+class OdaProductNutritionRecord(BaseModel):
+    energy_kj: Decimal | None = None
+    energy_kcal: Decimal | None = None
+    fat: Decimal | None = None
+    fat_saturated: Decimal | None = None
+    fat_monounsaturated: Decimal | None = None
+    fat_polyunsaturated: Decimal | None = None
+    carbohydrates: Decimal | None = None
+    carbohydrates_sugars: Decimal | None = None
+    carbohydrates_polyols: Decimal | None = None
+    carbohydrates_starch: Decimal | None = None
+    fibres: Decimal | None = None
+    protein: Decimal | None = None
+    salt: Decimal | None = None
+    sodium: Decimal | None = None
+
+
+class OdaProductContentsRecord(BaseModel):
+    ingredients: str | None = None
+    allergens: str | None = None
@@ -1,44 +1,67 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
+from typing import Any
 
 import structlog
-from django.core.files import File
 from django.utils import timezone
-from django.utils.text import slugify
 
 from nest.core.exceptions import ApplicationError
-from nest.units.selectors import get_unit_by_abbreviation, get_unit_normalized_quantity
-
+from nest.units.records import UnitRecord
+from nest.units.selectors import (
+    get_unit_by_abbreviation,
+    get_unit_normalized_quantity,
+    get_units_by_abbreviation,
+)
+
+from ..core.enums import ProductProjection
 from ..core.models import Product
 from ..core.records import ProductRecord
 from ..core.selectors import get_oda_product
-from ..core.services import update_or_create_product
+from ..core.services import (
+    bulk_update_or_create_products,
+    store_product_thumbnail,
+    update_or_create_product,
+)
 from .clients import OdaClient
-from .constants import PRODUCT_NUTRITION_IDENTIFIERS
-from .records import OdaProductDetailRecord
+from .constants import (
+    ODA_CONTENTS_INGREDIENTS_KEY,
+    ODA_NUTRITION_ENERGY_KEY,
+    ODA_NUTRITION_KEY_MAPPING,
+    ODA_SYNC_BATCH_SIZE,
+    ODA_SYNC_MAX_WORKERS,
+)
+from .records import (
+    OdaProductContentsRecord,
+    OdaProductDetailRecord,
+    OdaProductNutritionRecord,
+)
 
 logger = structlog.getLogger()
 
+# Numbers in Oda's product tables use either a comma or a period as the decimal
+# separator, and may group thousands with (non-breaking) spaces. Thousands may also be
+# grouped with a period or comma, as long as the decimal separator is the other one,
+# e.g. "1.433,5". Without a decimal separator, "1.433" is ambiguous, and is read as a
+# decimal number.
+_ODA_NUMBER = (
+    r"(?P<number>"
+    r"\d{1,3}(?P<separator>[.,])\d{3}(?:(?P=separator)\d{3})*(?!(?P=separator))[.,]\d+"
+    r"|\d{1,3}(?:[ \xa0]\d{3})+(?:[.,]\d+)?"
+    r"|\d+(?:[.,]\d+)?"
+    r")"
+)
+ODA_NUMBER_RE = re.compile(_ODA_NUMBER)
+ODA_ENERGY_KJ_RE = re.compile(rf"{_ODA_NUMBER}\s*kj", re.IGNORECASE)
+ODA_ENERGY_KCAL_RE = re.compile(rf"{_ODA_NUMBER}\s*kcal", re.IGNORECASE)
+
 
 def import_product_from_oda(*, oda_product_id: int) -> ProductRecord | None:
     """
     Import a product from Oda based on the Oda product id.
     """
 
-    # Get product data and image from Oda API.
-    product_response = OdaClient.get_product(product_id=oda_product_id)
-    product_image = OdaClient.get_image(
-        url=product_response.images[0].thumbnail.url, filename="thumbnail.jpg"
-    )
-
-    def get_product_image() -> File | None:  # type: ignore
-        if not product_image:
-            return None
-
-        product_image.name = slugify(product_response.full_name)
-        return product_image
-
-    # Validate that all required values are present.
-    _validate_oda_response(response_record=product_response)
+    product_response, thumbnail = _fetch_product_from_oda(oda_product_id=oda_product_id)
 
     product: Product | ProductRecord
 
@@ -46,22 +69,253 @@ def import_product_from_oda(*, oda_product_id: int) -> ProductRecord | None:
     # The selector will throw an Application error if the product does not exit, so
     # we deliberately catch it and ignore it here.
     try:
-        product = get_oda_product(oda_id=product_response.id)
+        product = get_oda_product(
+            oda_id=product_response.id, projection=ProductProjection.SUMMARY
+        )
 
         if not getattr(product, "is_synced", True):
             return None
     except ApplicationError:
         pass
 
+    return _update_or_create_product_from_oda_response(
+        product_response=product_response, thumbnail=thumbnail
+    )
+
+
+def sync_products_from_oda(
+    *,
+    max_workers: int = ODA_SYNC_MAX_WORKERS,
+    batch_size: int = ODA_SYNC_BATCH_SIZE,
+) -> int:
+    """
+    Refresh all synced products from Oda. Products and images are fetched
+    concurrently in a bounded thread pool, while changes are written in batches from
+    the calling thread as responses come in. Products that have not changed since the
+    last sync, or that fail to be fetched, are skipped. Returns the number of updated
+    products.
+    """
+
+    synced_products = list(
+        Product.objects.filter(is_synced=True, oda_id__isnull=False).values_list(
+            "oda_id", "oda_content_hash", "oda_etag", "oda_last_modified"
+        )
+    )
+
+    if not synced_products:
+        return 0
+
+    logger.info(
+        "Syncing products from Oda",
+        num_products=len(synced_products),
+        max_workers=max_workers,
+    )
+
+    num_synced = 0
+    num_unchanged = 0
+    batch: list[tuple[OdaProductDetailRecord, str | None]] = []
+
+    # Each thread gets its own client instance, and reuses its session for all
+    # requests made from that thread.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _fetch_product_from_oda_if_changed,
+                oda_product_id=oda_product_id,  # type: ignore
+                content_hash=content_hash,
+                etag=etag,
+                last_modified=last_modified,
+            ): oda_product_id
+            for oda_product_id, content_hash, etag, last_modified in synced_products
+        }
+
+        for future in as_completed(futures):
+            try:
+                fetched_product = future.result()
+            except ApplicationError as exc:
+                logger.warning(
+                    "Failed to fetch product from Oda, skipping",
+                    oda_product_id=futures[future],
+                    error=exc.message,
+                )
+                continue
+
+            if fetched_product is None:
+                num_unchanged += 1
+                continue
+
+            batch.append(fetched_product)
+
+            if len(batch) >= batch_size:
+                num_synced += _save_products_from_oda(products=batch)
+                batch = []
+
+    if batch:
+        num_synced += _save_products_from_oda(products=batch)
+
+    logger.info(
+        "Finished syncing products from Oda",
+        num_products=len(synced_products),
+        num_synced=num_synced,
+        num_unchanged=num_unchanged,
+    )
+
+    return num_synced
+
+
+def _fetch_product_from_oda(
+    *, oda_product_id: int
+) -> tuple[OdaProductDetailRecord, str | None]:
+    """
+    Get product data and image from Oda API, and validate the response. Does not touch
+    the database, so it's safe to call from worker threads.
+    """
+
+    product_response = OdaClient.get_product(product_id=oda_product_id)
+    thumbnail = _get_product_thumbnail_from_oda(product_response=product_response)
+
+    # Validate that all required values are present.
+    _validate_oda_response(response_record=product_response)
+
+    return product_response, thumbnail
+
+
+def _fetch_product_from_oda_if_changed(
+    *,
+    oda_product_id: int,
+    content_hash: str | None,
+    etag: str | None,
+    last_modified: str | None,
+) -> tuple[OdaProductDetailRecord, str | None] | None:
+    """
+    Same as _fetch_product_from_oda, but returns None without downloading the image
+    if Oda reports the product as not modified, or if the payload is identical to the
+    one the product was last synced from.
+    """
+
+    product_response = OdaClient.get_product_if_modified(
+        product_id=oda_product_id, etag=etag, last_modified=last_modified
+    )
+
+    if product_response is None or product_response.content_hash == content_hash:
+        return None
+
+    thumbnail = _get_product_thumbnail_from_oda(product_response=product_response)
+
+    # Validate that all required values are present.
+    _validate_oda_response(response_record=product_response)
+
+    return product_response, thumbnail
+
+
+def _get_product_thumbnail_from_oda(
+    *, product_response: OdaProductDetailRecord
+) -> str | None:
+    """
+    Get the product image from Oda, and store it as a thumbnail. Returns the storage
+    name of the thumbnail, and raises an ApplicationError if the image can't be
+    fetched or stored.
+    """
+    product_image = OdaClient.get_image(
+        url=product_response.images[0].thumbnail.url, filename="thumbnail.jpg"
+    )
+
+    if not product_image:
+        return None
+
+    try:
+        with product_image:
+            return store_product_thumbnail(image=product_image)
+    except OSError as exc:
+        # Raised by Pillow if the image can't be identified or decoded.
+        logger.error(
+            "Failed to store product image",
+            oda_product_id=product_response.id,
+            error=str(exc),
+        )
+        raise ApplicationError(message="Failed to store product image") from exc
+
+
+def _save_products_from_oda(
+    *, products: list[tuple[OdaProductDetailRecord, str | None]]
+) -> int:
+    """
+    Write a batch of fetched Oda products in bulk. Units are loaded once per batch, so
+    the number of queries does not grow with the batch size. Products whose response
+    cannot be mapped to our own product model are skipped.
+    """
+
+    units = get_units_by_abbreviation()
+    products_defaults = []
+
+    for product_response, thumbnail in products:
+        try:
+            defaults = _get_product_defaults_from_oda_response(
+                product_response=product_response, thumbnail=thumbnail, units=units
+            )
+        except ApplicationError as exc:
+            logger.warning(
+                "Failed to save product from Oda, skipping",
+                oda_product_id=product_response.id,
+                error=exc.message,
+            )
+            continue
+
+        products_defaults.append({"oda_id": product_response.id, **defaults})
+
+    product_records = bulk_update_or_create_products(
+        products=products_defaults,
+        source="Oda",
+        log_ignore_fields={"thumbnail"},
+    )
+
+    return len(product_records)
+
+
+def _update_or_create_product_from_oda_response(
+    *, product_response: OdaProductDetailRecord, thumbnail: str | None
+) -> ProductRecord:
+    """
+    Update or create a product based on an Oda response.
+    """
+
+    defaults = _get_product_defaults_from_oda_response(
+        product_response=product_response,
+        thumbnail=thumbnail,
+        units=get_units_by_abbreviation(),
+    )
+
+    product_record = update_or_create_product(
+        pk=None,
+        oda_id=product_response.id,
+        source="Oda",
+        log_ignore_fields={"thumbnail"},
+        **defaults,
+    )
+
+    return product_record
+
+
+def _get_product_defaults_from_oda_response(
+    *,
+    product_response: OdaProductDetailRecord,
+    thumbnail: str | None,
+    units: dict[str, UnitRecord],
+) -> dict[str, Any]:
+    """
+    Map an Oda response to the fields of our own product model. Units are looked up
+    among the passed units, so no queries are made.
+    """
+
     # Get corresponding unit from product response
     unit = get_unit_by_abbreviation(
-        abbreviation=product_response.unit_price_quantity_abbreviation
+        abbreviation=product_response.unit_price_quantity_abbreviation, units=units
     )
     unit_quantity = float(product_response.gross_price) / float(
         product_response.gross_unit_price
     )
     converted_quantity, converted_unit = get_unit_normalized_quantity(
-        quantity=Decimal(unit_quantity), unit=unit
+        quantity=Decimal(unit_quantity), unit=unit, units=units
     )
 
     # Extract nutrition values.
@@ -82,98 +336,101 @@ def import_product_from_oda(*, oda_product_id: int) -> ProductRecord | None:
         "unit_quantity": round(converted_quantity),
         "is_available": product_response.availability.is_available,
         "supplier": product_response.brand,
-        "thumbnail": get_product_image(),
+        "thumbnail": thumbnail,
         "last_data_update": timezone.now(),
-        **nutrition,
-        **classifiers,
+        "oda_content_hash": product_response.content_hash,
+        "oda_etag": product_response.etag,
+        "oda_last_modified": product_response.last_modified,
+        **nutrition.dict(),
+        **classifiers.dict(),
     }
 
-    product_record = update_or_create_product(
-        pk=None,
-        oda_id=product_response.id,
-        source="Oda",
-        log_ignore_fields={"thumbnail"},
-        **defaults,
-    )
-
-    return product_record
+    return defaults
 
 
 def _extract_nutrition_values_from_response(
     *, product_response: OdaProductDetailRecord
-) -> dict[str, Decimal | None]:
+) -> OdaProductNutritionRecord:
     """
-    Extract a dict of nutritional values from response record.
+    Extract nutritional values from response record. Rows are matched against our own
+    fields in a single pass, and values that are missing or cannot be parsed are left
+    as None.
     """
 
-    # The response dict that we're interested in returning. All nutrition values on the
-    # product model is nullable, therefore, None is the default.
-    extracted_values = PRODUCT_NUTRITION_IDENTIFIERS
+    extracted_values: dict[str, Decimal | None] = {}
 
-    # Extract correct info from response record and map oda's keys to match our own.
     try:
         nutrition_info = product_response.detailed_info.local[
             0
         ].nutrition_info_table.rows
     except IndexError:
-        return extracted_values
-
-    nutrition_info_key_mapping = {
-        "fat": "Fett",
-        "fat_saturated": "hvorav mettede fettsyrer",
-        "fat_monounsaturated": "hvorav enumettede fettsyrer",
-        "fat_polyunsaturated": "hvorav flerumettede fettsyrer",
-        "carbohydrates": "Karbohydrater",
-        "carbohydrates_sugars": "hvorav sukkerarter",
-        "carbohydrates_polyols": "hvorav polyoler",
-        "carbohydrates_starch": "hvorav stivelse",
-        "fibres": "Kostfiber",
-        "protein": "Protein",
-        "salt": "Salt",
-        "sodium": "Natrium",
-    }
+        return OdaProductNutritionRecord()
 
     for info in nutrition_info:
+        key = info.key.strip().lower()
+
         # Energy has to be treated a bit differently as the value contains the value for
-        # both the kj and kcal.
-        if info.key == "Energi":
-            # Energy values looks like ['743', 'kJ', '/', '177', 'kcal'] after split.
-            energy_values = info.value.split(" ")
-            extracted_values["energy_kj"] = Decimal(energy_values[0])
-            extracted_values["energy_kcal"] = Decimal(energy_values[3])
-        else:
-            for model_key, mapped_key in nutrition_info_key_mapping.items():
-                if info.key != mapped_key:
-                    continue
-                # Grab the number before abbreviation. Looks something like
-                # ['8.20', 'g'] after split.
-                value = Decimal(info.value.split(" ")[0])
-                extracted_values[model_key] = value
-
-    return extracted_values
+        # both the kj and kcal, e.g. "743 kJ / 177 kcal".
+        if key == ODA_NUTRITION_ENERGY_KEY:
+            extracted_values["energy_kj"] = _parse_oda_number(
+                info.value, pattern=ODA_ENERGY_KJ_RE
+            )
+            extracted_values["energy_kcal"] = _parse_oda_number(
+                info.value, pattern=ODA_ENERGY_KCAL_RE
+            )
+        elif (field := ODA_NUTRITION_KEY_MAPPING.get(key)) is not None:
+            extracted_values[field] = _parse_oda_number(info.value)
+
+    return OdaProductNutritionRecord(**extracted_values)
+
+
+def _parse_oda_number(
+    value: str, *, pattern: re.Pattern[str] = ODA_NUMBER_RE
+) -> Decimal | None:
+    """
+    Parse the first number matching pattern in a value from Oda, e.g. "8.20 g",
+    "1,60 g", "<0,5 g", "1 433 kJ" or "1.433,5 kJ". Returns None if there is no number.
+    """
+
+    match = pattern.search(value)
+
+    if match is None:
+        return None
+
+    number = match.group("number")
+
+    if (separator := match.group("separator")) is not None:
+        number = number.replace(separator, "")
+
+    return Decimal(number.replace(",", ".").replace(" ", "").replace("\xa0", ""))
 
 
 def _extract_classifier_values_from_response(
     *, product_response: OdaProductDetailRecord
-) -> dict[str, str | None]:
+) -> OdaProductContentsRecord:
     """
-    Extract a dict of content values from response record.
+    Extract content values from response record. If there are multiple ingredient
+    rows, the last one wins.
     """
-    extracted_values: dict[str, str | None] = {"ingredients": None, "allergens": None}
+
+    ingredients = None
+    allergens = None
 
     try:
         contents_info = product_response.detailed_info.local[0].contents_table.rows
     except IndexError:
-        return extracted_values
+        return OdaProductContentsRecord()
 
     for info in contents_info:
-        if info.key == "Ingredienser":
-            extracted_values["ingredients"] = info.value
+        if info.key.strip().lower() != ODA_CONTENTS_INGREDIENTS_KEY:
+            continue
+
+        ingredients = info.value
 
-            if info.emphasis is not None and info.emphasis.reason == "allergens":
-                extracted_values["allergens"] = ", ".join(info.emphasis.keywords)
+        if info.emphasis is not None and info.emphasis.reason == "allergens":
+            allergens = ", ".join(info.emphasis.keywords)
 
-    return extracted_values
+    return OdaProductContentsRecord(ingredients=ingredients, allergens=allergens)
 
 
 def _validate_oda_response(*, response_record: OdaProductDetailRecord) -> None:
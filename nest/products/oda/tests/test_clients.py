@@ -0,0 +1,239 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+from freezegun import freeze_time
+
+from nest.core.exceptions import ApplicationError
+from nest.products.oda.clients import AsyncOdaClient, OdaClient
+from nest.products.oda.records import OdaProductDetailRecord
+from nest.products.oda.tests.utils import get_oda_product_response_dict
+
+
+class TestOdaClient:
+    @pytest.mark.parametrize("image_size, expected_file", [(100, True), (101, False)])
+    def test_get_image(self, request_mock, mocker, image_size, expected_file):
+        """
+        Test that images are streamed to a file, and skipped if they exceed max size.
+        """
+        mocker.patch.object(OdaClient, "enabled", True)
+        url = "https://oda.com/images/product.jpg"
+        request_mock.get(url, content=b"x" * image_size)
+
+        try:
+            image = OdaClient.get_image(url=url, filename="thumbnail.jpg", max_size=100)
+        finally:
+            OdaClient.clear()
+
+        if expected_file:
+            assert image.read() == b"x" * image_size
+        else:
+            assert image is None
+
+    def test_get_image_failed_request(self, request_mock, mocker):
+        """
+        Test that the temporary file is closed if the image can't be fetched.
+        """
+        mocker.patch.object(OdaClient, "enabled", True)
+        url = "https://oda.com/images/product.jpg"
+        request_mock.get(url, status_code=404)
+        temp_file_mock = mocker.patch("nest.products.oda.clients.NamedTemporaryFile")
+
+        try:
+            image = OdaClient.get_image(url=url, filename="thumbnail.jpg")
+        finally:
+            OdaClient.clear()
+
+        assert image is None
+        assert temp_file_mock.return_value.close.call_count == 1
+        assert request_mock.call_count == 1
+        assert request_mock.request_history[0].headers["X-Client-Token"] == (
+            OdaClient.auth_token
+        )
+
+    def test_get_image_disabled(self, request_mock, mocker):
+        """
+        Test that a disabled client does not request the image.
+        """
+        mocker.patch.object(OdaClient, "enabled", False)
+        url = "https://oda.com/images/product.jpg"
+        request_mock.get(url, content=b"x")
+
+        try:
+            image = OdaClient.get_image(url=url, filename="thumbnail.jpg")
+        finally:
+            OdaClient.clear()
+
+        assert image is None
+        assert request_mock.call_count == 0
+
+    def test_get_product_cache(self, mocker):
+        """
+        Test that products are served from cache while fresh, and that stale products
+        are served while being revalidated in the background.
+        """
+        product_record = OdaProductDetailRecord(**get_oda_product_response_dict(id=1))
+        request_mock = mocker.patch.object(
+            OdaClient, "get_product_if_modified", return_value=product_record
+        )
+        thread_mock = mocker.patch("nest.products.oda.clients.threading.Thread")
+
+        try:
+            with freeze_time() as frozen_time:
+                assert OdaClient.get_product(product_id=1) == product_record
+                assert OdaClient.get_product(product_id="1") == product_record
+                assert request_mock.call_count == 1
+                assert thread_mock.call_count == 0
+
+                frozen_time.tick(timedelta(seconds=OdaClient.cache_ttl + 1))
+
+                assert OdaClient.get_product(product_id=1) == product_record
+                assert OdaClient.get_product(product_id=1) == product_record
+                assert request_mock.call_count == 1
+                # Revalidation is only started once.
+                assert thread_mock.call_count == 1
+
+                frozen_time.tick(timedelta(seconds=OdaClient.cache_stale_ttl))
+
+                assert OdaClient.get_product(product_id=1) == product_record
+                assert request_mock.call_count == 2
+        finally:
+            OdaClient.get_cache().clear()
+
+
+class TestAsyncOdaClient:
+    @pytest.fixture
+    def run_with_handler(self, mocker):
+        """
+        Returns a function running a client coroutine against a mocked transport,
+        closing the client before the event loop is closed.
+        """
+
+        def run(coroutine_func, handler):
+            mocker.patch.multiple(
+                AsyncOdaClient, enabled=True, base_url="https://oda.com/api/v1"
+            )
+            mocker.patch.object(
+                AsyncOdaClient,
+                "create_client",
+                return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+
+            async def run_and_close():
+                try:
+                    return await coroutine_func()
+                finally:
+                    await AsyncOdaClient.aclose()
+
+            return asyncio.run(run_and_close())
+
+        return run
+
+    def test_get_product(self, run_with_handler):
+        """
+        Test that products are fetched and serialized, along with their ETag.
+        """
+
+        def handler(request):
+            assert request.url == "https://oda.com/api/v1/products/1/"
+            return httpx.Response(
+                200, json=get_oda_product_response_dict(id=1), headers={"ETag": '"a"'}
+            )
+
+        product = run_with_handler(
+            lambda: AsyncOdaClient.get_product(product_id=1), handler
+        )
+
+        assert product.id == 1
+        assert product.etag == '"a"'
+
+    @pytest.mark.parametrize(
+        "exception",
+        [
+            httpx.ConnectError("Connection refused"),
+            httpx.ReadTimeout("Timed out"),
+        ],
+    )
+    def test_get_product_failed_request(self, run_with_handler, exception):
+        """
+        Test that errors from the transport are raised as ApplicationError, the same as
+        failed responses.
+        """
+
+        def handler(request):
+            raise exception
+
+        with pytest.raises(
+            ApplicationError, match="Request to product endpoint failed"
+        ):
+            run_with_handler(lambda: AsyncOdaClient.get_product(product_id=1), handler)
+
+        with pytest.raises(
+            ApplicationError, match="Request to product endpoint failed"
+        ):
+            run_with_handler(
+                lambda: AsyncOdaClient.get_product(product_id=1),
+                lambda request: httpx.Response(404),
+            )
+
+    @pytest.mark.parametrize("image_size, expected_file", [(100, True), (101, False)])
+    def test_get_image(self, run_with_handler, image_size, expected_file):
+        """
+        Test that images are streamed to a file, and skipped if they exceed max size.
+        """
+
+        image = run_with_handler(
+            lambda: AsyncOdaClient.get_image(
+                url="https://oda.com/images/product.jpg",
+                filename="thumbnail.jpg",
+                max_size=100,
+            ),
+            lambda request: httpx.Response(200, content=b"x" * image_size),
+        )
+
+        if expected_file:
+            assert image.read() == b"x" * image_size
+        else:
+            assert image is None
+
+    def test_get_image_failed_request(self, run_with_handler, mocker):
+        """
+        Test that the temporary file is closed if the image can't be fetched, and that
+        errors from the transport are raised as ApplicationError.
+        """
+        temp_file_mock = mocker.patch("nest.products.oda.clients.NamedTemporaryFile")
+
+        def get_image():
+            return AsyncOdaClient.get_image(
+                url="https://oda.com/images/product.jpg", filename="thumbnail.jpg"
+            )
+
+        image = run_with_handler(get_image, lambda request: httpx.Response(404))
+
+        assert image is None
+        assert temp_file_mock.return_value.close.call_count == 1
+
+        def handler(request):
+            raise httpx.ConnectError("Connection refused")
+
+        with pytest.raises(ApplicationError, match="Request to product image failed"):
+            run_with_handler(get_image, handler)
+
+        assert temp_file_mock.return_value.close.call_count == 2
+
+    def test_get_image_disabled(self, mocker):
+        """
+        Test that a disabled client does not request the image.
+        """
+        mocker.patch.object(AsyncOdaClient, "enabled", False)
+        create_client_mock = mocker.patch.object(AsyncOdaClient, "create_client")
+
+        image = asyncio.run(
+            AsyncOdaClient.get_image(
+                url="https://oda.com/images/product.jpg", filename="thumbnail.jpg"
+            )
+        )
+
+        assert image is None
+        assert create_client_mock.call_count == 0
@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from nest.core.exceptions import ApplicationError
+from nest.products.core.models import Product
+from nest.products.oda.clients import OdaClient
+from nest.products.oda.fakes import FakeOdaServer
+
+
+class TestFakeOdaServer:
+    def test_fake_oda_server(self, mocker):
+        """
+        Test that the fake server serves products and images OdaClient can consume,
+        and responds to conditional requests.
+        """
+        with FakeOdaServer(num_products=2) as server:
+            mocker.patch.multiple(OdaClient, enabled=True, base_url=server.base_url)
+
+            try:
+                product = OdaClient.get_product_if_modified(product_id=2)
+                image = OdaClient.get_image(
+                    url=product.images[0].thumbnail.url, filename="thumbnail.jpg"
+                )
+                not_modified_product = OdaClient.get_product_if_modified(
+                    product_id=2, etag=product.etag
+                )
+
+                with pytest.raises(ApplicationError):
+                    OdaClient.get_product_if_modified(product_id=3)
+            finally:
+                OdaClient.clear()
+
+        assert product.id == 2
+        assert product.etag is not None
+        assert image is not None
+        assert not_modified_product is None
+        assert server.num_requests == 4
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("mode", ["import", "sync"])
+    def test_benchmark_oda_sync_command(self, mode):
+        """
+        Test that the benchmark runs against the fake server, and that all changes are
+        rolled back.
+        """
+        out = StringIO()
+
+        call_command(
+            "benchmark_oda_sync", mode=mode, num_products=3, latency=0, stdout=out
+        )
+
+        assert "Products per second" in out.getvalue()
+        assert "Queries per product" in out.getvalue()
+        assert not Product.objects.exists()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("mode", ["import", "sync"])
+    def test_benchmark_oda_sync_command_errors(self, mode):
+        """
+        Test that the benchmark keeps running when the fake server responds with
+        errors, and that the failed products are reported as skipped.
+        """
+        out = StringIO()
+
+        call_command(
+            "benchmark_oda_sync",
+            mode=mode,
+            num_products=3,
+            latency=0,
+            error_rate=1,
+            stdout=out,
+        )
+
+        assert "Skipped products:     3" in out.getvalue()
+        assert not Product.objects.exists()
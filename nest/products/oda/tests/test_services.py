@@ -1,12 +1,14 @@
 from decimal import Decimal
 
 import pytest
+import requests
 
+from nest.core.exceptions import ApplicationError
 from nest.products.core.models import Product
 from nest.products.core.tests.utils import (
     create_product as create_product_test_util,
 )
-from nest.products.core.tests.utils import create_product_image
+from nest.products.core.tests.utils import create_product_image, next_oda_id
 from nest.products.oda.clients import OdaClient
 from nest.products.oda.constants import PRODUCT_NUTRITION_IDENTIFIERS
 from nest.products.oda.records import OdaProductDetailRecord
@@ -15,6 +17,7 @@ from nest.products.oda.services import (
     _extract_nutrition_values_from_response,
     _validate_oda_response,
     import_product_from_oda,
+    sync_products_from_oda,
 )
 from nest.products.oda.tests.utils import get_oda_product_response_dict
 
@@ -83,7 +86,7 @@ class TestProductOdaServices:
             f"{_validate_oda_response.__module__}.{_validate_oda_response.__name__}"
         )
 
-        with django_assert_num_queries(8):
+        with django_assert_num_queries(7):
             imported_product = import_product_from_oda(oda_product_id=oda_id_mock)
 
         assert Product.objects.all().count() == 1
@@ -116,7 +119,7 @@ class TestProductOdaServices:
             f"{_validate_oda_response.__module__}.{_validate_oda_response.__name__}"
         )
 
-        with django_assert_max_num_queries(8):
+        with django_assert_max_num_queries(10):
             imported_product = import_product_from_oda(oda_product_id=product.oda_id)
 
         assert imported_product.id == product.id
@@ -128,6 +131,145 @@ class TestProductOdaServices:
         assert product_image_response_request_mock.call_count == 1
         assert _validate_oda_response_mock.call_count == 1
 
+    def test_sync_products_from_oda(self, django_assert_max_num_queries, mocker):
+        """
+        Test that all synced products are refreshed from Oda, and that products
+        failing to be fetched, or that are unchanged since the last sync, are skipped.
+        """
+        unchanged_response = OdaProductDetailRecord(
+            **get_oda_product_response_dict(id=next_oda_id() + 10)
+        )
+
+        product1 = create_product_test_util(name="Product 1")
+        product2 = create_product_test_util(name="Product 2", oda_etag='"abc"')
+        product3 = create_product_test_util(name="Product 3", is_synced=False)
+        product4 = create_product_test_util(name="Product 4")
+        product5 = create_product_test_util(
+            name="Product 5",
+            oda_id=unchanged_response.id,
+            oda_content_hash=unchanged_response.content_hash,
+        )
+
+        def get_product_if_modified(product_id, etag, last_modified):
+            if product_id == product4.oda_id:
+                raise ApplicationError(message="Request to product endpoint failed")
+
+            # Oda responds with 304 Not Modified.
+            if etag == '"abc"':
+                return None
+
+            if product_id == unchanged_response.id:
+                return unchanged_response
+
+            return OdaProductDetailRecord(
+                **get_oda_product_response_dict(id=product_id), etag='"def"'
+            )
+
+        product_response_request_mock = mocker.patch.object(
+            OdaClient, "get_product_if_modified", side_effect=get_product_if_modified
+        )
+        product_image_response_request_mock = mocker.patch.object(
+            OdaClient, "get_image", return_value=None
+        )
+        mocker.patch(
+            f"{_validate_oda_response.__module__}.{_validate_oda_response.__name__}"
+        )
+
+        with django_assert_max_num_queries(15):
+            num_synced = sync_products_from_oda(max_workers=2, batch_size=1)
+
+        assert num_synced == 1
+        assert product_response_request_mock.call_count == 4
+        assert product_image_response_request_mock.call_count == 1
+
+        for product in [product1, product2, product3, product4, product5]:
+            product.refresh_from_db()
+
+        assert product1.name == "Møllerens Hvetemel Siktet"
+        assert product1.oda_etag == '"def"'
+        assert product1.oda_content_hash is not None
+        assert product2.name == "Product 2"
+        assert product3.name == "Product 3"
+        assert product4.name == "Product 4"
+        assert product5.name == "Product 5"
+
+    @pytest.mark.parametrize("num_products", [1, 10, 50])
+    def test_sync_products_from_oda_num_queries(
+        self, num_products, django_assert_max_num_queries, mocker
+    ):
+        """
+        Test that the number of queries made when syncing a batch of products does not
+        grow with the size of the batch.
+        """
+        for index in range(num_products):
+            create_product_test_util(name=f"Product {index}")
+
+        mocker.patch.object(
+            OdaClient,
+            "get_product_if_modified",
+            side_effect=lambda product_id, etag, last_modified: OdaProductDetailRecord(
+                **get_oda_product_response_dict(id=product_id)
+            ),
+        )
+        mocker.patch.object(OdaClient, "get_image", return_value=None)
+
+        with django_assert_max_num_queries(12):
+            num_synced = sync_products_from_oda(max_workers=2, batch_size=num_products)
+
+        assert num_synced == num_products
+
+    def test_sync_products_from_oda_image_errors(
+        self, request_mock, settings, tmp_path, mocker
+    ):
+        """
+        Test that products whose image can't be fetched or stored are skipped, while
+        the remaining products are still synced.
+        """
+        settings.MEDIA_ROOT = tmp_path
+        mocker.patch.object(OdaClient, "enabled", True)
+
+        products = [
+            create_product_test_util(name=f"Product {index}") for index in range(3)
+        ]
+        image_urls = {
+            product.oda_id: f"https://oda.com/images/{product.oda_id}.jpg"
+            for product in products
+        }
+
+        def get_product_if_modified(product_id, etag, last_modified):
+            response_dict = get_oda_product_response_dict(id=product_id)
+            response_dict["images"][0]["thumbnail"]["url"] = image_urls[product_id]
+            return OdaProductDetailRecord(**response_dict)
+
+        mocker.patch.object(
+            OdaClient, "get_product_if_modified", side_effect=get_product_if_modified
+        )
+        mocker.patch(
+            f"{_validate_oda_response.__module__}.{_validate_oda_response.__name__}"
+        )
+
+        image_file = create_product_image(name="thumbnail")
+        request_mock.get(
+            image_urls[products[0].oda_id],
+            exc=requests.exceptions.RetryError("Too many 503 error responses"),
+        )
+        request_mock.get(image_urls[products[1].oda_id], content=b"Not an image")
+        request_mock.get(image_urls[products[2].oda_id], content=image_file.read())
+
+        try:
+            num_synced = sync_products_from_oda(max_workers=2, batch_size=1)
+        finally:
+            OdaClient.clear()
+
+        for product in products:
+            product.refresh_from_db()
+
+        assert num_synced == 1
+        assert products[0].name == "Product 0"
+        assert products[1].name == "Product 1"
+        assert products[2].name == "Møllerens Hvetemel Siktet"
+        assert products[2].thumbnail
+
     def test__extract_nutrition_values_from_response(self):
         """
         Test that we're successfully extracting nutritional values from response and
@@ -138,7 +280,7 @@ class TestProductOdaServices:
 
         nutrition_values = _extract_nutrition_values_from_response(
             product_response=OdaProductDetailRecord(**oda_response)
-        )
+        ).dict()
 
         assert nutrition_values == {
             "carbohydrates": Decimal("67.90"),
@@ -160,6 +302,59 @@ class TestProductOdaServices:
             key in nutrition_values for key in PRODUCT_NUTRITION_IDENTIFIERS.keys()
         )
 
+    def test__extract_nutrition_values_from_response_number_formats(self):
+        """
+        Test that nutritional values are parsed regardless of decimal separator,
+        thousands grouping and casing of the keys, and that products don't share
+        extracted values.
+        """
+        oda_response = get_oda_product_response_dict(id=next_oda_id())
+        rows = oda_response["detailed_info"]["local"][0]["nutrition_info_table"]["rows"]
+        rows[:] = [
+            {"key": "Energi", "value": "1\xa0433 kJ/338 kcal", "emphasis": None},
+            {"key": "fett ", "value": "1,60 g", "emphasis": None},
+            {"key": "Hvorav sukkerarter", "value": "<0,5 g", "emphasis": None},
+            {"key": "Karbohydrater", "value": "1.067,9 g", "emphasis": None},
+            {"key": "Protein", "value": "1,067.5 g", "emphasis": None},
+            {"key": "Kostfiber", "value": "1.067 g", "emphasis": None},
+            {"key": "Natrium", "value": "1.067.300,25 mg", "emphasis": None},
+            {"key": "Salt", "value": "spor", "emphasis": None},
+        ]
+
+        nutrition_values = _extract_nutrition_values_from_response(
+            product_response=OdaProductDetailRecord(**oda_response)
+        )
+
+        assert nutrition_values.energy_kj == Decimal("1433")
+        assert nutrition_values.energy_kcal == Decimal("338")
+        assert nutrition_values.fat == Decimal("1.60")
+        assert nutrition_values.carbohydrates_sugars == Decimal("0.5")
+        assert nutrition_values.carbohydrates == Decimal("1067.9")
+        assert nutrition_values.protein == Decimal("1067.5")
+        # Without a decimal separator, a single period is read as the decimal separator.
+        assert nutrition_values.fibres == Decimal("1.067")
+        assert nutrition_values.sodium == Decimal("1067300.25")
+        assert nutrition_values.salt is None
+
+        rows[:] = [
+            {"key": "Energi", "value": "1.433,5 kJ / 338,2 kcal", "emphasis": None},
+        ]
+
+        energy_values = _extract_nutrition_values_from_response(
+            product_response=OdaProductDetailRecord(**oda_response)
+        )
+
+        assert energy_values.energy_kj == Decimal("1433.5")
+        assert energy_values.energy_kcal == Decimal("338.2")
+
+        rows[:] = []
+
+        empty_nutrition_values = _extract_nutrition_values_from_response(
+            product_response=OdaProductDetailRecord(**oda_response)
+        )
+
+        assert all(value is None for value in empty_nutrition_values.dict().values())
+
     def test__extract_classifier_values_from_response(self):
         """
         Test that we're successfully extracting classifier values from response.
@@ -169,9 +364,37 @@ class TestProductOdaServices:
 
         classifiers = _extract_classifier_values_from_response(
             product_response=OdaProductDetailRecord(**oda_response)
-        )
+        ).dict()
 
         assert classifiers == {
             "allergens": "hvete",
             "ingredients": "Siktet mel av HVETE, melbehandlingsmiddel (ascorbinsyre)",
         }
+
+    def test__extract_classifier_values_from_response_duplicate_rows(self):
+        """
+        Test that the last ingredient row wins if there are multiple, along with the
+        allergens emphasized in it.
+        """
+        oda_response = get_oda_product_response_dict(id=next_oda_id())
+        rows = oda_response["detailed_info"]["local"][0]["contents_table"]["rows"]
+        rows[:] = [
+            {
+                "key": "Ingredienser",
+                "value": "Siktet mel av HVETE",
+                "emphasis": {"reason": "allergens", "keywords": ["hvete"]},
+            },
+            {"key": "Oppbevaring", "value": "Tørt", "emphasis": None},
+            {
+                "key": "Ingredienser",
+                "value": "Siktet mel av HVETE og RUG",
+                "emphasis": {"reason": "allergens", "keywords": ["hvete", "rug"]},
+            },
+        ]
+
+        classifiers = _extract_classifier_values_from_response(
+            product_response=OdaProductDetailRecord(**oda_response)
+        )
+
+        assert classifiers.ingredients == "Siktet mel av HVETE og RUG"
+        assert classifiers.allergens == "hvete, rug"
@@ -0,0 +1,98 @@
+import functools
+import hashlib
+import json
+import time
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+from ..ingredients.models import RecipeIngredientItem
+
+RECIPE_DETAIL_CACHE_KEY = "recipe-detail:{recipe_id}:{version}"
+RECIPE_DETAIL_VERSION_CACHE_KEY = "recipe-detail-version:{recipe_id}"
+RECIPE_LIST_CACHE_KEY = "recipe-list:{version}:{params_hash}"
+RECIPE_LIST_VERSION_CACHE_KEY = "recipe-list-version"
+
+
+def _get_version(*, version_key: str) -> int:
+    """
+    Get a version from the cache. Versions never expire, but if one is evicted, a new
+    one is started, so that previously cached values are never served again.
+    """
+    version: int | None = cache.get(version_key)
+
+    if version is None:
+        version = time.time_ns()
+
+        if not cache.add(version_key, version, timeout=None):
+            version = cache.get(version_key, version)
+
+    return version  # type: ignore
+
+
+def get_recipe_detail_cache_key(*, recipe_id: int) -> str:
+    """
+    Get the cache key of a recipe's detail record, for the current version of the
+    recipe.
+    """
+    version = _get_version(
+        version_key=RECIPE_DETAIL_VERSION_CACHE_KEY.format(recipe_id=recipe_id)
+    )
+    return RECIPE_DETAIL_CACHE_KEY.format(recipe_id=recipe_id, version=version)
+
+
+def get_recipe_list_cache_key(*, params: dict[str, Any]) -> str:
+    """
+    Get the cache key of a page of recipes for the given list or search parameters.
+    All pages share a version, which is bumped whenever any recipe changes.
+    """
+    params_hash = hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    version = _get_version(version_key=RECIPE_LIST_VERSION_CACHE_KEY)
+
+    return RECIPE_LIST_CACHE_KEY.format(version=version, params_hash=params_hash)
+
+
+def _bump_recipe_versions(*, recipe_ids: list[int]) -> None:
+    version = time.time_ns()
+    cache.set_many(
+        {
+            RECIPE_LIST_VERSION_CACHE_KEY: version,
+            **{
+                RECIPE_DETAIL_VERSION_CACHE_KEY.format(recipe_id=recipe_id): version
+                for recipe_id in recipe_ids
+            },
+        },
+        timeout=None,
+    )
+
+
+def invalidate_recipe_details(*, recipe_ids: list[int]) -> None:
+    """
+    Bump the version of recipes, and of recipe pages, so that cached records and
+    responses of them are no longer used. Versions are bumped once the current
+    transaction commits, so that the previous state can't be cached under the new
+    version.
+    """
+    if not recipe_ids:
+        return None
+
+    transaction.on_commit(
+        functools.partial(_bump_recipe_versions, recipe_ids=recipe_ids)
+    )
+
+
+def invalidate_recipe_details_for_products(*, product_ids: list[int]) -> None:
+    """
+    Bump the version of all recipes with ingredients using the given products, e.g.
+    when product details changes.
+    """
+    recipe_ids = list(
+        RecipeIngredientItem.objects.filter(ingredient__product_id__in=product_ids)
+        .values_list("ingredient_group__recipe_id", flat=True)
+        .distinct()
+    )
+
+    invalidate_recipe_details(recipe_ids=recipe_ids)
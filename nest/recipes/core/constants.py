@@ -0,0 +1,2 @@
+# Text search configuration used when building and querying recipe search vectors.
+RECIPE_SEARCH_CONFIG = "norwegian"
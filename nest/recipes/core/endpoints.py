@@ -1,8 +1,11 @@
+from datetime import timedelta
+
 from django.db import transaction
 from django.http import HttpRequest
 from ninja import Router, Schema
 from store_kit.http import status
 
+from nest.api.renderers import cache_response
 from nest.api.responses import APIResponse
 from nest.core.decorators import staff_required
 from nest.recipes.ingredients.services import (
@@ -10,9 +13,16 @@ from nest.recipes.ingredients.services import (
 )
 
 from ..steps.services import Step
+from .cache import get_recipe_detail_cache_key, get_recipe_list_cache_key
+from .enums import RecipeDifficulty, RecipeStatus
 from .forms import RecipeCreateForm
-from .records import RecipeDetailRecord
-from .selectors import get_recipe, get_recipes
+from .records import RecipeDetailRecord, RecipeListPageRecord
+from .selectors import (
+    RECIPE_LIST_DEFAULT_LIMIT,
+    get_recipe,
+    get_recipe_list,
+    search_recipes,
+)
 from .services import create_recipe, edit_recipe
 
 router = Router(tags=["Recipe"])
@@ -78,6 +88,9 @@ def recipe_edit_api(
     response=APIResponse[RecipeDetailRecord],
     auth=None,
 )
+@cache_response(
+    key=lambda request, recipe_id: get_recipe_detail_cache_key(recipe_id=recipe_id)
+)
 def recipe_detail_api(
     request: HttpRequest, recipe_id: int
 ) -> APIResponse[RecipeDetailRecord]:
@@ -88,10 +101,57 @@ def recipe_detail_api(
     return APIResponse(status="success", data=recipe)
 
 
-@router.get("/", response=APIResponse[list[RecipeDetailRecord]])
-def recipe_list_api(request: HttpRequest) -> APIResponse[list[RecipeDetailRecord]]:
+@router.get("/", response=APIResponse[RecipeListPageRecord])
+@cache_response(
+    key=lambda request, **params: get_recipe_list_cache_key(
+        params={"path": request.path, **params}
+    )
+)
+def recipe_list_api(
+    request: HttpRequest,
+    cursor: str | None = None,
+    limit: int = RECIPE_LIST_DEFAULT_LIMIT,
+    status: RecipeStatus | None = None,
+    difficulty: RecipeDifficulty | None = None,
+    is_vegetarian: bool | None = None,
+    is_pescatarian: bool | None = None,
+    max_total_time_minutes: int | None = None,
+) -> APIResponse[RecipeListPageRecord]:
+    """
+    Get a page of recipes in the application, newest first. Pass the next cursor of a
+    page to get the following page.
+    """
+    recipes = get_recipe_list(
+        cursor=cursor,
+        limit=limit,
+        status=status,
+        difficulty=difficulty,
+        is_vegetarian=is_vegetarian,
+        is_pescatarian=is_pescatarian,
+        max_total_time=(
+            timedelta(minutes=max_total_time_minutes)
+            if max_total_time_minutes is not None
+            else None
+        ),
+    )
+    return APIResponse(status="success", data=recipes)
+
+
+@router.get("/search/", response=APIResponse[RecipeListPageRecord])
+@cache_response(
+    key=lambda request, **params: get_recipe_list_cache_key(
+        params={"path": request.path, **params}
+    )
+)
+def recipe_search_api(
+    request: HttpRequest,
+    q: str,
+    cursor: str | None = None,
+    limit: int = RECIPE_LIST_DEFAULT_LIMIT,
+) -> APIResponse[RecipeListPageRecord]:
     """
-    Get a list of all recipes in the application.
+    Search recipes by title, search keywords, ingredients and step instructions, best
+    match first. Pass the next cursor of a page to get the following page.
     """
-    recipes = get_recipes()
+    recipes = search_recipes(query=q, cursor=cursor, limit=limit)
     return APIResponse(status="success", data=recipes)
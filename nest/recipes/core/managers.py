@@ -1,7 +1,7 @@
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from django.db.models import Count, DurationField, Q, Sum
+from django.db.models import Count, DurationField, OuterRef, Q, Subquery, Sum
 from django.db.models.functions import Coalesce
 
 from nest.core.managers import BaseQuerySet
@@ -9,41 +9,48 @@ from nest.core.managers import BaseQuerySet
 from ..steps.enums import RecipeStepType
 
 if TYPE_CHECKING:
-    from nest.recipes.core import models
+    from nest.recipes.core import models  # noqa
 
 
 class RecipeQuerySet(BaseQuerySet["models.Recipe"]):
-    def annotate_duration(self) -> BaseQuerySet["models.Recipe"]:
+    def _get_aggregate_subquery(self, aggregate: Any, default: Any) -> Coalesce:
         """
-        Annotate a recipes duration by calculating the associated steps in the
-        respective preparation and cooking step types.
+        Get an aggregate over a single recipe's relations, to be used as a subquery
+        when updating recipes. Keeps aggregates over different relations from
+        multiplying each other's rows.
         """
-        return self.annotate(
-            preparation_time=Coalesce(
-                Sum(
-                    "steps__duration",
-                    filter=(Q(steps__step_type=RecipeStepType.PREPARATION)),
-                    output_field=DurationField(),
-                ),
-                timedelta(seconds=0),
-            ),
-            cooking_time=Coalesce(
+        recipe = self.model.objects.filter(pk=OuterRef("pk")).annotate(value=aggregate)
+        return Coalesce(Subquery(recipe.values("value")), default)
+
+    def update_duration(self) -> int:
+        """
+        Update the stored duration of recipes by calculating the associated steps in
+        the respective preparation and cooking step types.
+        """
+
+        def get_duration(step_type: RecipeStepType | None = None) -> Coalesce:
+            return self._get_aggregate_subquery(
                 Sum(
                     "steps__duration",
-                    filter=(Q(steps__step_type=RecipeStepType.COOKING)),
+                    filter=Q(steps__step_type=step_type) if step_type else None,
                     output_field=DurationField(),
                 ),
-                timedelta(seconds=0),
-            ),
-            total_time=Coalesce(
-                Sum("steps__duration", output_field=DurationField()),
-                timedelta(seconds=0),
-            ),
+                default=timedelta(seconds=0),
+            )
+
+        return self.update(
+            preparation_time=get_duration(RecipeStepType.PREPARATION),
+            cooking_time=get_duration(RecipeStepType.COOKING),
+            total_time=get_duration(),
         )
 
-    def annotate_num_plan_usages(self) -> BaseQuerySet["models.Recipe"]:
+    def update_num_plan_usages(self) -> int:
         """
-        Annotate how many times this recipe has been used in plans.
+        Update the stored count of how many times recipes have been used in plans.
         """
 
-        return self.annotate(num_plan_usages=Count("plan_items__recipe_plan"))
+        return self.update(
+            num_plan_usages=self._get_aggregate_subquery(
+                Count("plan_items__recipe_plan"), default=0
+            )
+        )
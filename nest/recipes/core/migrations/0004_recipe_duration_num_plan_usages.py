@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:08
+
+import datetime
+from django.db import migrations, models
+from django.db.models import Count, DurationField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_duration_and_num_plan_usages(apps, schema_editor) -> None:
+    Recipe = apps.get_model("recipes", "Recipe")
+
+    def get_aggregate_subquery(aggregate, default):
+        recipe = Recipe.objects.filter(pk=OuterRef("pk")).annotate(value=aggregate)
+        return Coalesce(Subquery(recipe.values("value")), default)
+
+    def get_duration(step_type=None):
+        return get_aggregate_subquery(
+            Sum(
+                "steps__duration",
+                filter=Q(steps__step_type=step_type) if step_type else None,
+                output_field=DurationField(),
+            ),
+            default=datetime.timedelta(seconds=0),
+        )
+
+    Recipe.objects.update(
+        preparation_time=get_duration("preparation"),
+        cooking_time=get_duration("cooking"),
+        total_time=get_duration(),
+        num_plan_usages=get_aggregate_subquery(
+            Count("plan_items__recipe_plan"), default=0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_search_vector'),
+        ('recipes_plans', '0003_recipeplan_num_portions_per_recipe'),
+        ('recipes_steps', '0002_recipestepingredientitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cooking_time',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='num_plan_usages',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='preparation_time',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='total_time',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False),
+        ),
+        migrations.RunPython(
+            populate_duration_and_num_plan_usages, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Func, OuterRef, TextField, Value
+
+from nest.recipes.core.constants import RECIPE_SEARCH_CONFIG
+
+
+def populate_recipe_search_vectors(apps, schema_editor) -> None:
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeIngredientItem = apps.get_model("recipes_ingredients", "RecipeIngredientItem")
+    RecipeStep = apps.get_model("recipes_steps", "RecipeStep")
+
+    def get_joined_text(queryset):
+        return Func(
+            ArraySubquery(queryset),
+            Value(" "),
+            function="array_to_string",
+            output_field=TextField(),
+        )
+
+    ingredient_titles = RecipeIngredientItem.objects.filter(
+        ingredient_group__recipe_id=OuterRef("pk")
+    ).values("ingredient__title")
+    step_instructions = RecipeStep.objects.filter(recipe_id=OuterRef("pk")).values(
+        "instruction"
+    )
+
+    Recipe.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config=RECIPE_SEARCH_CONFIG)
+            + SearchVector("search_keywords", weight="B", config=RECIPE_SEARCH_CONFIG)
+            + SearchVector(
+                get_joined_text(ingredient_titles),
+                weight="C",
+                config=RECIPE_SEARCH_CONFIG,
+            )
+            + SearchVector(
+                get_joined_text(step_instructions),
+                weight="D",
+                config=RECIPE_SEARCH_CONFIG,
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_duration_num_plan_usages'),
+        ('recipes_ingredients', '0004_recipeingredient_is_base_ingredient'),
+        ('recipes_steps', '0002_recipestepingredientitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            populate_recipe_search_vectors, migrations.RunPython.noop
+        ),
+    ]
@@ -1,3 +1,8 @@
+from datetime import timedelta
+from typing import ClassVar
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from nest.core.models import BaseModel
@@ -40,11 +45,33 @@ class Recipe(BaseModel):
     is_vegetarian = models.BooleanField(default=False)
     is_pescatarian = models.BooleanField(default=False)
 
+    # Denormalized from steps and plan items, and kept up to date by the step and
+    # plan services, so that recipes can be read without aggregating relations.
+    preparation_time = models.DurationField(
+        default=timedelta(seconds=0), editable=False
+    )
+    cooking_time = models.DurationField(default=timedelta(seconds=0), editable=False)
+    total_time = models.DurationField(default=timedelta(seconds=0), editable=False)
+    num_plan_usages = models.PositiveIntegerField(default=0, editable=False)
+
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted search document, kept up to date by the recipe services.",
+    )
+
     objects = _RecipeManager()
 
     class Meta:
         verbose_name = "recipe"
         verbose_name_plural = "recipes"
+        indexes: ClassVar = [
+            # Used for cursor pagination of the recipe list, newest first.
+            models.Index(
+                fields=["-created_at", "-id"], name="recipe_created_at_id_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="recipe_search_vector_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.id})"
@@ -108,6 +108,15 @@ class RecipeRecord(BaseModel):
         )
 
 
+class RecipeListRecord(RecipeRecord):
+    duration: RecipeDurationRecord
+
+
+class RecipeListPageRecord(BaseModel):
+    items: list[RecipeListRecord]
+    next_cursor: str | None
+
+
 class RecipeDetailRecord(RecipeRecord):
     duration: RecipeDurationRecord
     glycemic_data: RecipeGlycemicData | None  # TODO: Needs to be annotated
@@ -1,28 +1,80 @@
-from django.db.models import QuerySet
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, TypeVar
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
+from django.db.models import (
+    ExpressionWrapper,
+    F,
+    JSONField,
+    Model,
+    OuterRef,
+    Q,
+    QuerySet,
+)
+from django.db.models.functions import Extract, JSONObject
+
+from nest.products.core.models import Product
+from nest.products.core.records import ProductRecord
+from nest.units.models import Unit
+from nest.units.records import UnitRecord
 
 from ...core.exceptions import ApplicationError
 from ...core.types import FetchedResult
+from ..ingredients.models import RecipeIngredientItem, RecipeIngredientItemGroup
+from ..ingredients.records import (
+    RecipeIngredientItemGroupRecord,
+    RecipeIngredientItemRecord,
+    RecipeIngredientRecord,
+)
 from ..ingredients.selectors import (
     get_recipe_ingredient_item_groups_for_recipes,
 )
+from ..steps.enums import RecipeStepType
+from ..steps.models import RecipeStep, RecipeStepIngredientItem
+from ..steps.records import RecipeStepRecord
 from ..steps.selectors import get_steps_for_recipes
+from .cache import get_recipe_detail_cache_key
+from .constants import RECIPE_SEARCH_CONFIG
 from .enums import RecipeDifficulty, RecipeStatus
 from .models import Recipe
 from .records import (
     RecipeDetailRecord,
     RecipeDurationRecord,
+    RecipeListPageRecord,
+    RecipeListRecord,
+    RecipeRecord,
 )
 
+T_MODEL = TypeVar("T_MODEL", bound=Model)
+
+RECIPE_LIST_DEFAULT_LIMIT = 50
+RECIPE_LIST_MAX_LIMIT = 200
+
 
 def get_recipe(*, pk: int) -> RecipeDetailRecord:
     """
-    Get a recipe instance.
+    Get a recipe instance. The recipe is cached until the recipe, or any of its
+    steps, ingredients or products, changes.
     """
-    recipe = get_recipes_by_id(recipe_ids=[pk])[pk]
+    cache_key = get_recipe_detail_cache_key(recipe_id=pk)
+    recipe: RecipeDetailRecord | None = cache.get(cache_key)
+
+    if recipe is not None:
+        return recipe
+
+    recipe = get_recipe_details_by_id(recipe_ids=[pk])[pk]
 
     if not recipe:
         raise ApplicationError("Recipe was not found", status_code=404)
 
+    cache.set(cache_key, recipe)
+
     return recipe
 
 
@@ -33,11 +85,7 @@ def get_recipe_data(*, qs: QuerySet[Recipe]) -> FetchedResult[RecipeDetailRecord
     """
     result: FetchedResult[RecipeDetailRecord] = {}
 
-    recipes = (
-        qs.annotate_duration()  # type: ignore
-        .annotate_num_plan_usages()
-        .order_by("-created_at")
-    )
+    recipes = qs.order_by("-created_at")
 
     recipe_ids = [recipe.id for recipe in recipes]
     steps = get_steps_for_recipes(recipe_ids=recipe_ids)
@@ -65,7 +113,7 @@ def get_recipe_data(*, qs: QuerySet[Recipe]) -> FetchedResult[RecipeDetailRecord
             health_score=None,
             ingredient_item_groups=ingredient_groups[recipe.id],
             steps=steps[recipe.id],
-            num_plan_usages=getattr(recipe, "num_plan_usages", 0),
+            num_plan_usages=recipe.num_plan_usages,
         )
 
     return result
@@ -98,3 +146,394 @@ def get_recipes() -> list[RecipeDetailRecord]:
     qs = Recipe.objects.all()
     result = get_recipe_data(qs=qs)
     return [value for value in result.values() if value is not None]
+
+
+def get_recipe_list(
+    *,
+    cursor: str | None = None,
+    limit: int = RECIPE_LIST_DEFAULT_LIMIT,
+    status: RecipeStatus | None = None,
+    difficulty: RecipeDifficulty | None = None,
+    is_vegetarian: bool | None = None,
+    is_pescatarian: bool | None = None,
+    max_total_time: timedelta | None = None,
+) -> RecipeListPageRecord:
+    """
+    Get a page of recipes, newest first, without steps and ingredients. Pages are
+    fetched by cursor, using the created time and id of the last recipe on the
+    previous page, so the cost of a page does not depend on the number of recipes.
+    """
+
+    if not 0 < limit <= RECIPE_LIST_MAX_LIMIT:
+        raise ApplicationError(
+            f"Limit must be between 1 and {RECIPE_LIST_MAX_LIMIT}.", status_code=400
+        )
+
+    filters = Q()
+
+    if status is not None:
+        filters &= Q(status=status)
+    if difficulty is not None:
+        filters &= Q(difficulty=difficulty)
+    if is_vegetarian is not None:
+        filters &= Q(is_vegetarian=is_vegetarian)
+    if is_pescatarian is not None:
+        filters &= Q(is_pescatarian=is_pescatarian)
+    if max_total_time is not None:
+        filters &= Q(total_time__lte=max_total_time)
+
+    if cursor is not None:
+        created_at, recipe_id = _decode_recipe_list_cursor(cursor=cursor)
+        filters &= Q(created_at__lt=created_at) | Q(
+            created_at=created_at, id__lt=recipe_id
+        )
+
+    recipes = Recipe.objects.filter(filters).defer("search_vector")
+
+    # Fetch one extra recipe to know if there is a next page.
+    page = list(recipes.order_by("-created_at", "-id")[: limit + 1])
+    next_cursor = (
+        _encode_recipe_list_cursor(recipe=page[limit - 1])
+        if len(page) > limit
+        else None
+    )
+
+    return RecipeListPageRecord(
+        items=[
+            RecipeListRecord(
+                **RecipeRecord.from_recipe(recipe).dict(),
+                duration=RecipeDurationRecord.from_db_model(recipe),
+            )
+            for recipe in page[:limit]
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_recipe_list_cursor(*, recipe: Recipe) -> str:
+    value = json.dumps([recipe.created_at.isoformat(), recipe.id])
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def _decode_recipe_list_cursor(*, cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, recipe_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(recipe_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ApplicationError("Invalid cursor.", status_code=400) from exc
+
+
+def search_recipes(
+    *,
+    query: str,
+    cursor: str | None = None,
+    limit: int = RECIPE_LIST_DEFAULT_LIMIT,
+) -> RecipeListPageRecord:
+    """
+    Get a page of recipes matching a search query, best match first. The query
+    supports web search syntax, e.g. quoted phrases, "or" and negation with "-".
+    """
+
+    if not query.strip():
+        raise ApplicationError("Search query cannot be empty.", status_code=400)
+
+    if not 0 < limit <= RECIPE_LIST_MAX_LIMIT:
+        raise ApplicationError(
+            f"Limit must be between 1 and {RECIPE_LIST_MAX_LIMIT}.", status_code=400
+        )
+
+    # Ranks are floats, and does not make for a stable keyset, so search results are
+    # paged by offset instead.
+    offset = _decode_recipe_search_cursor(cursor=cursor) if cursor is not None else 0
+    search_query = SearchQuery(
+        query, config=RECIPE_SEARCH_CONFIG, search_type="websearch"
+    )
+
+    recipes = (
+        Recipe.objects.filter(search_vector=search_query)
+        .defer("search_vector")
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-id")
+    )
+
+    # Fetch one extra recipe to know if there is a next page.
+    page = list(recipes[offset : offset + limit + 1])
+    next_cursor = (
+        _encode_recipe_search_cursor(offset=offset + limit)
+        if len(page) > limit
+        else None
+    )
+
+    return RecipeListPageRecord(
+        items=[
+            RecipeListRecord(
+                **RecipeRecord.from_recipe(recipe).dict(),
+                duration=RecipeDurationRecord.from_db_model(recipe),
+            )
+            for recipe in page[:limit]
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_recipe_search_cursor(*, offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps(offset).encode()).decode()
+
+
+def _decode_recipe_search_cursor(*, cursor: str) -> int:
+    try:
+        offset = int(json.loads(base64.urlsafe_b64decode(cursor)))
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ApplicationError("Invalid cursor.", status_code=400) from exc
+
+    if offset < 0:
+        raise ApplicationError("Invalid cursor.", status_code=400)
+
+    return offset
+
+
+def get_recipe_details_by_id(
+    *, recipe_ids: list[int]
+) -> FetchedResult[RecipeDetailRecord | None]:
+    """
+    Same as get_recipes_by_id, but builds every recipe with its steps, ingredient
+    groups, items, products and units as a single JSON document in Postgres, so
+    that all data is fetched in a single query without instantiating the models.
+    """
+
+    result: FetchedResult[RecipeDetailRecord | None] = {
+        recipe_id: None for recipe_id in recipe_ids
+    }
+
+    recipes = (
+        Recipe.objects.filter(id__in=recipe_ids)
+        .annotate(
+            data=ExpressionWrapper(
+                _get_recipe_json_object(),
+                output_field=JSONField(decoder=_DecimalJSONDecoder),
+            )
+        )
+        .values_list("data", flat=True)
+    )
+
+    for recipe in recipes:
+        result[recipe["id"]] = _get_recipe_detail_record_from_json(data=recipe)
+
+    return result
+
+
+class _DecimalJSONDecoder(json.JSONDecoder):
+    """
+    Decode JSON numbers with decimals as Decimal, keeping the scale of numeric columns.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, parse_float=Decimal, **kwargs)
+
+
+def _get_model_json_object(model: type[Model], *, prefix: str = "") -> JSONObject:
+    """
+    Get a JSON object of all concrete fields of a model, looked up through prefix.
+    """
+
+    return JSONObject(
+        **{
+            field.attname: f"{prefix}{field.attname}"
+            for field in model._meta.concrete_fields  # type: ignore
+        }
+    )
+
+
+def _get_model_from_json(model: type[T_MODEL], *, data: dict[str, Any]) -> T_MODEL:
+    """
+    Get an unsaved model instance from a JSON object made by _get_model_json_object.
+    """
+
+    return model(
+        **{
+            field.attname: field.to_python(data[field.attname])
+            for field in model._meta.concrete_fields  # type: ignore
+        }
+    )
+
+
+def _get_ingredient_item_json_object(*, prefix: str = "") -> JSONObject:
+    """
+    Get a JSON object of an ingredient item, with its ingredient, product and units,
+    looked up through prefix.
+    """
+
+    return JSONObject(
+        id=f"{prefix}id",
+        group_title=f"{prefix}ingredient_group__title",
+        additional_info=f"{prefix}additional_info",
+        portion_quantity=f"{prefix}portion_quantity",
+        portion_quantity_unit=_get_model_json_object(
+            Unit, prefix=f"{prefix}portion_quantity_unit__"
+        ),
+        ingredient=JSONObject(
+            id=f"{prefix}ingredient__id",
+            title=f"{prefix}ingredient__title",
+            is_base_ingredient=f"{prefix}ingredient__is_base_ingredient",
+            product=_get_model_json_object(
+                Product, prefix=f"{prefix}ingredient__product__"
+            ),
+            product_unit=_get_model_json_object(
+                Unit, prefix=f"{prefix}ingredient__product__unit__"
+            ),
+        ),
+    )
+
+
+def _get_recipe_json_object() -> JSONObject:
+    """
+    Get a JSON object of a recipe, with steps and ingredient groups nested as arrays.
+    """
+
+    steps = (
+        RecipeStep.objects.filter(recipe_id=OuterRef("pk"))
+        .order_by("number")
+        .values(
+            json=JSONObject(
+                id="id",
+                number="number",
+                duration_seconds=Extract("duration", "epoch"),
+                instruction="instruction",
+                step_type="step_type",
+                ingredient_items=ArraySubquery(
+                    RecipeStepIngredientItem.objects.filter(step_id=OuterRef("pk"))
+                    .order_by("id")
+                    .values(
+                        json=_get_ingredient_item_json_object(
+                            prefix="ingredient_item__"
+                        )
+                    )
+                ),
+            )
+        )
+    )
+    ingredient_item_groups = (
+        RecipeIngredientItemGroup.objects.filter(recipe_id=OuterRef("pk"))
+        .order_by("ordering")
+        .values(
+            json=JSONObject(
+                id="id",
+                title="title",
+                ordering="ordering",
+                ingredient_items=ArraySubquery(
+                    RecipeIngredientItem.objects.filter(
+                        ingredient_group_id=OuterRef("pk")
+                    )
+                    .order_by("id")
+                    .values(json=_get_ingredient_item_json_object())
+                ),
+            )
+        )
+    )
+    return JSONObject(
+        id="id",
+        title="title",
+        slug="slug",
+        default_num_portions="default_num_portions",
+        search_keywords="search_keywords",
+        external_id="external_id",
+        external_url="external_url",
+        status="status",
+        difficulty="difficulty",
+        is_vegetarian="is_vegetarian",
+        is_pescatarian="is_pescatarian",
+        preparation_time_seconds=Extract("preparation_time", "epoch"),
+        cooking_time_seconds=Extract("cooking_time", "epoch"),
+        total_time_seconds=Extract("total_time", "epoch"),
+        num_plan_usages="num_plan_usages",
+        steps=ArraySubquery(steps),
+        ingredient_item_groups=ArraySubquery(ingredient_item_groups),
+    )
+
+
+def _get_ingredient_item_record_from_json(
+    *, data: dict[str, Any]
+) -> RecipeIngredientItemRecord:
+    ingredient = data["ingredient"]
+    product_record = None
+
+    # The product is left joined, so a missing product has all fields set to null.
+    if ingredient["product"]["id"] is not None:
+        product = _get_model_from_json(Product, data=ingredient["product"])
+        product.unit = _get_model_from_json(Unit, data=ingredient["product_unit"])
+        product_record = ProductRecord.from_product(product)
+
+    portion_quantity = Decimal(data["portion_quantity"])
+
+    return RecipeIngredientItemRecord(
+        id=data["id"],
+        group_title=data["group_title"],
+        ingredient=RecipeIngredientRecord(
+            id=ingredient["id"],
+            title=ingredient["title"],
+            product=product_record,
+            is_base_ingredient=ingredient["is_base_ingredient"],
+        ),
+        additional_info=data["additional_info"],
+        portion_quantity=portion_quantity,
+        portion_quantity_unit=UnitRecord.from_unit(
+            _get_model_from_json(Unit, data=data["portion_quantity_unit"])
+        ),
+        portion_quantity_display="{:f}".format(portion_quantity.normalize()),
+    )
+
+
+def _get_recipe_detail_record_from_json(*, data: dict[str, Any]) -> RecipeDetailRecord:
+    steps = [
+        RecipeStepRecord(
+            id=step["id"],
+            number=step["number"],
+            duration=timedelta(seconds=float(step["duration_seconds"])),
+            instruction=step["instruction"],
+            step_type=RecipeStepType(step["step_type"]),
+            step_type_display=RecipeStepType(step["step_type"]).label,
+            ingredient_items=[
+                _get_ingredient_item_record_from_json(data=item)
+                for item in step["ingredient_items"]
+            ],
+        )
+        for step in data["steps"]
+    ]
+    ingredient_item_groups = [
+        RecipeIngredientItemGroupRecord(
+            id=group["id"],
+            title=group["title"],
+            ordering=group["ordering"],
+            ingredient_items=[
+                _get_ingredient_item_record_from_json(data=item)
+                for item in group["ingredient_items"]
+            ],
+        )
+        for group in data["ingredient_item_groups"]
+    ]
+
+    return RecipeDetailRecord(
+        id=data["id"],
+        title=data["title"],
+        slug=data["slug"],
+        default_num_portions=data["default_num_portions"],
+        search_keywords=data["search_keywords"],
+        external_id=data["external_id"],
+        external_url=data["external_url"],
+        status=RecipeStatus(data["status"]),
+        status_display=RecipeStatus(data["status"]).label,
+        difficulty=RecipeDifficulty(data["difficulty"]),
+        difficulty_display=RecipeDifficulty(data["difficulty"]).label,
+        is_vegetarian=data["is_vegetarian"],
+        is_pescatarian=data["is_pescatarian"],
+        duration=RecipeDurationRecord.from_datetime(
+            preparation_time=timedelta(seconds=float(data["preparation_time_seconds"])),
+            cooking_time=timedelta(seconds=float(data["cooking_time_seconds"])),
+            total_time=timedelta(seconds=float(data["total_time_seconds"])),
+        ),
+        glycemic_data=None,
+        health_score=None,
+        ingredient_item_groups=ingredient_item_groups,
+        steps=steps,
+        num_plan_usages=data["num_plan_usages"],
+    )
@@ -1,7 +1,10 @@
 import functools
 from typing import Any
 
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchVector
 from django.db import transaction
+from django.db.models import Func, OuterRef, QuerySet, TextField, Value
 from django.http import HttpRequest
 from django.utils.text import slugify
 
@@ -9,11 +12,15 @@ from nest.audit_logs.services import log_create_or_updated
 from nest.core.exceptions import ApplicationError
 from nest.core.services import model_update
 
+from ..ingredients.models import RecipeIngredientItem
 from ..ingredients.services import (
     IngredientGroupItem,
     create_or_update_recipe_ingredient_item_groups,
 )
+from ..steps.models import RecipeStep
 from ..steps.services import Step, create_or_update_recipe_steps
+from .cache import invalidate_recipe_details
+from .constants import RECIPE_SEARCH_CONFIG
 from .enums import RecipeDifficulty, RecipeStatus
 from .models import Recipe
 from .records import RecipeRecord
@@ -143,6 +150,12 @@ def create_or_update_recipe_attributes(
         )
     )
 
+    # Steps are created in their own on commit hook, which runs before this one.
+    transaction.on_commit(
+        functools.partial(update_recipe_search_vectors, recipe_ids=[recipe_id])
+    )
+    invalidate_recipe_details(recipe_ids=[recipe_id])
+
 
 @transaction.atomic
 def edit_recipe(
@@ -170,3 +183,47 @@ def edit_recipe(
             steps=steps,
         )
     )
+
+
+def _get_joined_text(queryset: QuerySet[Any]) -> Func:
+    """
+    Get the text values of a single column subquery joined by spaces.
+    """
+
+    return Func(
+        ArraySubquery(queryset),
+        Value(" "),
+        function="array_to_string",
+        output_field=TextField(),
+    )
+
+
+def update_recipe_search_vectors(*, recipe_ids: list[int]) -> None:
+    """
+    Rebuild the search vector of recipes, weighting matches in the title highest,
+    followed by search keywords, ingredient titles and step instructions.
+    """
+
+    ingredient_titles = RecipeIngredientItem.objects.filter(
+        ingredient_group__recipe_id=OuterRef("pk")
+    ).values("ingredient__title")
+    step_instructions = RecipeStep.objects.filter(recipe_id=OuterRef("pk")).values(
+        "instruction"
+    )
+
+    search_vector = (
+        SearchVector("title", weight="A", config=RECIPE_SEARCH_CONFIG)
+        + SearchVector("search_keywords", weight="B", config=RECIPE_SEARCH_CONFIG)
+        + SearchVector(
+            _get_joined_text(ingredient_titles),
+            weight="C",
+            config=RECIPE_SEARCH_CONFIG,
+        )
+        + SearchVector(
+            _get_joined_text(step_instructions),
+            weight="D",
+            config=RECIPE_SEARCH_CONFIG,
+        )
+    )
+
+    Recipe.objects.filter(id__in=recipe_ids).update(search_vector=search_vector)
@@ -2,8 +2,9 @@ from datetime import timedelta
 
 import pytest
 
+from nest.recipes.plans.models import RecipePlan, RecipePlanItem
 from nest.recipes.steps.enums import RecipeStepType
-from nest.recipes.steps.tests.utils import create_recipe_step
+from nest.recipes.steps.models import RecipeStep
 
 from ..models import Recipe
 from .utils import create_recipe
@@ -12,42 +13,76 @@ pytestmark = pytest.mark.django_db
 
 
 class TestRecipeQuerySet:
-    def test_manager_annotate_duration(self, django_assert_num_queries):
+    def test_manager_update_duration(self, django_assert_num_queries):
         """
-        Test that the annotate_duration manager correctly annotates duration values.
+        Test that the update_duration manager correctly stores duration values.
         """
         recipe = create_recipe()
+        other_recipe = create_recipe()
 
         step1_duration = 5
-        create_recipe_step(
-            recipe=recipe, duration=step1_duration, step_type=RecipeStepType.PREPARATION
-        )
-
         step2_duration = 5
-        create_recipe_step(
-            recipe=recipe, duration=step2_duration, step_type=RecipeStepType.COOKING
-        )
-
         step3_duration = 10
-        create_recipe_step(
-            recipe=recipe, duration=step3_duration, step_type=RecipeStepType.COOKING
+        RecipeStep.objects.bulk_create(
+            [
+                RecipeStep(
+                    recipe=recipe,
+                    number=1,
+                    duration=timedelta(minutes=step1_duration),
+                    step_type=RecipeStepType.PREPARATION,
+                ),
+                RecipeStep(
+                    recipe=recipe,
+                    number=2,
+                    duration=timedelta(minutes=step2_duration),
+                    step_type=RecipeStepType.COOKING,
+                ),
+                RecipeStep(
+                    recipe=recipe,
+                    number=3,
+                    duration=timedelta(minutes=step3_duration),
+                    step_type=RecipeStepType.COOKING,
+                ),
+            ]
         )
 
         with django_assert_num_queries(1):
-            recipe_with_duration = (
-                Recipe.objects.filter(id=recipe.id).annotate_duration().first()
-            )
+            Recipe.objects.filter(id__in=[recipe.id, other_recipe.id]).update_duration()
 
-        assert hasattr(recipe_with_duration, "preparation_time")
-        assert hasattr(recipe_with_duration, "cooking_time")
-        assert hasattr(recipe_with_duration, "total_time")
+        recipe.refresh_from_db()
+        other_recipe.refresh_from_db()
 
-        assert recipe_with_duration.preparation_time == timedelta(
-            seconds=step1_duration * 60
-        )
-        assert recipe_with_duration.cooking_time == timedelta(
+        assert recipe.preparation_time == timedelta(seconds=step1_duration * 60)
+        assert recipe.cooking_time == timedelta(
             seconds=(step2_duration + step3_duration) * 60
         )
-        assert recipe_with_duration.total_time == timedelta(
+        assert recipe.total_time == timedelta(
             seconds=(step1_duration + step2_duration + step3_duration) * 60
         )
+        assert other_recipe.total_time == timedelta(seconds=0)
+
+    def test_manager_update_num_plan_usages(self, django_assert_num_queries):
+        """
+        Test that the update_num_plan_usages manager correctly stores the number of
+        plans a recipe has been used in.
+        """
+        recipe = create_recipe()
+        other_recipe = create_recipe()
+
+        for week in range(2):
+            plan = RecipePlan.objects.create(
+                title=f"Plan {week}",
+                slug=f"plan-{week}",
+            )
+            RecipePlanItem.objects.create(recipe_plan=plan, recipe=recipe, ordering=1)
+
+        with django_assert_num_queries(1):
+            Recipe.objects.filter(
+                id__in=[recipe.id, other_recipe.id]
+            ).update_num_plan_usages()
+
+        recipe.refresh_from_db()
+        other_recipe.refresh_from_db()
+
+        assert recipe.num_plan_usages == 2
+        assert other_recipe.num_plan_usages == 0
@@ -0,0 +1,199 @@
+from datetime import timedelta
+
+import pytest
+
+from nest.core.exceptions import ApplicationError
+from nest.products.core.tests.utils import create_product
+from nest.recipes.ingredients.models import RecipeIngredient
+from nest.recipes.ingredients.tests.utils import (
+    create_recipe_ingredient,
+    create_recipe_ingredient_item,
+    create_recipe_ingredient_item_group,
+)
+from nest.recipes.steps.enums import RecipeStepType
+from nest.recipes.steps.models import RecipeStepIngredientItem
+from nest.recipes.steps.tests.utils import create_recipe_step
+
+from ..enums import RecipeDifficulty, RecipeStatus
+from ..selectors import (
+    get_recipe_details_by_id,
+    get_recipe_list,
+    get_recipes_by_id,
+    search_recipes,
+)
+from ..services import update_recipe_search_vectors
+from .utils import create_recipe
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRecipeCoreSelectors:
+    def test_selector_get_recipe_details_by_id(self, django_assert_num_queries):
+        """
+        Test that get_recipe_details_by_id returns the same records as
+        get_recipes_by_id in a single query.
+        """
+        recipe1 = create_recipe(title="Recipe 1")
+        recipe2 = create_recipe(title="Recipe 2", search_keywords="sausage")
+        create_recipe_step(
+            recipe=recipe1, number=2, duration=10, step_type=RecipeStepType.COOKING
+        )
+        recipe1_step = create_recipe_step(
+            recipe=recipe1, number=1, step_type=RecipeStepType.PREPARATION
+        )
+
+        group1 = create_recipe_ingredient_item_group(
+            title="Group 1", recipe=recipe1, ordering=1
+        )
+        group2 = create_recipe_ingredient_item_group(
+            title="Group 2", recipe=recipe1, ordering=0
+        )
+        tomatoes = create_recipe_ingredient_item(
+            ingredient_group=group1,
+            ingredient=create_recipe_ingredient(
+                title="Tomatoes, red",
+                product=create_product(name="Red tomatoes", gross_price="12.50"),
+            ),
+            portion_quantity="0.50",
+            portion_quantity_unit="kg",
+        )
+        create_recipe_ingredient_item(
+            ingredient_group=group2,
+            ingredient=RecipeIngredient.objects.create(title="Salt"),
+            additional_info="To taste",
+        )
+        RecipeStepIngredientItem.objects.create(
+            step=recipe1_step, ingredient_item=tomatoes
+        )
+
+        with django_assert_num_queries(1):
+            recipes = get_recipe_details_by_id(recipe_ids=[recipe1.id, recipe2.id, 0])
+
+        expected_recipes = get_recipes_by_id(recipe_ids=[recipe1.id, recipe2.id, 0])
+
+        assert recipes == expected_recipes
+        assert recipes[0] is None
+
+        recipe = recipes[recipe1.id]
+        assert recipe is not None
+        assert [group.title for group in recipe.ingredient_item_groups] == [
+            "Group 2",
+            "Group 1",
+        ]
+        assert [step.number for step in recipe.steps] == [1, 2]
+        assert recipe.steps[0].ingredient_items[0].id == tomatoes.id
+        assert (
+            recipe.ingredient_item_groups[0].ingredient_items[0].ingredient.product
+            is None
+        )
+        assert recipe.duration.total_time_iso8601 == "PT15M"
+
+    def test_selector_get_recipe_list(self, django_assert_num_queries):
+        """
+        Test that get_recipe_list pages through recipes newest first by cursor, within
+        query limits, and that filters are applied.
+        """
+        recipes = [create_recipe(title=f"Recipe {index}") for index in range(5)]
+        vegetarian_recipe = create_recipe(
+            title="Vegetarian recipe",
+            is_vegetarian=True,
+            difficulty=RecipeDifficulty.HARD,
+            status=RecipeStatus.DRAFT,
+        )
+        create_recipe_step(recipe=vegetarian_recipe, duration=30)
+        create_recipe_step(recipe=recipes[0], duration=10)
+
+        with django_assert_num_queries(1):
+            first_page = get_recipe_list(limit=4)
+
+        assert [recipe.id for recipe in first_page.items] == [
+            vegetarian_recipe.id,
+            recipes[4].id,
+            recipes[3].id,
+            recipes[2].id,
+        ]
+        assert first_page.items[0].duration.total_time == timedelta(minutes=30)
+        assert first_page.next_cursor is not None
+
+        last_page = get_recipe_list(limit=4, cursor=first_page.next_cursor)
+
+        assert [recipe.id for recipe in last_page.items] == [
+            recipes[1].id,
+            recipes[0].id,
+        ]
+        assert last_page.next_cursor is None
+
+        def get_ids(**filters):
+            return [recipe.id for recipe in get_recipe_list(**filters).items]
+
+        assert get_ids(is_vegetarian=True) == [vegetarian_recipe.id]
+        assert get_ids(difficulty=RecipeDifficulty.HARD) == [vegetarian_recipe.id]
+        assert vegetarian_recipe.id not in get_ids(status=RecipeStatus.PUBLISHED)
+        assert get_ids(max_total_time=timedelta(minutes=20)) == [
+            recipes[4].id,
+            recipes[3].id,
+            recipes[2].id,
+            recipes[1].id,
+            recipes[0].id,
+        ]
+
+        with pytest.raises(ApplicationError):
+            get_recipe_list(cursor="invalid")
+
+        with pytest.raises(ApplicationError):
+            get_recipe_list(limit=0)
+
+    def test_selector_search_recipes(self, django_assert_num_queries):
+        """
+        Test that search_recipes finds recipes by title, keywords, ingredients and
+        steps, ranks title matches first, and pages through results by cursor.
+        """
+        chicken_curry = create_recipe(title="Kyllingcurry med ris")
+        chicken_salad = create_recipe(title="Salat", search_keywords="kylling")
+        chicken_soup = create_recipe(title="Suppe")
+        salmon = create_recipe(title="Ovnsbakt fisk")
+        create_recipe(title="Pasta")
+
+        create_recipe_ingredient_item(
+            ingredient_group=create_recipe_ingredient_item_group(recipe=chicken_soup),
+            ingredient=RecipeIngredient.objects.create(title="Kylling"),
+        )
+        create_recipe_ingredient_item(
+            ingredient_group=create_recipe_ingredient_item_group(recipe=salmon),
+            ingredient=RecipeIngredient.objects.create(title="Laks"),
+        )
+        create_recipe_step(
+            recipe=chicken_curry, instruction="Stek kyllingen gyllen.", duration=20
+        )
+
+        recipe_ids = [chicken_curry.id, chicken_salad.id, chicken_soup.id, salmon.id]
+        update_recipe_search_vectors(recipe_ids=recipe_ids)
+
+        with django_assert_num_queries(1):
+            first_page = search_recipes(query="kylling", limit=2)
+
+        assert [recipe.id for recipe in first_page.items] == [
+            chicken_salad.id,
+            chicken_soup.id,
+        ]
+        assert first_page.next_cursor is not None
+
+        last_page = search_recipes(
+            query="kylling", limit=2, cursor=first_page.next_cursor
+        )
+
+        assert [recipe.id for recipe in last_page.items] == [chicken_curry.id]
+        assert last_page.items[0].duration.total_time == timedelta(minutes=20)
+        assert last_page.next_cursor is None
+
+        assert [recipe.id for recipe in search_recipes(query="laks").items] == [
+            salmon.id
+        ]
+        assert search_recipes(query="kylling -suppe").items[-1].id == chicken_curry.id
+        assert search_recipes(query="taco").items == []
+
+        with pytest.raises(ApplicationError):
+            search_recipes(query=" ")
+
+        with pytest.raises(ApplicationError):
+            search_recipes(query="kylling", cursor="invalid")
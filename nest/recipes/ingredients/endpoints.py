@@ -1,14 +1,15 @@
-from django.http import HttpRequest
+from django.http import HttpRequest, StreamingHttpResponse
 from ninja import Router, Schema
 from store_kit.http import status
 
+from nest.api.renderers import stream_response
 from nest.api.responses import APIResponse
 from nest.core.decorators import staff_required
 
 from .forms import IngredientCreateForm
 from .records import RecipeIngredientRecord
 from .selectors import (
-    get_recipe_ingredients,
+    iter_recipe_ingredients,
 )
 from .services import (
     create_recipe_ingredient,
@@ -49,12 +50,10 @@ def recipe_ingredient_delete_api(
 
 
 @router.get("/", response=APIResponse[list[RecipeIngredientRecord]])
-def recipe_ingredient_list_api(
-    request: HttpRequest,
-) -> APIResponse[list[RecipeIngredientRecord]]:
+def recipe_ingredient_list_api(request: HttpRequest) -> StreamingHttpResponse:
     """
     Get a list off all ingredients in the application
     """
 
-    ingredients = get_recipe_ingredients()
-    return APIResponse(status="success", data=ingredients)
+    ingredients = iter_recipe_ingredients()
+    return stream_response(data=ingredients)
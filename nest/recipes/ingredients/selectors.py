@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import Iterable
 
 from django.db.models import Q
@@ -12,6 +13,9 @@ from .records import (
     RecipeIngredientRecord,
 )
 
+# Number of ingredients fetched at a time when iterating over all ingredients.
+RECIPE_INGREDIENT_LIST_CHUNK_SIZE = 1000
+
 
 def get_recipe_ingredients() -> list[RecipeIngredientRecord]:
     """
@@ -29,6 +33,24 @@ def get_recipe_ingredients() -> list[RecipeIngredientRecord]:
     return records
 
 
+def iter_recipe_ingredients(
+    *, chunk_size: int = RECIPE_INGREDIENT_LIST_CHUNK_SIZE
+) -> Iterator[RecipeIngredientRecord]:
+    """
+    Iterate over all ingredients in the application, fetching chunk_size ingredients
+    at a time, so that memory usage is flat regardless of the number of ingredients.
+    """
+    ingredients = (
+        RecipeIngredient.objects.all()
+        .select_related("product", "product__unit")
+        .order_by("-created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    for ingredient in ingredients:
+        yield RecipeIngredientRecord.from_db_model(ingredient)
+
+
 def _get_recipe_ingredient_items(
     expression: Q | None = None,
 ) -> list[RecipeIngredientItem]:
@@ -7,7 +7,9 @@ from pydantic import BaseModel, Field
 
 from nest.audit_logs.services import log_create_or_updated, log_delete
 from nest.core.exceptions import ApplicationError
+from nest.recipes.plans.services import update_recipe_product_requirements
 
+from ..core.cache import invalidate_recipe_details
 from .models import RecipeIngredient, RecipeIngredientItem, RecipeIngredientItemGroup
 from .records import RecipeIngredientRecord
 
@@ -44,11 +46,26 @@ def delete_recipe_ingredient(
     Delete a single ingredient instance.
     """
 
+    from nest.recipes.core.services import update_recipe_search_vectors
+
     ingredient = RecipeIngredient.objects.get(id=pk)
     log_delete(instance=ingredient, request=request, changes={})
 
+    recipe_ids = list(
+        RecipeIngredientItem.objects.filter(ingredient_id=ingredient.id)
+        .values_list("ingredient_group__recipe_id", flat=True)
+        .distinct()
+    )
+
     ingredient.delete()
 
+    if recipe_ids:
+        update_recipe_product_requirements(recipe_ids=recipe_ids)
+        invalidate_recipe_details(recipe_ids=recipe_ids)
+        transaction.on_commit(
+            functools.partial(update_recipe_search_vectors, recipe_ids=recipe_ids)
+        )
+
 
 class IngredientItem(BaseModel):
     id: int | None = None
@@ -151,6 +168,9 @@ def create_or_update_recipe_ingredient_items(
             id__in=ingreident_items_ids_to_delete
         ).delete()
 
+    update_recipe_product_requirements(recipe_ids=[recipe_id])
+    invalidate_recipe_details(recipe_ids=[recipe_id])
+
 
 def _validate_ingredient_item_groups(
     ingredient_group_items: list[IngredientGroupItem]
@@ -217,6 +237,8 @@ def create_or_update_recipe_ingredient_item_groups(
     if len(group_ids_to_delete):
         RecipeIngredientItemGroup.objects.filter(id__in=group_ids_to_delete).delete()
 
+    invalidate_recipe_details(recipe_ids=[recipe_id])
+
     transaction.on_commit(
         functools.partial(
             create_or_update_recipe_ingredient_items,
@@ -9,6 +9,7 @@ from ..selectors import (
     get_recipe_ingredient_item_groups_for_recipes,
     get_recipe_ingredient_items_for_groups,
     get_recipe_ingredients,
+    iter_recipe_ingredients,
 )
 from .utils import (
     create_recipe_ingredient,
@@ -140,3 +141,20 @@ class TestRecipeIngredientsSelectors:
             ingredients = get_recipe_ingredients()
 
         assert len(ingredients) == 3
+
+    def test_selector_iter_recipe_ingredients(self, django_assert_num_queries):
+        """
+        Test that the iter_recipe_ingredients selector yields the same records as
+        get_recipe_ingredients, fetching ingredients in chunks.
+        """
+
+        for index in range(3):
+            create_recipe_ingredient(
+                title=f"Ingredient {index}",
+                product=create_product(name=f"Product {index}"),
+            )
+
+        with django_assert_num_queries(1):
+            ingredients = list(iter_recipe_ingredients(chunk_size=2))
+
+        assert ingredients == get_recipe_ingredients()
@@ -1,21 +1,30 @@
+import bisect
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict
 from decimal import Decimal
-from typing import TypedDict
+from typing import ClassVar
 
 import polars as pl
+import structlog
 
 from nest.core.exceptions import ApplicationError
-from nest.recipes.core.records import RecipeDetailRecord
-from nest.units.utils import convert_unit_quantity
+from nest.recipes.plans.enums import PlanSolver
+from nest.recipes.plans.selectors import get_product_requirements_for_recipes
 
-
-class RecipeScoreData(TypedDict, total=True):
-    recipe_id: int
-    is_vegetarian: bool
-    is_pescatarian: bool
-    score: int
+logger = structlog.get_logger()
 
 
 class PlanDistributor:
+    SCORE_WEIGHTS: ClassVar[dict[str, int]] = {
+        "equal_products": 10,
+        "pescatarian": 5,
+        "vegetarian": 1,
+        "num_usages": -3,  # Punish recipes that's often used in plans.
+    }
+
     def __init__(
         self,
         budget: Decimal,
@@ -23,251 +32,526 @@ class PlanDistributor:
         num_portions_per_recipe: int,
         num_pescatarian: int,
         num_vegetarian: int,
-        applicable_recipes: list[RecipeDetailRecord],
+        applicable_recipes: pl.DataFrame,
+        solver: PlanSolver = PlanSolver.GREEDY,
+        time_limit_seconds: float = 5.0,
+        product_requirements_df: pl.DataFrame | None = None,
     ) -> None:
         self.budget = budget
         self.total_num_recipes = total_num_recipes
         self.num_portions_per_recipe = num_portions_per_recipe
         self.num_pescatarian = num_pescatarian
         self.num_vegetarian = num_vegetarian
-        self.recipes = applicable_recipes
+        self.recipes_df = applicable_recipes
         self.num_iterations = 0
         self.max_num_iterations = 20
+        self.solver = solver
+        self.time_limit_seconds = time_limit_seconds
 
-        self.products_df = self._get_products_dataframe()
+        self.products_df = self._get_products_dataframe(
+            product_requirements_df=product_requirements_df
+        )
 
         self.plan_recipe_ids: list[int] = []
+        self.plan_price = Decimal("0")
 
-    def _get_products_dataframe(self) -> pl.DataFrame:
-        """
-        Create pl.DataFrame containing product and ingredient data.
+    def _get_products_dataframe(
+        self, *, product_requirements_df: pl.DataFrame | None = None
+    ) -> pl.DataFrame:
         """
-        product_data = []
-
-        for recipe in self.recipes:
-            recipe_portion_factor = Decimal(
-                self.num_portions_per_recipe / recipe.default_num_portions
-            ).quantize(Decimal("1.0"))
-
-            for group in recipe.ingredient_item_groups:
-                for item in group.ingredient_items:
-                    product = item.ingredient.product
-
-                    if product is None:
-                        continue
-
-                    portion_quantity = item.portion_quantity * recipe_portion_factor
-
-                    converted_quantity = convert_unit_quantity(
-                        quantity=portion_quantity,
-                        from_unit=item.portion_quantity_unit,
-                        to_unit=product.unit,
-                        piece_weight=product.unit_quantity,
-                    )
-
-                    if converted_quantity is None or product.unit_quantity is None:
-                        raise ApplicationError(
-                            "Recipe or product is missing quantity, impossible to "
-                            "calculate required quantity without it",
-                            extra={"product_id": product.id},
-                        )
-
-                    data = {
-                        "recipe_id": recipe.id,
-                        "product_id": product.id,
-                        "name": product.full_name,
-                        "unit_price": product.gross_unit_price,
-                        "unit_quantity": product.unit_quantity,
-                        "unit_abbreviation": product.unit.abbreviation,
-                        "portion_quantity": item.portion_quantity,
-                        "portion_quantity_unit_abbr": item.portion_quantity_unit.abbreviation,
-                        "required_amount": converted_quantity / product.unit_quantity,
-                        "is_base_ingredient": item.ingredient.is_base_ingredient,
-                    }
-                    product_data.append(data)
-
-        return pl.DataFrame(product_data)
-
-    def _calculate_score_for_recipes(self) -> list[RecipeScoreData]:
+        Create pl.DataFrame containing the required amount of each product for each
+        recipe, adjusted to the number of portions wanted. Product requirements already
+        loaded, e.g. when creating plans for multiple homes, can be passed to avoid
+        fetching them again.
         """
-        Calculate a pleminiray score for all recipes based on common products used,
-        pescatarian and vegetarian.
-        """
-        recipes_data: list[RecipeScoreData] = []
-        score_weights = {
-            "equal_products": 10,
-            "pescatarian": 5,
-            "vegetarian": 1,
-            "num_usages": -3,  # Punish recipes that's often used in plans.
-        }
-
-        for recipe in self.recipes:
-            recipe_score = 0
-
-            # Get a frame of product ids associated with the current iteration.
-            recipe_product_ids = self.products_df.filter(
-                recipe_id=recipe.id
-            ).get_column("product_id")
-
-            # Count amount of products used in this recipe, which is also used in other
-            # recipes.
-            similar_products_count = (
-                self.products_df.filter(
-                    (pl.col("recipe_id") != recipe.id)
-                    & (pl.col("product_id").is_in(recipe_product_ids))
-                    & (pl.col("is_base_ingredient") is False)
-                )
-                .select("product_id")
-                .count()
-                .item()
+        recipe_portion_factors_df = pl.DataFrame(
+            {
+                "recipe_id": self.recipes_df["recipe_id"],
+                "portion_factor": [
+                    Decimal(
+                        self.num_portions_per_recipe / default_num_portions
+                    ).quantize(Decimal("1.0"))
+                    for default_num_portions in self.recipes_df["default_num_portions"]
+                ],
+            },
+            schema={"recipe_id": pl.Int64, "portion_factor": pl.Decimal(scale=1)},
+        )
+
+        if product_requirements_df is None:
+            product_requirements_df = get_product_requirements_for_recipes(
+                recipe_ids=self.recipes_df["recipe_id"].to_list()
             )
 
-            # Add score base on similarities with other producuts.
-            # Pitfall: commonalities like butter, oil etc. Maybe ok?
-            recipe_score += similar_products_count * score_weights["equal_products"]
+        products_df = product_requirements_df.join(
+            recipe_portion_factors_df, on="recipe_id"
+        )
+
+        missing_requirements_df = products_df.filter(
+            pl.col("required_amount").is_null()
+        )
 
-            num_pescatarian_recipes_added = len(
-                [d for d in recipes_data if d.get("is_pescatarian", False) is True]
+        if len(missing_requirements_df):
+            raise ApplicationError(
+                "Recipe or product is missing quantity, impossible to "
+                "calculate required quantity without it",
+                extra={"product_id": missing_requirements_df["product_id"][0]},
             )
 
-            if (
-                self.num_pescatarian
-                and num_pescatarian_recipes_added <= self.num_pescatarian
-                and recipe.is_pescatarian
-            ):
-                recipe_score += score_weights["pescatarian"]
+        return products_df.select(
+            "recipe_id",
+            "product_id",
+            "unit_price",
+            pl.col("required_amount") * pl.col("portion_factor"),
+            "is_base_ingredient",
+        )
 
-            num_vegeterian_recipes_added = len(
-                [d for d in recipes_data if d.get("is_vegetarian", False) is True]
-            )
+    def _calculate_score_for_recipes(self) -> pl.DataFrame:
+        """
+        Calculate a pleminiray score for all recipes based on common products used,
+        pescatarian and vegetarian. Scores are calculated in a single pass over the
+        products dataframe, rather than filtering it once per recipe.
+        """
+        recipes_df = self.recipes_df.select(
+            "recipe_id", "is_pescatarian", "is_vegetarian", "num_plan_usages"
+        )
 
-            if (
-                self.num_vegetarian
-                and num_vegeterian_recipes_added <= self.num_vegetarian
-                and recipe.is_vegetarian
-            ):
-                recipe_score += score_weights["vegetarian"]
+        # Count amount of products used in each recipe, which is also used in other
+        # recipes. Self-join the (distinct) products of each recipe with all product
+        # rows on product id, and drop the rows matching the recipe itself.
+        # Pitfall: commonalities like butter, oil etc. Maybe ok?
+        products_df = self.products_df.filter(~pl.col("is_base_ingredient")).select(
+            "recipe_id", "product_id"
+        )
+        similar_products_df = (
+            products_df.unique()
+            .join(products_df, on="product_id", suffix="_other")
+            .filter(pl.col("recipe_id") != pl.col("recipe_id_other"))
+            .group_by("recipe_id")
+            .agg(pl.len().cast(pl.Int64).alias("similar_products_count"))
+        )
 
-            recipe_score += recipe.num_plan_usages * score_weights["num_usages"]
+        # Recipes gets a bonus as long as the number of pescatarian/vegetarian recipes
+        # preceding it is within the wanted amount.
+        num_pescatarian_recipes_added = (
+            pl.col("is_pescatarian").cast(pl.Int64).cum_sum().shift(1, fill_value=0)
+        )
+        num_vegetarian_recipes_added = (
+            pl.col("is_vegetarian").cast(pl.Int64).cum_sum().shift(1, fill_value=0)
+        )
 
-            recipes_data.append(
-                RecipeScoreData(
-                    recipe_id=recipe.id,
-                    is_pescatarian=recipe.is_pescatarian,
-                    is_vegetarian=recipe.is_vegetarian,
-                    score=recipe_score,
-                )
+        pescatarian_score = (
+            pl.when(
+                pl.lit(self.num_pescatarian > 0)
+                & (num_pescatarian_recipes_added <= self.num_pescatarian)
+                & pl.col("is_pescatarian")
             )
+            .then(self.SCORE_WEIGHTS["pescatarian"])
+            .otherwise(0)
+        )
+        vegetarian_score = (
+            pl.when(
+                pl.lit(self.num_vegetarian > 0)
+                & (num_vegetarian_recipes_added <= self.num_vegetarian)
+                & pl.col("is_vegetarian")
+            )
+            .then(self.SCORE_WEIGHTS["vegetarian"])
+            .otherwise(0)
+        )
 
-        return recipes_data
+        return (
+            recipes_df.join(
+                similar_products_df, on="recipe_id", how="left", coalesce=True
+            )
+            .with_columns(pl.col("similar_products_count").fill_null(0))
+            .with_columns(
+                (
+                    pl.col("similar_products_count")
+                    * self.SCORE_WEIGHTS["equal_products"]
+                    + pescatarian_score
+                    + vegetarian_score
+                    + pl.col("num_plan_usages") * self.SCORE_WEIGHTS["num_usages"]
+                ).alias("score")
+            )
+            .select("recipe_id", "is_pescatarian", "is_vegetarian", "score")
+        )
 
-    def create_plan(
-        self, recipe_ids_to_exclude: list[int] | None = None
-    ) -> list[RecipeDetailRecord]:
+    def create_plan(self, recipe_ids_to_exclude: list[int] | None = None) -> list[int]:
         """
-        Attempt to create the recipe plan itself.
+        Attempt to create the recipe plan itself. Returns ids of the recipes in the
+        plan.
         """
 
         # Bump num to keep track of iterations made.
         self.num_iterations += 1
 
-        # If we've spent the allowed total iterations and still have not found an
-        # applicable plan, we give up.
-        if self.num_iterations >= self.max_num_iterations:
-            raise Exception("Unable to find an applicable plan...")
-
-        # Filter out recipe ids we want to exclude from the current and subsequent
-        # iterations. We attempt to create the plan requirively, which also menas that
-        # we're filtering recursively. Might have to rethink this as it severely narrows
-        # down options the further down the chain you go, but maybe it's alright?
+        # Filter out recipe ids we want to exclude from the plan altogether.
         recipe_ids_to_exclude = recipe_ids_to_exclude or []
         if len(recipe_ids_to_exclude):
-            filtered_recipes = [
-                recipe
-                for recipe in self.recipes
-                if recipe.id not in recipe_ids_to_exclude
-            ]
+            filtered_recipes_df = self.recipes_df.filter(
+                ~pl.col("recipe_id").is_in(recipe_ids_to_exclude)
+            )
 
             # No more recipes to attempt to create plan from, give up.
-            if not len(filtered_recipes):
-                raise Exception("Unable to find any applicable plan...")
+            if not len(filtered_recipes_df):
+                raise ApplicationError("Unable to find any applicable plan...")
 
-            self.recipes = filtered_recipes
+            self.recipes_df = filtered_recipes_df
 
-        recipes_data = self._calculate_score_for_recipes()
+        self._prepare_plan()
 
-        # Convert recipes into a dataframe and get the top n (total_num_recipes) with
-        # the highest scores.
-        recipes_df = (
-            pl.DataFrame(recipes_data)
-            .sort(by="score", descending=True)
-            .slice(0, self.total_num_recipes)
-        )
+        if self.solver == PlanSolver.BRANCH_AND_BOUND:
+            self._solve_branch_and_bound()
+        else:
+            self._solve_greedy()
+
+        # Swapping out recipes over budget shrinks the plan once there are no more
+        # recipes to swap in, so there might not be enough recipes left.
+        if len(self.plan_recipe_ids) != self.total_num_recipes:
+            raise ApplicationError(
+                "Something went wrong, we found more or less recipes than we were "
+                "supposed to."
+            )
 
-        recipes_df_ids = recipes_df.get_column("recipe_id")
+        return [
+            recipe_id
+            for recipe_id in self.recipes_df["recipe_id"]
+            if recipe_id in self.plan_recipe_ids
+        ]
 
-        # Calculate the total plan price by combining ingredients from all recipes being
-        # evaluated. E.g. if recipe 1 needs 0,5 cheese, and recipe 2 needs 0,5 cheese,
-        # we aggregate these into requiring 1 cheese in total, and thereafter
-        # calculating the price. We exclude base ingredients from the aggregated total.
-        total_plan_price = (
+    def _prepare_plan(self) -> None:
+        """
+        Score and rank all recipes, and set up the state needed to add and remove
+        recipes from the plan incrementally.
+        """
+        scores_df = self._calculate_score_for_recipes()
+
+        self._recipe_ids_by_position: list[int] = []
+        self._recipe_positions: dict[int, int] = {}
+        self._recipe_scores: dict[int, int] = {}
+        self._pescatarian_positions: list[int] = []
+        self._vegetarian_positions: list[int] = []
+
+        for position, row in enumerate(scores_df.iter_rows(named=True)):
+            recipe_id = row["recipe_id"]
+            self._recipe_ids_by_position.append(recipe_id)
+            self._recipe_positions[recipe_id] = position
+            self._recipe_scores[recipe_id] = row["score"]
+
+            if row["is_pescatarian"]:
+                self._pescatarian_positions.append(position)
+
+            if row["is_vegetarian"]:
+                self._vegetarian_positions.append(position)
+
+        # Required amount per product for each recipe. Base ingredients are excluded,
+        # as they're not a part of the plan price.
+        self._recipe_products: dict[int, list[tuple[int, Decimal]]] = defaultdict(list)
+        self._recipe_num_products: dict[int, int] = defaultdict(int)
+        self._product_unit_prices: dict[int, Decimal] = {}
+
+        for recipe_id, product_id, unit_price, required_amount, is_base_ingredient in (
             self.products_df.filter(
-                (pl.col("recipe_id").is_in(recipes_df_ids))
-                & (pl.col("is_base_ingredient") is False)
+                pl.col("recipe_id").is_in(list(self._recipe_positions))
             )
             .select(
-                [
-                    "recipe_id",
-                    "product_id",
-                    "unit_price",
-                    "required_amount",
-                ]
+                "recipe_id",
+                "product_id",
+                "unit_price",
+                "required_amount",
+                "is_base_ingredient",
             )
-            .groupby(["product_id", "unit_price"])
-            .agg(
-                [
-                    pl.col("required_amount").sum(),
-                    pl.col("recipe_id").alias("recipes").unique(),
-                ]
+            .iter_rows()
+        ):
+            self._recipe_num_products[recipe_id] += 1
+
+            if is_base_ingredient:
+                continue
+
+            self._recipe_products[recipe_id].append((product_id, required_amount))
+            self._product_unit_prices[product_id] = unit_price
+
+        # Recipes are ranked by score, and by the original ordering if scores are
+        # equal.
+        self._ranked_recipe_ids = [
+            recipe_id
+            for _score, _position, recipe_id in sorted(
+                (-score, self._recipe_positions[recipe_id], recipe_id)
+                for recipe_id, score in self._recipe_scores.items()
             )
-            .with_columns(
-                (
-                    "unit_price" * pl.col("required_amount").cast(pl.Float64).ceil()
-                ).alias("total_price")
+        ]
+
+        # Calculate the total plan price by combining ingredients from all recipes being
+        # evaluated. E.g. if recipe 1 needs 0,5 cheese, and recipe 2 needs 0,5 cheese,
+        # we aggregate these into requiring 1 cheese in total, and thereafter
+        # calculating the price.
+        self._product_quantities: dict[int, Decimal] = defaultdict(Decimal)
+        self.plan_price = Decimal("0")
+        self.plan_recipe_ids = []
+
+    def _solve_greedy(self) -> None:
+        """
+        Pick the top n (total_num_recipes) recipes with the highest scores as the
+        initial plan, and swap out recipes until the plan is within budget.
+        """
+        # Recipes not part of the plan are kept in a heap, so that the next best
+        # recipe can be found without sorting all recipes again.
+        self._candidates_heap = [
+            (
+                -self._recipe_scores[recipe_id],
+                self._recipe_positions[recipe_id],
+                recipe_id,
             )
-            .select("total_price")
-            .sum()
-        ).item()
-
-        if total_plan_price <= self.budget:
-            # If we're within budget, get the ids from the recipes_df, do a sanity check
-            # and populate the plan_recipe_ids list.
-            recipe_ids = (
-                recipes_df.select([pl.col("recipe_id")])
-                .get_column("recipe_id")
-                .to_list()
+            for recipe_id in self._ranked_recipe_ids[self.total_num_recipes :]
+        ]
+        heapq.heapify(self._candidates_heap)
+
+        for recipe_id in self._ranked_recipe_ids[: self.total_num_recipes]:
+            self._add_plan_recipe(recipe_id=recipe_id)
+
+        while self.plan_price > self.budget:
+            # If we've spent the allowed total iterations and still have not found an
+            # applicable plan, we give up.
+            if self.num_iterations >= self.max_num_iterations:
+                raise ApplicationError("Unable to find an applicable plan...")
+
+            self.num_iterations += 1
+
+            # We're not within budget and have to re-iterate on the solution. Find the
+            # recipe that has the least common products with other recipes and try
+            # without that to avoid affecting the planned recipe list too much. Only
+            # the difference caused by the swap is applied to the plan price and
+            # scores, so a re-iteration is proportional to the size of the recipes
+            # swapped, not the whole plan.
+            least_occured_recipe_id = self._get_least_occured_plan_recipe_id()
+
+            if least_occured_recipe_id is None:
+                raise ApplicationError("Unable to find an applicable plan...")
+
+            self._swap_out_plan_recipe(recipe_id=least_occured_recipe_id)
+
+    def _solve_branch_and_bound(self) -> None:
+        """
+        Find the combination of n (total_num_recipes) recipes with the highest total
+        score within budget. Combinations are searched depth first in ranking order,
+        pruning branches that are over budget, or that cannot beat the best plan found
+        so far. If the time limit is reached, the best plan found so far is used.
+        """
+        # Adding a recipe to the plan never makes it cheaper, so recipes that are over
+        # budget on their own can never be a part of the plan.
+        self._search_recipe_ids: list[int] = []
+
+        for recipe_id in self._ranked_recipe_ids:
+            self._add_plan_recipe(recipe_id=recipe_id)
+
+            if self.plan_price <= self.budget:
+                self._search_recipe_ids.append(recipe_id)
+
+            self._remove_plan_recipe(recipe_id=recipe_id)
+
+        self._search_scores = [
+            self._recipe_scores[recipe_id] for recipe_id in self._search_recipe_ids
+        ]
+        self._search_cumulative_scores = list(
+            itertools.accumulate(self._search_scores, initial=0)
+        )
+        self._search_deadline = time.monotonic() + self.time_limit_seconds
+        self._best_plan_score: int | None = None
+        self._best_plan_recipe_ids: list[int] = []
+
+        is_completed = self._search_plans(start=0, score=0)
+
+        if not is_completed:
+            logger.warning(
+                "Time limit reached while searching for plan",
+                time_limit_seconds=self.time_limit_seconds,
+                best_plan_score=self._best_plan_score,
+            )
+
+        if self._best_plan_score is None:
+            raise ApplicationError("Unable to find an applicable plan...")
+
+        for recipe_id in self._best_plan_recipe_ids:
+            self._add_plan_recipe(recipe_id=recipe_id)
+
+    def _search_plans(self, *, start: int, score: int) -> bool:
+        """
+        Recursively add recipes from start onwards to the plan until it has n
+        (total_num_recipes) recipes, keeping track of the best plan found. The plan is
+        restored before returning. Returns False if the time limit was reached.
+        """
+        num_missing = self.total_num_recipes - len(self.plan_recipe_ids)
+
+        if num_missing == 0:
+            if self._best_plan_score is None or score > self._best_plan_score:
+                self._best_plan_score = score
+                self._best_plan_recipe_ids = list(self.plan_recipe_ids)
+
+            return True
+
+        for index in range(start, len(self._search_recipe_ids) - num_missing + 1):
+            if time.monotonic() >= self._search_deadline:
+                return False
+
+            # Recipes are ranked by score, so the best score achievable from here is
+            # to add the next recipes in order. As this only decreases with the
+            # index, the remaining branches can be skipped once it's not an
+            # improvement.
+            upper_bound = (
+                score
+                + self._search_cumulative_scores[index + num_missing]
+                - self._search_cumulative_scores[index]
             )
 
-            if len(recipe_ids) != self.total_num_recipes:
-                raise Exception(
-                    "Something went wrong, we found more or less recipes than we were "
-                    "supposed to."
+            if (
+                self._best_plan_score is not None
+                and upper_bound <= self._best_plan_score
+            ):
+                break
+
+            recipe_id = self._search_recipe_ids[index]
+            self._add_plan_recipe(recipe_id=recipe_id)
+
+            # Branches over budget are pruned, as adding more recipes to the plan
+            # won't make it any cheaper.
+            is_completed = True
+
+            if self.plan_price <= self.budget:
+                is_completed = self._search_plans(
+                    start=index + 1, score=score + self._search_scores[index]
                 )
 
-            self.plan_recipe_ids = recipe_ids
+            self._remove_plan_recipe(recipe_id=recipe_id)
 
-        else:
-            # We're not within budget and have to re-iterate on the solution. Find the
-            # recipe that has the least common products with other recipes and try to
-            # re-run plan without that to avoid affecting the planned recipe list too
-            # much.
-            least_occured_recipe_id = (
-                self.products_df.filter(pl.col("recipe_id").is_in(recipes_df_ids))
-                .select(pl.col("recipe_id").value_counts(sort=True).last())
-                .item()["recipe_id"]
+            if not is_completed:
+                return False
+
+        return True
+
+    def _add_plan_recipe(self, *, recipe_id: int) -> None:
+        """
+        Add a recipe to the plan and adjust the plan price accordingly.
+        """
+        self.plan_recipe_ids.append(recipe_id)
+        self._update_plan_product_quantities(recipe_id=recipe_id, sign=1)
+
+    def _remove_plan_recipe(self, *, recipe_id: int) -> None:
+        """
+        Remove a recipe from the plan and adjust the plan price accordingly.
+        """
+        self.plan_recipe_ids.remove(recipe_id)
+        self._update_plan_product_quantities(recipe_id=recipe_id, sign=-1)
+
+    def _swap_out_plan_recipe(self, *, recipe_id: int) -> None:
+        """
+        Remove a recipe from the plan, and replace it with the next best recipe not
+        already in the plan, if any.
+        """
+        self._remove_plan_recipe(recipe_id=recipe_id)
+        self._exclude_recipe_from_quotas(recipe_id=recipe_id)
+
+        next_recipe_id = self._pop_next_candidate_recipe_id()
+
+        if next_recipe_id is not None:
+            self._add_plan_recipe(recipe_id=next_recipe_id)
+
+    def _update_plan_product_quantities(self, *, recipe_id: int, sign: int) -> None:
+        """
+        Add (sign=1) or subtract (sign=-1) a recipe's required product amounts from the
+        aggregated plan quantities, and apply the resulting price difference to the
+        plan price. Products are bought in whole units, so the price only changes
+        when the rounded up quantity does.
+        """
+        for product_id, required_amount in self._recipe_products.get(recipe_id, []):
+            old_quantity = self._product_quantities[product_id]
+            new_quantity = old_quantity + sign * required_amount
+            self._product_quantities[product_id] = new_quantity
+
+            num_units_difference = math.ceil(new_quantity) - math.ceil(old_quantity)
+
+            if num_units_difference:
+                unit_price = self._product_unit_prices[product_id]
+                self.plan_price += unit_price * num_units_difference
+
+    def _exclude_recipe_from_quotas(self, *, recipe_id: int) -> None:
+        """
+        Adjust scores after a recipe is excluded from the plan. Recipes gets a bonus as
+        long as the number of pescatarian/vegetarian recipes preceding it is within the
+        wanted amount, so excluding one might move the next recipe within it.
+        """
+        position = self._recipe_positions[recipe_id]
+
+        for positions, num_wanted, weight in (
+            (
+                self._pescatarian_positions,
+                self.num_pescatarian,
+                self.SCORE_WEIGHTS["pescatarian"],
+            ),
+            (
+                self._vegetarian_positions,
+                self.num_vegetarian,
+                self.SCORE_WEIGHTS["vegetarian"],
+            ),
+        ):
+            index = bisect.bisect_left(positions, position)
+
+            if index == len(positions) or positions[index] != position:
+                continue
+
+            positions.pop(index)
+
+            if num_wanted and index <= num_wanted < len(positions):
+                self._increase_recipe_score(
+                    recipe_id=self._recipe_ids_by_position[positions[num_wanted]],
+                    amount=weight,
+                )
+
+    def _increase_recipe_score(self, *, recipe_id: int, amount: int) -> None:
+        self._recipe_scores[recipe_id] += amount
+
+        # Recipes in the plan already outranks the candidates, so it's only
+        # necessary to re-rank recipes that's not part of the plan. The old heap entry
+        # is ignored when popped, as its score is outdated.
+        if recipe_id not in self.plan_recipe_ids:
+            heapq.heappush(
+                self._candidates_heap,
+                (
+                    -self._recipe_scores[recipe_id],
+                    self._recipe_positions[recipe_id],
+                    recipe_id,
+                ),
             )
 
-            # Recurisvely try to create plan without the least occured recipe.
-            return self.create_plan(recipe_ids_to_exclude=[least_occured_recipe_id])
+    def _pop_next_candidate_recipe_id(self) -> int | None:
+        """
+        Get the recipe with the highest score that is not already a part of the plan.
+        """
+        while self._candidates_heap:
+            negative_score, _position, recipe_id = heapq.heappop(self._candidates_heap)
+
+            if -negative_score == self._recipe_scores[recipe_id]:
+                return recipe_id
+
+        return None
 
-        return [recipe for recipe in self.recipes if recipe.id in self.plan_recipe_ids]
+    def _get_least_occured_plan_recipe_id(self) -> int | None:
+        """
+        Get the recipe in the plan with the least products. If multiple recipes have
+        the same amount of products, the one with the lowest score is returned, and if
+        those are equal too, the one added to the plan last.
+        """
+        recipe_ids = [
+            recipe_id
+            for recipe_id in reversed(self.plan_recipe_ids)
+            if self._recipe_num_products.get(recipe_id)
+        ]
+
+        if not recipe_ids:
+            return None
+
+        return min(
+            recipe_ids,
+            key=lambda recipe_id: (
+                self._recipe_num_products[recipe_id],
+                self._recipe_scores[recipe_id],
+            ),
+        )
@@ -2,8 +2,11 @@ from django.http import HttpRequest
 from ninja import Router
 
 from nest.api.responses import APIResponse
-from nest.recipes.plans.records import RecipePlanRecord
-from nest.recipes.plans.selectors import get_recipe_plans_for_home
+from nest.recipes.plans.records import RecipePlanRecord, RecipePlanShoppingListRecord
+from nest.recipes.plans.selectors import (
+    get_recipe_plans_for_home,
+    get_shopping_list_for_recipe_plan,
+)
 
 router = Router(tags=["Recipe plans"])
 
@@ -14,3 +17,13 @@ def recipe_plan_list_for_home_api(
 ) -> APIResponse[list[RecipePlanRecord]]:
     recipe_plans = get_recipe_plans_for_home(home_id=home_id)
     return APIResponse(status="success", data=recipe_plans)
+
+
+@router.get(
+    "/{plan_id}/shopping-list/", response=APIResponse[RecipePlanShoppingListRecord]
+)
+def recipe_plan_shopping_list_api(
+    request: HttpRequest, plan_id: int
+) -> APIResponse[RecipePlanShoppingListRecord]:
+    shopping_list = get_shopping_list_for_recipe_plan(plan_id=plan_id)
+    return APIResponse(status="success", data=shopping_list)
@@ -0,0 +1,6 @@
+from django.db.models import TextChoices
+
+
+class PlanSolver(TextChoices):
+    GREEDY = "greedy", "Greedy"
+    BRANCH_AND_BOUND = "branch_and_bound", "Branch and bound"
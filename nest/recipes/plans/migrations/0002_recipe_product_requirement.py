@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_allergens_product_carbohydrates_and_more'),
+        ('recipes', '0001_initial'),
+        ('recipes_plans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeProductRequirement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created time')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='modified time')),
+                ('required_amount', models.DecimalField(blank=True, decimal_places=6, max_digits=12, null=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.product')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_requirements', to='recipes.recipe')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='recipeproductrequirement',
+            constraint=models.UniqueConstraint(fields=('recipe', 'product'), name='unique_recipe_product_requirement'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes_plans', '0002_recipe_product_requirement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeplan',
+            name='num_portions_per_recipe',
+            field=models.PositiveIntegerField(blank=True, help_text='Number of portions each recipe in the plan is made for.', null=True),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations
+
+from nest.units.enums import UnitType
+from nest.units.records import UnitRecord
+from nest.units.utils import convert_unit_quantity
+
+
+def populate_recipe_product_requirements(apps, schema_editor) -> None:
+    RecipeIngredientItem = apps.get_model("recipes_ingredients", "RecipeIngredientItem")
+    RecipeProductRequirement = apps.get_model(
+        "recipes_plans", "RecipeProductRequirement"
+    )
+
+    ingredient_items = RecipeIngredientItem.objects.filter(
+        ingredient__product__isnull=False
+    ).select_related(
+        "ingredient_group",
+        "ingredient__product__unit",
+        "portion_quantity_unit",
+    )
+
+    def get_unit_record(unit):
+        return UnitRecord(
+            id=unit.id,
+            name=unit.name,
+            name_pluralized=unit.name_pluralized,
+            abbreviation=unit.abbreviation,
+            unit_type=UnitType(unit.unit_type),
+            base_factor=unit.base_factor,
+            is_base_unit=unit.is_base_unit,
+            is_default=unit.is_default,
+            display_name=unit.name,
+        )
+
+    required_amounts = defaultdict(Decimal)
+
+    for item in ingredient_items.iterator(chunk_size=1000):
+        product = item.ingredient.product
+        key = (item.ingredient_group.recipe_id, product.id)
+        converted_quantity = convert_unit_quantity(
+            quantity=item.portion_quantity,
+            from_unit=get_unit_record(item.portion_quantity_unit),
+            to_unit=get_unit_record(product.unit),
+            piece_weight=product.unit_quantity,
+        )
+        required_amount = required_amounts[key]
+
+        if (
+            converted_quantity is None
+            or not product.unit_quantity
+            or required_amount is None
+        ):
+            required_amounts[key] = None
+            continue
+
+        required_amounts[key] = (
+            required_amount + converted_quantity / product.unit_quantity
+        )
+
+    RecipeProductRequirement.objects.all().delete()
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe_id=recipe_id,
+                product_id=product_id,
+                required_amount=required_amount,
+            )
+            for (recipe_id, product_id), required_amount in required_amounts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_oda_change_detection'),
+        ('recipes_ingredients', '0004_recipeingredient_is_base_ingredient'),
+        ('recipes_plans', '0003_recipeplan_num_portions_per_recipe'),
+        ('units', '0002_auto_20230413_1530'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            populate_recipe_product_requirements, migrations.RunPython.noop
+        ),
+    ]
@@ -18,6 +18,11 @@ class RecipePlan(BaseModel):
     description = models.TextField(max_length=100, blank=True, null=True)
     slug = models.SlugField(max_length=50)
     from_date = models.DateTimeField(blank=True, null=True)
+    num_portions_per_recipe = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text="Number of portions each recipe in the plan is made for.",
+    )
     home = models.ForeignKey(
         "homes.Home",
         blank=True,
@@ -57,3 +62,37 @@ class RecipePlanItem(BaseModel):
 
     class Meta:
         ordering = ("ordering",)
+
+
+class RecipeProductRequirement(BaseModel):
+    """
+    Precomputed amount of a product required by a recipe, used when generating
+    plans. Kept up to date when a recipe's ingredient items, or a product's unit
+    or unit quantity changes.
+    """
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="product_requirements",
+    )
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    # Amount of product units (e.g. number of packages) required to make the recipe
+    # for its default number of portions. Is null if the required amount is
+    # impossible to calculate, e.g. when the product is missing a unit quantity.
+    required_amount = models.DecimalField(
+        max_digits=12, decimal_places=6, blank=True, null=True
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["recipe", "product"],
+                name="unique_recipe_product_requirement",
+            ),
+        )
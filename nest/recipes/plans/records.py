@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -19,3 +20,18 @@ class RecipePlanRecord(BaseModel):
     slug: str
     from_date: datetime | None
     items: list[RecipePlanItemRecord]
+
+
+class RecipePlanShoppingListItemRecord(BaseModel):
+    product_id: int
+    product_name: str
+    required_amount: Decimal
+    num_packages: int
+    package_price: Decimal
+    total_price: Decimal
+
+
+class RecipePlanShoppingListRecord(BaseModel):
+    plan_id: int
+    items: list[RecipePlanShoppingListItemRecord]
+    total_price: Decimal
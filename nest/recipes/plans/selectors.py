@@ -1,38 +1,100 @@
+import math
 from datetime import timedelta
+from decimal import Decimal
 
+import polars as pl
+from django.core.cache import cache
 from django.utils import timezone
 
 from nest.core.types import FetchedResult
 from nest.recipes.core.enums import RecipeStatus
 from nest.recipes.core.models import Recipe
-from nest.recipes.core.records import RecipeDetailRecord
-from nest.recipes.core.selectors import get_recipe_data, get_recipes_by_id
-from nest.recipes.plans.models import RecipePlan, RecipePlanItem
-from nest.recipes.plans.records import RecipePlanItemRecord, RecipePlanRecord
+from nest.recipes.core.selectors import get_recipes_by_id
+from nest.recipes.plans.models import (
+    RecipePlan,
+    RecipePlanItem,
+    RecipeProductRequirement,
+)
+from nest.recipes.plans.records import (
+    RecipePlanItemRecord,
+    RecipePlanRecord,
+    RecipePlanShoppingListItemRecord,
+    RecipePlanShoppingListRecord,
+)
 
 # Have at least two weeks between recipes being used in plans.
 RECIPE_GRACE_PERIOD_WEEKS = 2.0
 
+RECIPE_PLAN_SHOPPING_LIST_CACHE_KEY = "recipe-plan-shopping-list:{plan_id}"
+
 
 def find_recipes_applicable_for_plan(
     *, grace_period_weeks: float | None = None
-) -> list[RecipeDetailRecord]:
+) -> pl.DataFrame:
     """
     Find applicable recipes for plans. An applicable recipe is a recipe that is not
-    used in another plan in the defined grace period and is published.
+    used in another plan in the defined grace period and is published. Only the data
+    needed to create plans are fetched, in a single query.
     """
     grace_period = grace_period_weeks or RECIPE_GRACE_PERIOD_WEEKS
     first_possible_from_date = timezone.now() - timedelta(weeks=float(grace_period))
 
-    recipes = get_recipe_data(
-        qs=Recipe.objects.exclude(
+    recipes = (
+        Recipe.objects.exclude(
             plan_items__recipe_plan__from_date__lt=first_possible_from_date,
-        ).filter(
+        )
+        .filter(
             status=RecipeStatus.PUBLISHED,
         )
+        .order_by("-created_at")
+        .values_list(
+            "id",
+            "default_num_portions",
+            "is_pescatarian",
+            "is_vegetarian",
+            "num_plan_usages",
+        )
+    )
+
+    return pl.DataFrame(
+        list(recipes),
+        schema={
+            "recipe_id": pl.Int64,
+            "default_num_portions": pl.Int64,
+            "is_pescatarian": pl.Boolean,
+            "is_vegetarian": pl.Boolean,
+            "num_plan_usages": pl.Int64,
+        },
+        orient="row",
+    )
+
+
+def get_product_requirements_for_recipes(*, recipe_ids: list[int]) -> pl.DataFrame:
+    """
+    Get the precomputed product requirements for recipes, with the amount of product
+    units required for the recipe's default number of portions.
+    """
+    requirements = RecipeProductRequirement.objects.filter(
+        recipe_id__in=recipe_ids
+    ).values_list(
+        "recipe_id",
+        "product_id",
+        "product__gross_unit_price",
+        "required_amount",
+        "product__ingredient__is_base_ingredient",
     )
 
-    return list(recipes.values())
+    return pl.DataFrame(
+        list(requirements),
+        schema={
+            "recipe_id": pl.Int64,
+            "product_id": pl.Int64,
+            "unit_price": pl.Decimal(scale=2),
+            "required_amount": pl.Decimal(scale=6),
+            "is_base_ingredient": pl.Boolean,
+        },
+        orient="row",
+    )
 
 
 def get_recipe_plan_items_for_plans(
@@ -94,3 +156,85 @@ def get_recipe_plans_for_home(*, home_id: int) -> list[RecipePlanRecord]:
         )
         for plan in plans
     ]
+
+
+def get_shopping_list_for_recipe_plan(*, plan_id: int) -> RecipePlanShoppingListRecord:
+    """
+    Get the products, and the number of packages of each product, needed to make all
+    recipes in a plan. Base ingredients are left out, as they're expected to already
+    be available. The shopping list is cached until plan items, product requirements
+    or product prices changes.
+    """
+    cache_key = RECIPE_PLAN_SHOPPING_LIST_CACHE_KEY.format(plan_id=plan_id)
+    shopping_list: RecipePlanShoppingListRecord | None = cache.get(cache_key)
+
+    if shopping_list is not None:
+        return shopping_list
+
+    # Requirements are fetched once per plan item, so that recipes used multiple
+    # times in the plan are accounted for.
+    requirements = RecipeProductRequirement.objects.filter(
+        recipe__plan_items__recipe_plan_id=plan_id,
+        product__ingredient__is_base_ingredient=False,
+    ).values_list(
+        "recipe__plan_items__recipe_plan__num_portions_per_recipe",
+        "recipe__default_num_portions",
+        "product_id",
+        "product__name",
+        "product__gross_price",
+        "required_amount",
+    )
+
+    products: dict[int, tuple[str, Decimal]] = {}
+    required_amounts: dict[int, Decimal] = {}
+
+    for (
+        num_portions_per_recipe,
+        default_num_portions,
+        product_id,
+        product_name,
+        gross_price,
+        required_amount,
+    ) in requirements:
+        if required_amount is None:
+            continue
+
+        recipe_portion_factor = (
+            Decimal(num_portions_per_recipe / default_num_portions).quantize(
+                Decimal("1.0")
+            )
+            if num_portions_per_recipe
+            else Decimal("1")
+        )
+
+        products[product_id] = (product_name, gross_price)
+        required_amounts[product_id] = (
+            required_amounts.get(product_id, Decimal("0"))
+            + required_amount * recipe_portion_factor
+        )
+
+    items: list[RecipePlanShoppingListItemRecord] = []
+
+    for product_id, required_amount in required_amounts.items():
+        product_name, gross_price = products[product_id]
+        num_packages = math.ceil(required_amount)
+
+        items.append(
+            RecipePlanShoppingListItemRecord(
+                product_id=product_id,
+                product_name=product_name,
+                required_amount=required_amount,
+                num_packages=num_packages,
+                package_price=gross_price,
+                total_price=gross_price * num_packages,
+            )
+        )
+
+    shopping_list = RecipePlanShoppingListRecord(
+        plan_id=plan_id,
+        items=sorted(items, key=lambda item: item.product_name),
+        total_price=sum((item.total_price for item in items), Decimal("0")),
+    )
+    cache.set(cache_key, shopping_list)
+
+    return shopping_list
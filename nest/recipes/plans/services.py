@@ -1,26 +1,48 @@
 import functools
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, timedelta
 from decimal import Decimal
 
+import polars as pl
+import structlog
+from django.core.cache import cache
 from django.db import transaction
 from django.utils.text import slugify
 
+from nest.core.exceptions import ApplicationError
 from nest.homes.records import HomeRecord
-from nest.recipes.core.records import RecipeDetailRecord
+from nest.recipes.core.cache import invalidate_recipe_details
+from nest.recipes.core.models import Recipe
+from nest.recipes.ingredients.models import RecipeIngredientItem
+from nest.recipes.plans import workers
 from nest.recipes.plans.algorithm import PlanDistributor
-from nest.recipes.plans.models import RecipePlan, RecipePlanItem
-from nest.recipes.plans.selectors import find_recipes_applicable_for_plan
+from nest.recipes.plans.enums import PlanSolver
+from nest.recipes.plans.models import (
+    RecipePlan,
+    RecipePlanItem,
+    RecipeProductRequirement,
+)
+from nest.recipes.plans.selectors import (
+    RECIPE_PLAN_SHOPPING_LIST_CACHE_KEY,
+    find_recipes_applicable_for_plan,
+    get_product_requirements_for_recipes,
+)
+from nest.units.records import UnitRecord
+from nest.units.utils import convert_unit_quantity
 
+logger = structlog.get_logger()
 
-def create_weekly_recipe_plan_for_home(
-    *,
-    home: HomeRecord,
-    from_date: date,
-    auto_generated: bool = False,
-) -> None:
-    num_items = 7
+WEEKLY_PLAN_NUM_ITEMS = 7
+
+
+def _get_weekly_recipe_plan_title_and_description(
+    *, from_date: date, auto_generated: bool
+) -> tuple[str, str]:
     week_number = from_date.isocalendar().week
-    to_date = from_date + timedelta(days=num_items)
+    to_date = from_date + timedelta(days=WEEKLY_PLAN_NUM_ITEMS)
     title = f"Weekly plan {week_number} ({from_date} - {to_date}"
     description = (
         f"Automatically generated recipe plan for week {week_number}"
@@ -28,12 +50,25 @@ def create_weekly_recipe_plan_for_home(
         else f"Weekly recipe plan for week {week_number}"
     )
 
+    return title, description
+
+
+def create_weekly_recipe_plan_for_home(
+    *,
+    home: HomeRecord,
+    from_date: date,
+    auto_generated: bool = False,
+) -> None:
+    title, description = _get_weekly_recipe_plan_title_and_description(
+        from_date=from_date, auto_generated=auto_generated
+    )
+
     create_recipe_plan(
         title=title,
         description=description,
         from_date=from_date,
         budget=home.weekly_budget,
-        num_items=num_items,
+        num_items=WEEKLY_PLAN_NUM_ITEMS,
         num_portions_per_recipe=home.num_residents,
         num_pescatarian=0,
         num_vegetarian=0,
@@ -42,8 +77,174 @@ def create_weekly_recipe_plan_for_home(
     )
 
 
+def create_weekly_recipe_plans_for_homes(
+    *,
+    homes: list[HomeRecord],
+    from_date: date,
+    auto_generated: bool = False,
+    max_workers: int | None = None,
+) -> list[int]:
+    """
+    Create weekly recipe plans for multiple homes at once. Applicable recipes and
+    product requirements are only loaded once and shared between homes, while plans
+    are solved in parallel in a process pool. Homes where no applicable plan could be
+    found are skipped, and so are homes whose worker process died, unless it happened
+    to every home. Returns ids of homes a plan was created for.
+    """
+    if not homes:
+        return []
+
+    applicable_recipes_by_grace_period = {
+        grace_period_weeks: find_recipes_applicable_for_plan(
+            grace_period_weeks=grace_period_weeks
+        )
+        for grace_period_weeks in {home.num_weeks_recipe_rotation for home in homes}
+    }
+    product_requirements_df = get_product_requirements_for_recipes(
+        recipe_ids=pl.concat(applicable_recipes_by_grace_period.values())["recipe_id"]
+        .unique()
+        .to_list()
+    )
+
+    plan_recipe_ids: dict[int, list[int]] = {}
+
+    # Solving plans is CPU bound, so it's not worth the overhead of starting new
+    # processes if there is only a single process or plan anyway.
+    if max_workers == 1 or len(homes) <= 1:
+        for home in homes:
+            try:
+                plan_recipe_ids[home.id] = _solve_weekly_recipe_plan(
+                    home=home,
+                    applicable_recipes_by_grace_period=applicable_recipes_by_grace_period,
+                    product_requirements_df=product_requirements_df,
+                )
+            except ApplicationError as exc:
+                logger.warning(
+                    "Unable to create weekly plan for home",
+                    home_id=home.id,
+                    error=exc.message,
+                )
+    else:
+        broken_pool_exc: BrokenProcessPool | None = None
+
+        # Worker processes are spawned rather than forked, as forking a process where
+        # Polars is already in use might deadlock.
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=workers.init_recipe_plan_worker,
+            initargs=(
+                workers.dump_shared_recipe_plan_data(
+                    applicable_recipes_by_grace_period=applicable_recipes_by_grace_period,
+                    product_requirements_df=product_requirements_df,
+                ),
+            ),
+        ) as executor:
+            futures: dict[int, Future[list[int]]] = {
+                home.id: executor.submit(workers.solve_weekly_recipe_plan, home=home)
+                for home in homes
+            }
+
+            for home_id, future in futures.items():
+                try:
+                    plan_recipe_ids[home_id] = future.result()
+                except ApplicationError as exc:
+                    logger.warning(
+                        "Unable to create weekly plan for home",
+                        home_id=home_id,
+                        error=exc.message,
+                    )
+                except BrokenProcessPool as exc:
+                    logger.error(
+                        "Worker process died while creating weekly plan for home",
+                        home_id=home_id,
+                        exc_info=exc,
+                    )
+                    broken_pool_exc = exc
+
+        if broken_pool_exc is not None and not plan_recipe_ids:
+            raise broken_pool_exc
+
+    title, description = _get_weekly_recipe_plan_title_and_description(
+        from_date=from_date, auto_generated=auto_generated
+    )
+
+    _create_recipe_plans_for_homes(
+        title=title,
+        description=description,
+        from_date=from_date,
+        homes=[home for home in homes if home.id in plan_recipe_ids],
+        plan_recipe_ids=plan_recipe_ids,
+    )
+
+    return list(plan_recipe_ids)
+
+
+def _solve_weekly_recipe_plan(
+    *,
+    home: HomeRecord,
+    applicable_recipes_by_grace_period: dict[int, pl.DataFrame],
+    product_requirements_df: pl.DataFrame,
+) -> list[int]:
+    plan_distributor = PlanDistributor(
+        budget=home.weekly_budget,
+        total_num_recipes=WEEKLY_PLAN_NUM_ITEMS,
+        num_portions_per_recipe=home.num_residents,
+        num_pescatarian=0,
+        num_vegetarian=0,
+        applicable_recipes=applicable_recipes_by_grace_period[
+            home.num_weeks_recipe_rotation
+        ],
+        product_requirements_df=product_requirements_df,
+    )
+
+    return plan_distributor.create_plan()
+
+
 @transaction.atomic
-def create_recipe_plan(
+def _create_recipe_plans_for_homes(
+    *,
+    title: str,
+    description: str,
+    from_date: date,
+    homes: list[HomeRecord],
+    plan_recipe_ids: dict[int, list[int]],
+) -> None:
+    recipe_plans = RecipePlan.objects.bulk_create(
+        [
+            RecipePlan(
+                title=title,
+                description=description,
+                slug=slugify(title),
+                from_date=from_date,
+                num_portions_per_recipe=home.num_residents,
+                home_id=home.id,
+            )
+            for home in homes
+        ]
+    )
+
+    RecipePlanItem.objects.bulk_create(
+        [
+            RecipePlanItem(
+                recipe_plan_id=recipe_plan.id,
+                recipe_id=recipe_id,
+                ordering=ordering,
+            )
+            for recipe_plan, home in zip(recipe_plans, homes, strict=True)
+            for ordering, recipe_id in enumerate(plan_recipe_ids[home.id], start=1)
+        ]
+    )
+
+    recipe_ids = {
+        recipe_id for recipe_ids in plan_recipe_ids.values() for recipe_id in recipe_ids
+    }
+    Recipe.objects.filter(id__in=recipe_ids).update_num_plan_usages()
+    invalidate_recipe_details(recipe_ids=list(recipe_ids))
+
+
+@transaction.atomic
+def create_recipe_plan(  # noqa: PLR0913
     *,
     title: str,
     description: str | None = None,
@@ -55,6 +256,7 @@ def create_recipe_plan(
     num_vegetarian: int,
     grace_period_weeks: int | None = None,
     home_id: int | None = None,
+    solver: PlanSolver = PlanSolver.GREEDY,
 ) -> None:
     plan_slug = slugify(title)
     recipe_plan = RecipePlan.objects.create(
@@ -62,6 +264,7 @@ def create_recipe_plan(
         description=description,
         slug=plan_slug,
         from_date=from_date,
+        num_portions_per_recipe=num_portions_per_recipe,
         home_id=home_id,
     )
 
@@ -75,32 +278,31 @@ def create_recipe_plan(
         num_pescatarian=num_pescatarian,
         num_vegetarian=num_vegetarian,
         applicable_recipes=applicable_recipes,
+        solver=solver,
     )
 
-    recipes_for_plan = plan_distributor.create_plan()
+    recipe_ids_for_plan = plan_distributor.create_plan()
 
     transaction.on_commit(
         functools.partial(
             _create_recipe_plan_items,
             plan_id=recipe_plan.id,
-            recipes=recipes_for_plan,
+            recipe_ids=recipe_ids_for_plan,
         )
     )
 
 
-def _create_recipe_plan_items(
-    *, plan_id: int, recipes: list[RecipeDetailRecord]
-) -> None:
+def _create_recipe_plan_items(*, plan_id: int, recipe_ids: list[int]) -> None:
     plan_items_to_create: list[RecipePlanItem] = []
     ordering = getattr(
         RecipePlanItem.objects.filter(recipe_plan_id=plan_id).last(), "ordering", 1
     )
 
-    for recipe in recipes:
+    for recipe_id in recipe_ids:
         plan_items_to_create.append(
             RecipePlanItem(
                 recipe_plan_id=plan_id,
-                recipe_id=recipe.id,
+                recipe_id=recipe_id,
                 ordering=ordering,
             )
         )
@@ -108,3 +310,119 @@ def _create_recipe_plan_items(
         ordering += 1
 
     RecipePlanItem.objects.bulk_create(plan_items_to_create)
+    Recipe.objects.filter(id__in=recipe_ids).update_num_plan_usages()
+    invalidate_recipe_details(recipe_ids=recipe_ids)
+    invalidate_recipe_plan_shopping_lists(plan_ids=[plan_id])
+
+
+@transaction.atomic
+def update_recipe_product_requirements(*, recipe_ids: list[int]) -> None:
+    """
+    Recalculate the amount of each product required by the given recipes, replacing
+    the existing requirements.
+    """
+    ingredient_items = RecipeIngredientItem.objects.filter(
+        ingredient_group__recipe_id__in=recipe_ids,
+        ingredient__product__isnull=False,
+    ).select_related(
+        "ingredient_group",
+        "ingredient__product__unit",
+        "portion_quantity_unit",
+    )
+
+    units: dict[int, UnitRecord] = {}
+    required_amounts: dict[tuple[int, int], Decimal | None] = defaultdict(Decimal)
+
+    for item in ingredient_items:
+        product = item.ingredient.product
+        assert product is not None
+
+        for unit in (product.unit, item.portion_quantity_unit):
+            if unit.id not in units:
+                units[unit.id] = UnitRecord.from_unit(unit)
+
+        key = (item.ingredient_group.recipe_id, product.id)
+        converted_quantity = convert_unit_quantity(
+            quantity=item.portion_quantity,
+            from_unit=units[item.portion_quantity_unit_id],
+            to_unit=units[product.unit_id],
+            piece_weight=product.unit_quantity,
+        )
+        required_amount = required_amounts[key]
+
+        if (
+            converted_quantity is None
+            or not product.unit_quantity
+            or required_amount is None
+        ):
+            required_amounts[key] = None
+            continue
+
+        required_amounts[key] = (
+            required_amount + converted_quantity / product.unit_quantity
+        )
+
+    RecipeProductRequirement.objects.filter(recipe_id__in=recipe_ids).delete()
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe_id=recipe_id,
+                product_id=product_id,
+                required_amount=required_amount,
+            )
+            for (recipe_id, product_id), required_amount in required_amounts.items()
+        ]
+    )
+
+    plan_ids = list(
+        RecipePlanItem.objects.filter(recipe_id__in=recipe_ids)
+        .values_list("recipe_plan_id", flat=True)
+        .distinct()
+    )
+    transaction.on_commit(
+        functools.partial(invalidate_recipe_plan_shopping_lists, plan_ids=plan_ids)
+    )
+
+
+def update_recipe_product_requirements_for_products(*, product_ids: list[int]) -> None:
+    """
+    Recalculate product requirements for all recipes using the given products.
+    """
+    recipe_ids = list(
+        RecipeIngredientItem.objects.filter(ingredient__product_id__in=product_ids)
+        .values_list("ingredient_group__recipe_id", flat=True)
+        .distinct()
+    )
+
+    if recipe_ids:
+        update_recipe_product_requirements(recipe_ids=recipe_ids)
+
+
+def invalidate_recipe_plan_shopping_lists(*, plan_ids: list[int]) -> None:
+    """
+    Remove cached shopping lists for the given plans.
+    """
+    cache.delete_many(
+        [
+            RECIPE_PLAN_SHOPPING_LIST_CACHE_KEY.format(plan_id=plan_id)
+            for plan_id in plan_ids
+        ]
+    )
+
+
+def invalidate_recipe_plan_shopping_lists_for_products(
+    *, product_ids: list[int]
+) -> None:
+    """
+    Remove cached shopping lists for all plans containing recipes using the given
+    products, e.g. when product prices changes.
+    """
+    plan_ids = list(
+        RecipePlanItem.objects.filter(
+            recipe__product_requirements__product_id__in=product_ids
+        )
+        .values_list("recipe_plan_id", flat=True)
+        .distinct()
+    )
+
+    invalidate_recipe_plan_shopping_lists(plan_ids=plan_ids)
@@ -0,0 +1,47 @@
+import pickle
+from typing import Any
+
+import django
+import polars as pl
+
+# Worker processes are spawned, so Django has to be set up before anything depending
+# on models can be imported. This module should therefore only import models lazily.
+
+# Recipes and product requirements shared by all plans solved in a worker process.
+# Set when the process starts, to avoid sending them along with every plan.
+_shared_recipe_plan_data: dict[str, Any] = {}
+
+
+def dump_shared_recipe_plan_data(
+    *,
+    applicable_recipes_by_grace_period: dict[int, pl.DataFrame],
+    product_requirements_df: pl.DataFrame,
+) -> bytes:
+    # Pickled dataframes loses their decimal columns, so the dataframe is sent as
+    # plain columns and re-created with the same schema in the worker.
+    return pickle.dumps(
+        {
+            "applicable_recipes_by_grace_period": applicable_recipes_by_grace_period,
+            "product_requirements": product_requirements_df.to_dict(as_series=False),
+            "product_requirements_schema": product_requirements_df.schema,
+        }
+    )
+
+
+def init_recipe_plan_worker(shared_recipe_plan_data: bytes) -> None:
+    django.setup()
+
+    data = pickle.loads(shared_recipe_plan_data)
+
+    _shared_recipe_plan_data["applicable_recipes_by_grace_period"] = data[
+        "applicable_recipes_by_grace_period"
+    ]
+    _shared_recipe_plan_data["product_requirements_df"] = pl.DataFrame(
+        data["product_requirements"], schema=data["product_requirements_schema"]
+    )
+
+
+def solve_weekly_recipe_plan(**kwargs: Any) -> list[int]:
+    from nest.recipes.plans.services import _solve_weekly_recipe_plan
+
+    return _solve_weekly_recipe_plan(**kwargs, **_shared_recipe_plan_data)
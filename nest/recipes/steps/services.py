@@ -10,6 +10,8 @@ from pydantic import BaseModel
 
 from nest.core.exceptions import ApplicationError
 
+from ..core.cache import invalidate_recipe_details
+from ..core.models import Recipe
 from ..ingredients.models import RecipeIngredientItem
 from ..ingredients.services import IngredientItem
 from .enums import RecipeStepType
@@ -78,6 +80,9 @@ def create_or_update_recipe_steps(recipe_id: int, steps: list[Step]) -> None:
             steps_to_update, fields=["number", "duration", "instruction", "step_type"]
         )
 
+    Recipe.objects.filter(id=recipe_id).update_duration()
+    invalidate_recipe_details(recipe_ids=[recipe_id])
+
     transaction.on_commit(
         functools.partial(
             create_or_update_recipe_step_ingredient_items,
@@ -183,3 +188,5 @@ def create_or_update_recipe_step_ingredient_items(
 
     if len(relations_to_create):
         RecipeStepIngredientItem.objects.bulk_create(relations_to_create)
+
+    invalidate_recipe_details(recipe_ids=[recipe_id])
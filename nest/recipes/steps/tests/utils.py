@@ -28,5 +28,6 @@ def create_recipe_step(
         instruction=instruction,
         step_type=step_type,
     )
+    Recipe.objects.filter(id=recipe.id).update_duration()
 
     return step
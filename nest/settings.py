@@ -238,6 +238,14 @@ QUERY_DURATION_WARNING_THRESHOLD = 300  # in ms
 if DEBUG:
     MIDDLEWARE += ["nest.core.middlewares.QueryCountWarningMiddleware"]
 
+##########
+# Caches #
+##########
+
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="locmemcache://"),
+}
+
 ###########
 # Logging #
 ###########
@@ -335,6 +343,11 @@ FORMS_AUTO_GENERATE = env.bool("FORMS_AUTO_GENERATE", default=DEBUG)
 ODA_SERVICE_ENABLED = env.bool("ODA_SERVICE_ENABLED", default=False)
 ODA_SERVICE_BASE_URL = env.str("ODA_SERVICE_BASE_URL", default="https://oda.com/api/v1")
 ODA_SERVICE_AUTH_TOKEN = env.str("ODA_SERVICE_AUTH_TOKEN", default="supersecrettoken")
+ODA_SERVICE_CACHE_ALIAS = env.str("ODA_SERVICE_CACHE_ALIAS", default="default")
+# Seconds product responses are served from cache without revalidation.
+ODA_SERVICE_CACHE_TTL = env.int("ODA_SERVICE_CACHE_TTL", default=5 * 60)
+# Seconds expired product responses are still served while being revalidated.
+ODA_SERVICE_CACHE_STALE_TTL = env.int("ODA_SERVICE_CACHE_STALE_TTL", default=60 * 60)
 
 ##########
 # Sentry #
@@ -17,10 +17,28 @@ def get_units() -> list[UnitRecord]:
     return [UnitRecord.from_unit(unit) for unit in units]
 
 
-def get_unit_by_abbreviation(abbreviation: str) -> UnitRecord:
+def get_units_by_abbreviation() -> dict[str, UnitRecord]:
     """
-    Get a unit based on its abbreviation.
+    Get all units, keyed by their abbreviation.
     """
+    units = Unit.objects.all()
+
+    return {unit.abbreviation: UnitRecord.from_unit(unit) for unit in units}
+
+
+def get_unit_by_abbreviation(
+    abbreviation: str, *, units: dict[str, UnitRecord] | None = None
+) -> UnitRecord:
+    """
+    Get a unit based on its abbreviation. If units are passed, the unit is looked up
+    among them instead of in the database.
+    """
+
+    if units is not None:
+        try:
+            return units[abbreviation]
+        except KeyError as exc:
+            raise ApplicationError(message="Unit does not exist.") from exc
 
     unit = Unit.objects.filter(abbreviation=abbreviation).first()
 
@@ -31,7 +49,10 @@ def get_unit_by_abbreviation(abbreviation: str) -> UnitRecord:
 
 
 def get_unit_normalized_quantity(
-    *, quantity: Decimal, unit: UnitRecord
+    *,
+    quantity: Decimal,
+    unit: UnitRecord,
+    units: dict[str, UnitRecord] | None = None,
 ) -> tuple[Decimal, UnitRecord]:
     """
     Get the normalized quantity based on a given unit. Depending on the quantity, we'll
@@ -40,24 +61,31 @@ def get_unit_normalized_quantity(
     This is we would like to display 400g instead of 0,4kg.
     """
     if quantity < Decimal("1.00"):
-        return get_unit_lowest_normalized_quantity(quantity=quantity, unit=unit)
+        return get_unit_lowest_normalized_quantity(
+            quantity=quantity, unit=unit, units=units
+        )
     else:
-        return get_unit_highest_normalized_quantity(quantity=quantity, unit=unit)
+        return get_unit_highest_normalized_quantity(
+            quantity=quantity, unit=unit, units=units
+        )
 
 
 def get_unit_lowest_normalized_quantity(
-    *, quantity: Decimal, unit: UnitRecord
+    *,
+    quantity: Decimal,
+    unit: UnitRecord,
+    units: dict[str, UnitRecord] | None = None,
 ) -> tuple[Decimal, UnitRecord]:
     """
     Try to normalize quantity by using the lowest unit in the same hierarchy as the
     given the unit.
     """
     if unit.unit_type == UnitType.WEIGHT:
-        to_unit = get_unit_by_abbreviation(abbreviation="g")
+        to_unit = get_unit_by_abbreviation(abbreviation="g", units=units)
     elif unit.unit_type == UnitType.VOLUME:
-        to_unit = get_unit_by_abbreviation(abbreviation="ml")
+        to_unit = get_unit_by_abbreviation(abbreviation="ml", units=units)
     elif unit.unit_type == UnitType.LENGTH:
-        to_unit = get_unit_by_abbreviation(abbreviation="cm")
+        to_unit = get_unit_by_abbreviation(abbreviation="cm", units=units)
     else:
         return quantity, unit
 
@@ -65,7 +93,10 @@ def get_unit_lowest_normalized_quantity(
 
 
 def get_unit_highest_normalized_quantity(
-    *, quantity: Decimal, unit: UnitRecord
+    *,
+    quantity: Decimal,
+    unit: UnitRecord,
+    units: dict[str, UnitRecord] | None = None,
 ) -> tuple[Decimal, UnitRecord]:
     """
     Try to normalize quantity by using the highest unit in the same hierarchy as the
@@ -73,11 +104,11 @@ def get_unit_highest_normalized_quantity(
     """
 
     if unit.unit_type == UnitType.WEIGHT:
-        to_unit = get_unit_by_abbreviation(abbreviation="kg")
+        to_unit = get_unit_by_abbreviation(abbreviation="kg", units=units)
     elif unit.unit_type == UnitType.VOLUME:
-        to_unit = get_unit_by_abbreviation(abbreviation="l")
+        to_unit = get_unit_by_abbreviation(abbreviation="l", units=units)
     elif unit.unit_type == UnitType.LENGTH:
-        to_unit = get_unit_by_abbreviation(abbreviation="m")
+        to_unit = get_unit_by_abbreviation(abbreviation="m", units=units)
     else:
         return quantity, unit
 
@@ -11,6 +11,7 @@ from ..selectors import (
     get_unit_normalized_price,
     get_unit_normalized_quantity,
     get_units,
+    get_units_by_abbreviation,
 )
 from .utils import create_units, get_unit
 
@@ -52,6 +53,33 @@ def test_get_unit_by_abbreviation(django_assert_num_queries):
         get_unit_by_abbreviation(abbreviation="doesnotexist")
 
 
+def test_get_units_by_abbreviation(django_assert_num_queries):
+    """
+    Test that the get_units_by_abbreviation selector returns all units keyed by their
+    abbreviation, and that units can be looked up among them without queries.
+    """
+    create_units()
+
+    with django_assert_num_queries(1):
+        units = get_units_by_abbreviation()
+
+    assert len(units) == 26
+    assert units["kg"].abbreviation == "kg"
+
+    with django_assert_num_queries(0):
+        kg = get_unit_by_abbreviation(abbreviation="kg", units=units)
+        normalized_quantity, normalized_unit = get_unit_normalized_quantity(
+            quantity=Decimal("0.4"), unit=kg, units=units
+        )
+
+    assert kg == units["kg"]
+    assert normalized_quantity == Decimal("400")
+    assert normalized_unit == units["g"]
+
+    with pytest.raises(ApplicationError):
+        get_unit_by_abbreviation(abbreviation="doesnotexist", units=units)
+
+
 @pytest.mark.parametrize(
     "from_abbr, to_abbr, mocks_called",
     (
@@ -86,7 +114,7 @@ def test_selector_get_unit_lowest_normalized_quantity(
     )
 
     if mocks_called:
-        get_unit_mock.assert_called_once_with(abbreviation=to_abbr)
+        get_unit_mock.assert_called_once_with(abbreviation=to_abbr, units=None)
         convert_mock.assert_called_once_with(
             quantity=quantity,
             from_unit=records[from_abbr],
@@ -124,7 +152,7 @@ def test_selector_get_unit_highest_normalized_quantity(
     get_unit_highest_normalized_quantity(quantity=quantity, unit=records[from_abbr])
 
     if mocks_called:
-        get_unit_mock.assert_called_once_with(abbreviation=to_abbr)
+        get_unit_mock.assert_called_once_with(abbreviation=to_abbr, units=None)
         convert_mock.assert_called_once_with(
             quantity=quantity,
             from_unit=records[from_abbr],
@@ -161,9 +189,9 @@ def test_selector_get_unit_normalized_quantity(quantity, expected_mock_call, moc
 
     if expected_mock_call == "highest":
         lowest_mock.assert_not_called()
-        highest_mock.assert_called_once_with(quantity=quantity, unit=unit)
+        highest_mock.assert_called_once_with(quantity=quantity, unit=unit, units=None)
     elif expected_mock_call == "lowest":
-        lowest_mock.assert_called_once_with(quantity=quantity, unit=unit)
+        lowest_mock.assert_called_once_with(quantity=quantity, unit=unit, units=None)
         highest_mock.assert_not_called()
 
 
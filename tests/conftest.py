@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 import structlog
 import requests_mock
+from django.core.cache import cache
 from django.db import transaction, models
 from typing import TypeVar, TypedDict, Callable  # noqa
 
@@ -175,6 +176,17 @@ def create_temp_storage(settings, tmp_path):
     yield
 
 
+#########
+# Cache #
+#########
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def immediate_on_commit():
     """
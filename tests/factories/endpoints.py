@@ -61,7 +61,7 @@ class EndpointFactory:
         logger.info(
             "Finished request",
             status_code=response.status_code,
-            content=response.content,
+            content=response.getvalue(),
         )
 
         assert response.status_code == request.expected_status_code
@@ -2,11 +2,15 @@ from polyfactory.factories.pydantic_factory import ModelFactory
 
 from nest.products.core.records import ProductRecord
 from nest.products.oda.records import OdaProductDetailRecord
-from nest.recipes.core.records import RecipeDetailRecord, RecipeRecord
+from nest.recipes.core.records import (
+    RecipeDetailRecord,
+    RecipeListPageRecord,
+    RecipeRecord,
+)
 from nest.recipes.ingredients.records import (
     RecipeIngredientRecord,
 )
-from nest.recipes.plans.records import RecipePlanRecord
+from nest.recipes.plans.records import RecipePlanRecord, RecipePlanShoppingListRecord
 from nest.users.core.records import UserRecord
 
 
@@ -22,6 +26,10 @@ class RecipeDetailRecordFactory(ModelFactory[RecipeDetailRecord]):
     __model__ = RecipeDetailRecord
 
 
+class RecipeListPageRecordFactory(ModelFactory[RecipeListPageRecord]):
+    __model__ = RecipeListPageRecord
+
+
 class RecipeIngredientRecordFactory(ModelFactory[RecipeIngredientRecord]):
     __model__ = RecipeIngredientRecord
 
@@ -30,6 +38,10 @@ class ReipcePlanRecordFactory(ModelFactory[RecipeRecord]):
     __model__ = RecipePlanRecord
 
 
+class RecipePlanShoppingListRecordFactory(ModelFactory[RecipePlanShoppingListRecord]):
+    __model__ = RecipePlanShoppingListRecord
+
+
 class ProductRecordFactory(ModelFactory[ProductRecord]):
     __model__ = ProductRecord
 
@@ -25,14 +25,14 @@ product_list_api_factory = EndpointFactory(
     endpoint=Endpoint(
         url=reverse("api-1.0.0:product_list_api"),
         view_func=product_list_api,
-        mocks=[FactoryMock("get_products", [ProductRecordFactory.build()])],
+        mocks=[FactoryMock("iter_products", [ProductRecordFactory.build()])],
     ),
     requests={
         "authenticated_request": Request(
             help="Test that normal users are able to retrieve a list of products.",
             client=authenticated_client,
             expected_status_code=status.HTTP_200_OK,
-            expected_mock_calls={"get_products": 1},
+            expected_mock_calls={"iter_products": 1},
         ),
     },
 )
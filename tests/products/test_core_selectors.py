@@ -1,10 +1,19 @@
+from decimal import Decimal
 from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
+from nest.audit_logs.tests.utils import create_log_entry
+from nest.products.core.enums import ProductProjection
 from nest.products.core.models import Product
-from nest.products.core.selectors import get_oda_product, get_product, get_products
+from nest.products.core.selectors import (
+    get_oda_product,
+    get_product,
+    get_products,
+    iter_products,
+)
+from nest.products.oda.constants import PRODUCT_NUTRITION_IDENTIFIERS
 
 
 @pytest.mark.products(
@@ -75,7 +84,9 @@ def test_selector_get_product(
     with django_assert_num_queries(0):
         get_product(pk=product.pk)
 
-    get_products_mock.assert_called_once_with(product_ids=[product.id])
+    get_products_mock.assert_called_once_with(
+        product_ids=[product.id], projection=ProductProjection.WITH_AUDIT
+    )
 
 
 # @pytest.mark.oda_product
@@ -89,4 +100,52 @@ def test_selector_get_oda_product(
     with django_assert_num_queries(0):
         get_oda_product(oda_id=oda_product.oda_id)
 
-    get_products_mock.assert_called_once_with(oda_ids=[oda_product.oda_id])
+    get_products_mock.assert_called_once_with(
+        oda_ids=[oda_product.oda_id], projection=ProductProjection.WITH_AUDIT
+    )
+
+
+@pytest.mark.products(
+    product1={"name": "Product 1"},
+    product2={"name": "Product 2"},
+    product3={"name": "Product 3"},
+)
+def test_selector_iter_products(
+    products: dict[str, Product], django_assert_num_queries: Any
+) -> None:
+    expected_products = get_products()
+
+    # Products are fetched through a single cursor, with audit logs fetched per chunk.
+    with django_assert_num_queries(3):
+        all_products = list(iter_products(chunk_size=2))
+
+    assert all_products == expected_products
+
+
+@pytest.mark.product(energy_kj="1000", energy_kcal="240", protein="12")
+def test_selector_get_products_projections(
+    product: Product, django_assert_num_queries: Any
+) -> None:
+    create_log_entry(instance=product, changes={"name": ("Old name", "New name")})
+
+    with django_assert_num_queries(1):
+        [summary] = get_products(projection=ProductProjection.SUMMARY)
+
+    with django_assert_num_queries(1):
+        [detail] = get_products(projection=ProductProjection.DETAIL)
+
+    [with_audit] = get_products(projection=ProductProjection.WITH_AUDIT)
+
+    nutrition_fields = {*PRODUCT_NUTRITION_IDENTIFIERS, "nutrition_table"}
+
+    assert summary.nutrition_table == []
+    assert summary.energy_kj is None
+    assert summary.protein is None
+    assert summary.audit_logs == []
+    assert detail.nutrition_table == with_audit.nutrition_table != []
+    assert detail.energy_kj == with_audit.energy_kj == Decimal("1000")
+    assert detail.audit_logs == []
+    assert len(with_audit.audit_logs) == 1
+    assert summary.dict(exclude={*nutrition_fields, "audit_logs"}) == (
+        with_audit.dict(exclude={*nutrition_fields, "audit_logs"})
+    )
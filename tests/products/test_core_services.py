@@ -4,12 +4,16 @@ from typing import Any, Callable
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from nest.audit_logs.models import LogEntry
 from nest.products.core.models import Product
 from nest.products.core.services import (
+    bulk_update_or_create_products,
     create_product,
     edit_product,
+    store_product_thumbnail,
     update_or_create_product,
 )
+from nest.products.core.tests.utils import create_product_image
 from nest.units.models import Unit
 
 from .utils import next_oda_id
@@ -130,7 +134,7 @@ def test_service_update_or_create_product_with_pk(
     }
 
     # Test that updating existing product works as expected.
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(5):
         updated_product = update_or_create_product(pk=existing_product.id, **defaults)
 
     # No new objects should have been created this time.
@@ -184,7 +188,7 @@ def test_service_test_update_or_create_product_with_oda_id(
 
     assert existing_product.oda_id is not None
 
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(5):
         updated_product = update_or_create_product(
             oda_id=existing_product.oda_id, **defaults
         )
@@ -195,3 +199,136 @@ def test_service_test_update_or_create_product_with_oda_id(
     assert updated_product.id == existing_product.id
     assert updated_product.name == "Updated test product"
     assert updated_product.oda_id == existing_product.oda_id
+
+
+@pytest.mark.oda_product(name="Test product")
+def test_service_bulk_update_or_create_products(
+    oda_product: Product,
+    get_unit: Callable[[str], Unit],
+    django_assert_max_num_queries: Any,
+) -> None:
+    """
+    Test that bulk_update_or_create_products updates existing products and creates
+    new ones, matched on oda id, with a constant number of queries.
+    """
+    unit = get_unit("g")
+    initial_count = Product.objects.all().count()
+    first_oda_id = next_oda_id()
+
+    def defaults(oda_id: int) -> dict[str, Any]:
+        return {
+            "oda_id": oda_id,
+            "name": f"Bulk product {oda_id}",
+            "gross_price": "50.00",
+            "unit_id": unit.id,
+            "unit_quantity": Decimal("1.00"),
+            "supplier": "Test supplier",
+        }
+
+    products = [defaults(first_oda_id + index) for index in range(10)]
+    products.append(
+        {
+            "oda_id": oda_product.oda_id,
+            "name": "Updated test product",
+            "gross_price": oda_product.gross_price,
+            "unit_id": oda_product.unit_id,
+            "unit_quantity": oda_product.unit_quantity,
+        }
+    )
+
+    with django_assert_max_num_queries(8):
+        product_records = bulk_update_or_create_products(
+            products=products, source="Test"
+        )
+
+    assert len(product_records) == 11
+    assert Product.objects.all().count() == initial_count + 10
+
+    updated_record = product_records[-1]
+    assert updated_record.id == oda_product.id
+    assert updated_record.name == "Updated test product"
+    assert product_records[0].gross_price == Decimal("50.00")
+
+    oda_product.refresh_from_db()
+    assert oda_product.name == "Updated test product"
+
+    # Only the name of the existing product changed.
+    update_entry = LogEntry.objects.get(
+        object_id=oda_product.id, action=LogEntry.ACTION_UPDATE
+    )
+    assert update_entry.changes == {"name": ["Test product", "Updated test product"]}
+    assert (
+        LogEntry.objects.filter(action=LogEntry.ACTION_CREATE, source="Test").count()
+        == 10
+    )
+
+
+def test_service_bulk_update_or_create_products_thumbnails(
+    get_unit: Callable[[str], Unit],
+    django_capture_on_commit_callbacks: Any,
+    mocker: Any,
+) -> None:
+    """
+    Test that bulk_update_or_create_products deletes replaced thumbnails, unless other
+    products still use them.
+    """
+    mocker.patch("nest.core.utils.s3.s3_asset_delete")
+    storage = Product._meta.get_field("thumbnail").storage
+    unit = get_unit("kg")
+
+    shared_thumbnail, replaced_thumbnail, new_thumbnail = [
+        store_product_thumbnail(
+            image=create_product_image(name=name, width=width, height=width)
+        )
+        for name, width in [("shared", 100), ("replaced", 200), ("new", 300)]
+    ]
+    products = [
+        Product.objects.create(
+            name=f"Product {index}",
+            gross_price="10.00",
+            unit=unit,
+            oda_id=next_oda_id(),
+            thumbnail=thumbnail,
+        )
+        for index, thumbnail in enumerate(
+            [shared_thumbnail, shared_thumbnail, replaced_thumbnail]
+        )
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_update_or_create_products(
+            products=[
+                {"oda_id": product.oda_id, "thumbnail": new_thumbnail}
+                for product in [products[0], products[2]]
+            ]
+        )
+
+    assert storage.exists(shared_thumbnail)
+    assert not storage.exists(replaced_thumbnail)
+    assert storage.exists(new_thumbnail)
+
+
+def test_service_store_product_thumbnail():
+    """
+    Test that store_product_thumbnail stores a WebP thumbnail named by the content of
+    the image, and that identical images are only stored once.
+    """
+    storage = Product._meta.get_field("thumbnail").storage
+
+    name = store_product_thumbnail(
+        image=create_product_image(name="first", width=800, height=800)
+    )
+
+    assert name.startswith("products/thumbnails/")
+    assert name.endswith(".webp")
+    assert storage.exists(name)
+
+    duplicate_name = store_product_thumbnail(
+        image=create_product_image(name="second", width=800, height=800)
+    )
+    other_name = store_product_thumbnail(
+        image=create_product_image(name="third", width=600, height=800)
+    )
+
+    assert duplicate_name == name
+    assert other_name != name
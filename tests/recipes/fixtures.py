@@ -124,6 +124,7 @@ def create_recipe_step_from_spec(
         step, _created = RecipeStep.objects.get_or_create(
             recipe=recipe_from_spec, **spec
         )
+        Recipe.objects.filter(id=recipe_from_spec.id).update_duration()
         return step
 
     return _create_recipe_step
@@ -461,6 +462,7 @@ class RecipePlanSpec(TypedDict, total=False):
     slug: str
     home: str
     from_date: datetime
+    num_portions_per_recipe: int | None
 
 
 CreateRecipePlan = Callable[[RecipePlanSpec], RecipePlan]
@@ -556,6 +558,7 @@ def create_recipe_plan_item_from_spec(
         recipe_plan_item, _created = RecipePlanItem.objects.get_or_create(
             recipe=recipe_from_spec, recipe_plan=recipe_plan_from_spec, **spec
         )
+        Recipe.objects.filter(id=recipe_from_spec.id).update_num_plan_usages()
 
         return recipe_plan_item
 
@@ -4,15 +4,21 @@ import pytest
 from django.urls import reverse
 from store_kit.http import status
 
+from nest.recipes.core.cache import invalidate_recipe_details
 from nest.recipes.core.endpoints import (
     recipe_create_api,
     recipe_detail_api,
     recipe_list_api,
+    recipe_search_api,
 )
 from nest.recipes.core.enums import RecipeDifficulty, RecipeStatus
+from nest.recipes.core.models import Recipe
 
 from ..factories.endpoints import Endpoint, EndpointFactory, FactoryMock, Request
-from ..factories.records import RecipeDetailRecordFactory
+from ..factories.records import (
+    RecipeDetailRecordFactory,
+    RecipeListPageRecordFactory,
+)
 from ..helpers.clients import (
     anonymous_client,
     authenticated_client,
@@ -119,14 +125,14 @@ recipe_list_api_factory = EndpointFactory(
     endpoint=Endpoint(
         url=reverse("api-1.0.0:recipe_list_api"),
         view_func=recipe_list_api,
-        mocks=[FactoryMock("get_recipes", [RecipeDetailRecordFactory.build()])],
+        mocks=[FactoryMock("get_recipe_list", RecipeListPageRecordFactory.build())],
     ),
     requests={
         "authenticated_request": Request(
             help="Test that normal users are able to get a list of recipes",
             client=authenticated_client,
             expected_status_code=status.HTTP_200_OK,
-            expected_mock_calls={"get_recipes": 1},
+            expected_mock_calls={"get_recipe_list": 1},
         ),
     },
 )
@@ -147,10 +153,27 @@ recipe_detail_api_factory = EndpointFactory(
     },
 )
 
+recipe_search_api_factory = EndpointFactory(
+    endpoint=Endpoint(
+        url=f"{reverse('api-1.0.0:recipe_search_api')}?q=kylling",
+        view_func=recipe_search_api,
+        mocks=[FactoryMock("search_recipes", RecipeListPageRecordFactory.build())],
+    ),
+    requests={
+        "authenticated_request": Request(
+            help="Test that normal users are able to search recipes",
+            client=authenticated_client,
+            expected_status_code=status.HTTP_200_OK,
+            expected_mock_calls={"search_recipes": 1},
+        ),
+    },
+)
+
 request_factories = [
     recipe_create_api_factory,
     recipe_list_api_factory,
     recipe_detail_api_factory,
+    recipe_search_api_factory,
 ]
 
 
@@ -158,3 +181,46 @@ request_factories = [
 @pytest.mark.django_db
 def test_recipes_core_endpoints(factory: EndpointFactory, mocker: MagicMock) -> None:
     factory.make_requests_and_assert(mocker)
+
+
+@pytest.mark.recipe(title="Recipe 1")
+@pytest.mark.django_db
+def test_recipe_detail_api_cached(
+    django_assert_num_queries, django_capture_on_commit_callbacks, recipe
+) -> None:
+    """
+    Test that recipe details are served from the response cache, with 304 responses
+    to matching ETags, until the recipe is invalidated.
+    """
+    client = anonymous_client()
+    url = reverse("api-1.0.0:recipe_detail_api", args=[recipe.id])
+
+    response = client.get(url)
+    etag = response["ETag"]
+
+    assert response.json()["data"]["title"] == "Recipe 1"
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # The ETag is derived from the content, so an unchanged recipe is still not
+    # modified after being invalidated.
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_recipe_details(recipe_ids=[recipe.id])
+
+    assert (
+        client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+        == status.HTTP_304_NOT_MODIFIED
+    )
+
+    Recipe.objects.filter(id=recipe.id).update(title="Renamed")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_recipe_details(recipe_ids=[recipe.id])
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["title"] == "Renamed"
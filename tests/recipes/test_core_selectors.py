@@ -1,8 +1,16 @@
 import pytest
 
 from nest.core.exceptions import ApplicationError
+from nest.products.core.services import edit_product
+from nest.products.core.tests.utils import create_product
+from nest.recipes.core.cache import invalidate_recipe_details
 from nest.recipes.core.models import Recipe
 from nest.recipes.core.selectors import get_recipe, get_recipe_data
+from nest.recipes.ingredients.tests.utils import (
+    create_recipe_ingredient,
+    create_recipe_ingredient_item,
+    create_recipe_ingredient_item_group,
+)
 from tests.helpers.types import AnyOrder
 
 
@@ -13,7 +21,7 @@ def test_selector_get_recipe(mocker, recipes, return_value):
     returns = recipe if return_value is not None else None
 
     get_recipes_mock = mocker.patch(
-        "nest.recipes.core.selectors.get_recipes_by_id",
+        "nest.recipes.core.selectors.get_recipe_details_by_id",
         return_value={recipe.id: returns},
     )
 
@@ -26,6 +34,51 @@ def test_selector_get_recipe(mocker, recipes, return_value):
     get_recipes_mock.assert_called_once_with(recipe_ids=[recipe.id])
 
 
+@pytest.mark.recipes(recipe1={"title": "Recipe 1"}, recipe2={"title": "Recipe 2"})
+def test_selector_get_recipe_cached(
+    django_assert_num_queries, django_capture_on_commit_callbacks, recipes
+):
+    """
+    Test that get_recipe serves repeated reads from the cache, until the recipe or
+    one of its products is invalidated.
+    """
+    recipe = recipes["recipe1"]
+    other_recipe = recipes["recipe2"]
+    product = create_product(name="Tomatoes")
+    create_recipe_ingredient_item(
+        ingredient_group=create_recipe_ingredient_item_group(recipe=recipe),
+        ingredient=create_recipe_ingredient(product=product),
+    )
+
+    get_recipe(pk=recipe.id)
+    get_recipe(pk=other_recipe.id)
+
+    with django_assert_num_queries(0):
+        assert get_recipe(pk=recipe.id).title == "Recipe 1"
+
+    Recipe.objects.filter(id=recipe.id).update(title="Renamed")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_recipe_details(recipe_ids=[recipe.id])
+
+    with django_assert_num_queries(1):
+        assert get_recipe(pk=recipe.id).title == "Renamed"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        edit_product(product_id=product.id, name="Cherry tomatoes")
+
+    product_names = [
+        item.ingredient.product.name
+        for group in get_recipe(pk=recipe.id).ingredient_item_groups
+        for item in group.ingredient_items
+    ]
+
+    assert product_names == ["Cherry tomatoes"]
+
+    with django_assert_num_queries(0):
+        get_recipe(pk=other_recipe.id)
+
+
 @pytest.mark.recipes(
     recipe1={"title": "Recipe 1"},
     recipe2={"title": "Recipe 2"},
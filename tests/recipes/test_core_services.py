@@ -2,7 +2,18 @@ import pytest
 
 from nest.recipes.core.enums import RecipeDifficulty, RecipeStatus
 from nest.recipes.core.models import Recipe
-from nest.recipes.core.services import _create_base_recipe
+from nest.recipes.core.services import (
+    _create_base_recipe,
+    create_or_update_recipe_attributes,
+    update_recipe_search_vectors,
+)
+from nest.recipes.core.tests.utils import create_recipe
+from nest.recipes.ingredients.models import RecipeIngredient
+from nest.recipes.ingredients.tests.utils import (
+    create_recipe_ingredient_item,
+    create_recipe_ingredient_item_group,
+)
+from nest.recipes.steps.tests.utils import create_recipe_step
 
 
 @pytest.mark.django_db
@@ -34,3 +45,39 @@ def test_service_create_recipe(django_assert_num_queries):
     assert recipe.is_vegetarian is True
     assert recipe.external_id is None
     assert recipe.external_url is None
+
+
+@pytest.mark.django_db
+def test_service_update_recipe_search_vectors(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    """
+    Test that the update_recipe_search_vectors service weights title, search keywords,
+    ingredients and steps, and that it runs when recipe attributes are updated.
+    """
+
+    recipe = create_recipe(title="Suppe", search_keywords="middag")
+    other_recipe = create_recipe(title="Pasta")
+    create_recipe_ingredient_item(
+        ingredient_group=create_recipe_ingredient_item_group(recipe=recipe),
+        ingredient=RecipeIngredient.objects.create(title="Laks"),
+    )
+    create_recipe_step(recipe=recipe, instruction="Kok opp")
+
+    with django_assert_num_queries(1):
+        update_recipe_search_vectors(recipe_ids=[recipe.id])
+
+    recipe.refresh_from_db()
+    other_recipe.refresh_from_db()
+
+    assert recipe.search_vector == "'kok':4 'laks':3C 'middag':2B 'supp':1A"
+    assert other_recipe.search_vector is None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        create_or_update_recipe_attributes(
+            recipe_id=other_recipe.id, ingredient_item_groups=[], steps=[]
+        )
+
+    other_recipe.refresh_from_db()
+
+    assert other_recipe.search_vector == "'past':1A"
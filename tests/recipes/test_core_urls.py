@@ -5,6 +5,7 @@ urls = [
     ("recipe_create_api", "/api/v1/recipes/create/", None),
     ("recipe_detail_api", "/api/v1/recipes/recipe/recipe_id/", ["recipe_id"]),
     ("recipe_list_api", "/api/v1/recipes/", None),
+    ("recipe_search_api", "/api/v1/recipes/search/", None),
 ]
 
 
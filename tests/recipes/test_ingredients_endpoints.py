@@ -44,7 +44,7 @@ recipe_ingredient_list_api_factory = EndpointFactory(
         view_func=recipe_ingredient_list_api,
         mocks=[
             FactoryMock(
-                "get_recipe_ingredients", [RecipeIngredientRecordFactory.build()]
+                "iter_recipe_ingredients", [RecipeIngredientRecordFactory.build()]
             )
         ],
     ),
@@ -53,7 +53,7 @@ recipe_ingredient_list_api_factory = EndpointFactory(
             help="Test that normal users are able to retrieve a list of ingredients",
             client=authenticated_staff_client,
             expected_status_code=status.HTTP_200_OK,
-            expected_mock_calls={"get_recipe_ingredients": 1},
+            expected_mock_calls={"iter_recipe_ingredients": 1},
         ),
     },
 )
@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from nest.audit_logs.models import LogEntry
 from nest.core.exceptions import ApplicationError
 from nest.products.core.models import Product
+from nest.recipes.core.tests.utils import create_recipe
 from nest.recipes.ingredients.models import (
     RecipeIngredient,
     RecipeIngredientItemGroup,
@@ -21,6 +22,10 @@ from nest.recipes.ingredients.services import (
     create_recipe_ingredient,
     delete_recipe_ingredient,
 )
+from nest.recipes.ingredients.tests.utils import (
+    create_recipe_ingredient_item,
+    create_recipe_ingredient_item_group,
+)
 
 
 @pytest.mark.product
@@ -66,13 +71,37 @@ def test_service_delete_recipe_ingredient(
 
     assert RecipeIngredient.objects.filter(id=recipe_ingredient.id).first() is not None
 
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(5):
         delete_recipe_ingredient(pk=recipe_ingredient.id)
 
     assert RecipeIngredient.objects.filter(id=recipe_ingredient.id).first() is None
     assert LogEntry.objects.count() == initial_log_count + 1
 
 
+@pytest.mark.django_db
+def test_service_delete_recipe_ingredient_search_vectors(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    """
+    Test that delete_ingredient rebuilds the search vector of recipes that used the
+    deleted ingredient.
+    """
+
+    recipe = create_recipe(title="Suppe")
+    ingredient = RecipeIngredient.objects.create(title="Laks")
+    create_recipe_ingredient_item(
+        ingredient_group=create_recipe_ingredient_item_group(recipe=recipe),
+        ingredient=ingredient,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        delete_recipe_ingredient(pk=ingredient.id)
+
+    recipe.refresh_from_db()
+
+    assert recipe.search_vector == "'supp':1A"
+
+
 @pytest.mark.recipe_ingredient_item_groups(
     group1={"title": "group1", "ordering": 1},
     group2={"title": "group2", "ordering": 2},
@@ -219,7 +248,7 @@ def test_service_create_or_update_recipe_ingredient_items(
         ),
     ]
 
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(10):
         create_or_update_recipe_ingredient_items(recipe_id=recipe.id, groups=groups)
 
     item1.refresh_from_db()
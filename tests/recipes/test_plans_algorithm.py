@@ -0,0 +1,322 @@
+import itertools
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from nest.core.exceptions import ApplicationError
+from nest.recipes.plans.algorithm import PlanDistributor
+from nest.recipes.plans.enums import PlanSolver
+
+
+def _recipes_dataframe(
+    rows: list[tuple[int, bool, bool, int]], default_num_portions: int = 4
+) -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            (
+                recipe_id,
+                default_num_portions,
+                is_pescatarian,
+                is_vegetarian,
+                num_plan_usages,
+            )
+            for recipe_id, is_pescatarian, is_vegetarian, num_plan_usages in rows
+        ],
+        schema={
+            "recipe_id": pl.Int64,
+            "default_num_portions": pl.Int64,
+            "is_pescatarian": pl.Boolean,
+            "is_vegetarian": pl.Boolean,
+            "num_plan_usages": pl.Int64,
+        },
+        orient="row",
+    )
+
+
+def _products_dataframe(rows: list[tuple[int, int, bool]]) -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            {
+                "recipe_id": recipe_id,
+                "product_id": product_id,
+                "unit_price": Decimal("10.00"),
+                "required_amount": Decimal("0.5"),
+                "is_base_ingredient": is_base_ingredient,
+            }
+            for recipe_id, product_id, is_base_ingredient in rows
+        ]
+    )
+
+
+class TestPlanDistributor:
+    def test__get_products_dataframe(self, mocker):
+        """
+        Test that required amounts are adjusted to the number of portions wanted, and
+        that an error is raised if any required amount is missing.
+        """
+        recipes = pl.concat(
+            [
+                _recipes_dataframe([(1, False, False, 0)], default_num_portions=2),
+                _recipes_dataframe([(2, False, False, 0)], default_num_portions=4),
+            ]
+        )
+        requirements_df = pl.DataFrame(
+            [
+                (1, 10, Decimal("10.00"), Decimal("0.25"), False),
+                (2, 10, Decimal("10.00"), Decimal("0.5"), False),
+            ],
+            schema={
+                "recipe_id": pl.Int64,
+                "product_id": pl.Int64,
+                "unit_price": pl.Decimal(scale=2),
+                "required_amount": pl.Decimal(scale=6),
+                "is_base_ingredient": pl.Boolean,
+            },
+            orient="row",
+        )
+        selector_mock = mocker.patch(
+            "nest.recipes.plans.algorithm.get_product_requirements_for_recipes",
+            return_value=requirements_df,
+        )
+
+        distributor = PlanDistributor(
+            budget=Decimal("1000.00"),
+            total_num_recipes=2,
+            num_portions_per_recipe=4,
+            num_pescatarian=0,
+            num_vegetarian=0,
+            applicable_recipes=recipes,
+        )
+
+        selector_mock.assert_called_once_with(recipe_ids=[1, 2])
+        assert distributor.products_df.select(
+            "recipe_id", "required_amount"
+        ).rows() == [(1, Decimal("0.5")), (2, Decimal("0.5"))]
+
+        selector_mock.return_value = requirements_df.with_columns(
+            required_amount=pl.lit(None, dtype=pl.Decimal(scale=6))
+        )
+
+        with pytest.raises(ApplicationError):
+            PlanDistributor(
+                budget=Decimal("1000.00"),
+                total_num_recipes=2,
+                num_portions_per_recipe=4,
+                num_pescatarian=0,
+                num_vegetarian=0,
+                applicable_recipes=recipes,
+            )
+
+    def test__calculate_score_for_recipes(self, mocker):
+        """
+        Test that recipes are scored based on products shared with other recipes,
+        pescatarian/vegetarian quotas and plan usages.
+        """
+        recipes = _recipes_dataframe(
+            [
+                (1, True, False, 0),
+                (2, True, False, 1),
+                (3, True, True, 0),
+                (4, False, False, 2),
+            ]
+        )
+
+        mocker.patch.object(
+            PlanDistributor,
+            "_get_products_dataframe",
+            return_value=_products_dataframe(
+                [
+                    # Product 10 is shared between recipe 1, 2 and 3.
+                    (1, 10, False),
+                    (2, 10, False),
+                    (3, 10, False),
+                    # Product 11 is shared between recipe 1 and 4.
+                    (1, 11, False),
+                    (4, 11, False),
+                    # Product 12 is a base ingredient, and should not be counted.
+                    (1, 12, True),
+                    (2, 12, True),
+                    # Product 13 is only used in recipe 4.
+                    (4, 13, False),
+                ]
+            ),
+        )
+
+        distributor = PlanDistributor(
+            budget=Decimal("1000.00"),
+            total_num_recipes=2,
+            num_portions_per_recipe=4,
+            num_pescatarian=1,
+            num_vegetarian=1,
+            applicable_recipes=recipes,
+        )
+
+        scores = {
+            row["recipe_id"]: row["score"]
+            for row in distributor._calculate_score_for_recipes().to_dicts()
+        }
+
+        assert scores == {
+            # 3 shared product rows and pescatarian bonus.
+            1: 3 * 10 + 5,
+            # 2 shared product rows, pescatarian bonus and one usage.
+            2: 2 * 10 + 5 - 3,
+            # 2 shared product rows and vegetarian bonus. Two pescatarian recipes
+            # precedes it, so the quota has been used.
+            3: 2 * 10 + 1,
+            # 1 shared product row and two usages.
+            4: 1 * 10 - 2 * 3,
+        }
+
+    def _get_distributor(
+        self,
+        mocker,
+        budget: Decimal,
+        solver: PlanSolver = PlanSolver.GREEDY,
+        time_limit_seconds: float = 5.0,
+    ) -> PlanDistributor:
+        recipes = _recipes_dataframe(
+            [(recipe_id, False, False, 0) for recipe_id in [1, 2, 3]]
+        )
+
+        mocker.patch.object(
+            PlanDistributor,
+            "_get_products_dataframe",
+            return_value=_products_dataframe(
+                [
+                    (1, 10, False),
+                    (1, 11, False),
+                    (2, 10, False),
+                    (2, 12, False),
+                    (2, 13, False),
+                    (3, 10, False),
+                ]
+            ),
+        )
+
+        return PlanDistributor(
+            budget=budget,
+            total_num_recipes=2,
+            num_portions_per_recipe=4,
+            num_pescatarian=0,
+            num_vegetarian=0,
+            applicable_recipes=recipes,
+            solver=solver,
+            time_limit_seconds=time_limit_seconds,
+        )
+
+    def test_create_plan_within_budget(self, mocker):
+        """
+        Test that the recipes with the highest score is returned when the plan is
+        within budget.
+        """
+        distributor = self._get_distributor(mocker, budget=Decimal("40.00"))
+
+        plan = distributor.create_plan()
+
+        assert plan == [1, 2]
+        # Product 10 is shared and needs 1 unit, the rest needs 1 unit each.
+        assert distributor.plan_price == Decimal("40.00")
+        assert distributor.num_iterations == 1
+
+    def test_create_plan_over_budget(self, mocker):
+        """
+        Test that the recipe with the least products is swapped out with the next best
+        recipe when the plan is over budget, and that the plan price is adjusted.
+        """
+        distributor = self._get_distributor(mocker, budget=Decimal("30.00"))
+
+        plan = distributor.create_plan()
+
+        assert plan == [2, 3]
+        assert distributor.plan_price == Decimal("30.00")
+        assert distributor.num_iterations == 2
+
+    def test__get_least_occured_plan_recipe_id(self, mocker):
+        """
+        Test that the recipe with the least products is picked, and that ties are
+        broken on the lowest score, and then on the recipe added to the plan last.
+        """
+        distributor = self._get_distributor(mocker, budget=Decimal("40.00"))
+        distributor.plan_recipe_ids = [1, 2, 3]
+        distributor._recipe_num_products = {1: 2, 2: 2, 3: 3}
+
+        distributor._recipe_scores = {1: 5, 2: 10, 3: 0}
+        assert distributor._get_least_occured_plan_recipe_id() == 1
+
+        distributor._recipe_scores = {1: 10, 2: 10, 3: 0}
+        assert distributor._get_least_occured_plan_recipe_id() == 2
+
+    def test_create_plan_unable_to_find_plan(self, mocker):
+        """
+        Test that an exception is raised if no plan within budget exists.
+        """
+        distributor = self._get_distributor(mocker, budget=Decimal("5.00"))
+
+        with pytest.raises(Exception):  # noqa: B017
+            distributor.create_plan()
+
+    def test_create_plan_branch_and_bound(self, mocker):
+        """
+        Test that the branch and bound solver finds a plan within budget where the
+        greedy solver gives up.
+        """
+        greedy_distributor = self._get_distributor(mocker, budget=Decimal("20.00"))
+
+        with pytest.raises(Exception):  # noqa: B017
+            greedy_distributor.create_plan()
+
+        distributor = self._get_distributor(
+            mocker, budget=Decimal("20.00"), solver=PlanSolver.BRANCH_AND_BOUND
+        )
+
+        plan = distributor.create_plan()
+
+        # Recipe 1 and 3 shares product 10, which only needs a single package.
+        assert plan == [1, 3]
+        assert distributor.plan_price == Decimal("20.00")
+
+    def test_create_plan_branch_and_bound_unable_to_find_plan(self, mocker):
+        """
+        Test that an exception is raised if no plan within budget exists.
+        """
+        distributor = self._get_distributor(
+            mocker, budget=Decimal("5.00"), solver=PlanSolver.BRANCH_AND_BOUND
+        )
+
+        with pytest.raises(Exception):  # noqa: B017
+            distributor.create_plan()
+
+    def test_create_plan_branch_and_bound_time_limit(self, mocker):
+        """
+        Test that the best plan found so far is returned when the time limit is
+        reached, and that an exception is raised if no plan was found in time.
+        """
+        distributor = self._get_distributor(
+            mocker,
+            budget=Decimal("40.00"),
+            solver=PlanSolver.BRANCH_AND_BOUND,
+            time_limit_seconds=1,
+        )
+
+        # The time limit is reached after the first plan, [1, 2], is found.
+        mocker.patch(
+            "nest.recipes.plans.algorithm.time.monotonic",
+            side_effect=itertools.chain([0, 0, 0], itertools.repeat(100)),
+        )
+
+        plan = distributor.create_plan()
+
+        assert plan == [1, 2]
+        assert distributor.plan_price == Decimal("40.00")
+
+        distributor = self._get_distributor(
+            mocker,
+            budget=Decimal("40.00"),
+            solver=PlanSolver.BRANCH_AND_BOUND,
+            time_limit_seconds=0,
+        )
+
+        with pytest.raises(Exception):  # noqa: B017
+            distributor.create_plan()
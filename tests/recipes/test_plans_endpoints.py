@@ -4,9 +4,15 @@ import pytest
 from django.urls import reverse
 from store_kit.http import status
 
-from nest.recipes.plans.endpoints import recipe_plan_list_for_home_api
+from nest.recipes.plans.endpoints import (
+    recipe_plan_list_for_home_api,
+    recipe_plan_shopping_list_api,
+)
 from tests.factories.endpoints import Endpoint, EndpointFactory, FactoryMock, Request
-from tests.factories.records import ReipcePlanRecordFactory
+from tests.factories.records import (
+    RecipePlanShoppingListRecordFactory,
+    ReipcePlanRecordFactory,
+)
 from tests.helpers.clients import authenticated_client
 
 recipe_plan_list_for_home_api_factory = EndpointFactory(
@@ -27,7 +33,31 @@ recipe_plan_list_for_home_api_factory = EndpointFactory(
     },
 )
 
-request_factories = [recipe_plan_list_for_home_api_factory]
+recipe_plan_shopping_list_api_factory = EndpointFactory(
+    endpoint=Endpoint(
+        url=reverse("api-1.0.0:recipe_plan_shopping_list_api", args=[1]),
+        view_func=recipe_plan_shopping_list_api,
+        mocks=[
+            FactoryMock(
+                "get_shopping_list_for_recipe_plan",
+                RecipePlanShoppingListRecordFactory.build(),
+            )
+        ],
+    ),
+    requests={
+        "authenticated_request": Request(
+            help="Test that normal users are able to get a plan's shopping list",
+            client=authenticated_client,
+            expected_status_code=status.HTTP_200_OK,
+            expected_mock_calls={"get_shopping_list_for_recipe_plan": 1},
+        ),
+    },
+)
+
+request_factories = [
+    recipe_plan_list_for_home_api_factory,
+    recipe_plan_shopping_list_api_factory,
+]
 
 
 @pytest.mark.parametrize("factory", request_factories)
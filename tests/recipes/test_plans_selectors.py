@@ -1,14 +1,18 @@
 from datetime import datetime, timedelta
+from decimal import Decimal
 
 import pytest
 from django.utils.timezone import make_aware
 from freezegun import freeze_time
 
 from nest.recipes.core.enums import RecipeStatus
+from nest.recipes.plans.models import RecipeProductRequirement
 from nest.recipes.plans.selectors import (
     find_recipes_applicable_for_plan,
+    get_product_requirements_for_recipes,
     get_recipe_plan_items_for_plans,
     get_recipe_plans_for_home,
+    get_shopping_list_for_recipe_plan,
 )
 from tests.factories.records import RecipeDetailRecordFactory
 from tests.helpers.types import AnyOrder
@@ -32,10 +36,10 @@ _GRACE_PERIOD = timedelta(weeks=2)
 def test_selector_find_recipes_applicable_for_plan(
     recipes, recipe_plans, recipe_plan_item, django_assert_num_queries
 ):
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(1):
         applicable_recipes = find_recipes_applicable_for_plan(grace_period_weeks=1)
 
-    recipe_ids = [recipe.id for recipe in applicable_recipes]
+    recipe_ids = applicable_recipes["recipe_id"].to_list()
 
     assert recipes["recipe1"].id in recipe_ids
     assert recipes["recipe3"].id not in recipe_ids
@@ -119,3 +123,117 @@ def test_selector_get_recipe_plans_for_home(
 
     assert {plan.id for plan in fetched_plans} == {plan1.id, plan3.id}
     plan_items_mock.assert_called_once_with(plan_ids=AnyOrder([plan1.id, plan3.id]))
+
+
+@pytest.mark.recipes(recipe1={"title": "Recipe 1"}, recipe2={"title": "Recipe 2"})
+@pytest.mark.products(
+    product1={"name": "Product 1", "gross_unit_price": Decimal("20.00")},
+    product2={"name": "Product 2", "gross_unit_price": Decimal("10.00")},
+)
+@pytest.mark.recipe_ingredients(
+    ingredient1={"title": "Cod", "product": "product1"},
+    ingredient2={"title": "Salt", "product": "product2", "is_base_ingredient": True},
+)
+def test_selector_get_product_requirements_for_recipes(
+    django_assert_num_queries, recipes, products, recipe_ingredients
+):
+    recipe1 = recipes["recipe1"]
+    recipe2 = recipes["recipe2"]
+    product1 = products["product1"]
+    product2 = products["product2"]
+
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe=recipe1, product=product1, required_amount=Decimal("0.5")
+            ),
+            RecipeProductRequirement(
+                recipe=recipe1, product=product2, required_amount=Decimal("0.1")
+            ),
+            RecipeProductRequirement(
+                recipe=recipe2, product=product1, required_amount=Decimal("1.5")
+            ),
+        ]
+    )
+
+    with django_assert_num_queries(1):
+        requirements_df = get_product_requirements_for_recipes(recipe_ids=[recipe1.id])
+
+    assert requirements_df.columns == [
+        "recipe_id",
+        "product_id",
+        "unit_price",
+        "required_amount",
+        "is_base_ingredient",
+    ]
+    assert sorted(requirements_df.rows()) == [
+        (recipe1.id, product1.id, Decimal("20.00"), Decimal("0.5"), False),
+        (recipe1.id, product2.id, Decimal("10.00"), Decimal("0.1"), True),
+    ]
+
+
+@pytest.mark.recipes(
+    recipe1={"title": "Recipe 1", "default_num_portions": 2},
+    recipe2={"title": "Recipe 2", "default_num_portions": 4},
+)
+@pytest.mark.products(
+    product1={"name": "Cod", "gross_price": Decimal("50.00")},
+    product2={"name": "Salt", "gross_price": Decimal("10.00")},
+    product3={"name": "Potatoes", "gross_price": Decimal("30.00")},
+)
+@pytest.mark.recipe_ingredients(
+    ingredient1={"title": "Cod", "product": "product1"},
+    ingredient2={"title": "Salt", "product": "product2", "is_base_ingredient": True},
+    ingredient3={"title": "Potatoes", "product": "product3"},
+)
+@pytest.mark.recipe_plans(plan1={"title": "Plan 1", "num_portions_per_recipe": 4})
+@pytest.mark.recipe_plan_items(
+    plan_item1={"recipe_plan": "plan1", "recipe": "recipe1"},
+    plan_item2={"recipe_plan": "plan1", "recipe": "recipe2"},
+)
+def test_selector_get_shopping_list_for_recipe_plan(
+    django_assert_num_queries,
+    recipes,
+    products,
+    recipe_ingredients,
+    recipe_plans,
+    recipe_plan_items,
+):
+    recipe1 = recipes["recipe1"]
+    recipe2 = recipes["recipe2"]
+    product1 = products["product1"]
+    product2 = products["product2"]
+    product3 = products["product3"]
+    plan1 = recipe_plans["plan1"]
+
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe=recipe1, product=product1, required_amount=Decimal("0.4")
+            ),
+            RecipeProductRequirement(
+                recipe=recipe1, product=product2, required_amount=Decimal("0.1")
+            ),
+            RecipeProductRequirement(
+                recipe=recipe2, product=product1, required_amount=Decimal("0.5")
+            ),
+            RecipeProductRequirement(
+                recipe=recipe2, product=product3, required_amount=None
+            ),
+        ]
+    )
+
+    with django_assert_num_queries(1):
+        shopping_list = get_shopping_list_for_recipe_plan(plan_id=plan1.id)
+
+    # Recipe 1 is doubled to match the plan's portions, base ingredients and products
+    # missing required amounts are left out.
+    assert [
+        (item.product_id, item.required_amount, item.num_packages, item.total_price)
+        for item in shopping_list.items
+    ] == [(product1.id, Decimal("1.3"), 2, Decimal("100.00"))]
+    assert shopping_list.total_price == Decimal("100.00")
+
+    # Consecutive calls are cached.
+    with django_assert_num_queries(0):
+        assert get_shopping_list_for_recipe_plan(plan_id=plan1.id) == shopping_list
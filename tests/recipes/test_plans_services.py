@@ -1,12 +1,29 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from decimal import Decimal
 
+import polars as pl
 import pytest
 from django.utils import timezone
 
+from nest.homes.records import HomeRecord
+from nest.recipes.core.models import Recipe
+from nest.recipes.core.selectors import get_recipe
 from nest.recipes.plans.algorithm import PlanDistributor
-from nest.recipes.plans.models import RecipePlan, RecipePlanItem
-from nest.recipes.plans.services import _create_recipe_plan_items, create_recipe_plan
-from tests.factories.records import RecipeDetailRecordFactory
+from nest.recipes.plans.models import (
+    RecipePlan,
+    RecipePlanItem,
+    RecipeProductRequirement,
+)
+from nest.recipes.plans.selectors import get_shopping_list_for_recipe_plan
+from nest.recipes.plans.services import (
+    _create_recipe_plan_items,
+    create_recipe_plan,
+    create_weekly_recipe_plans_for_homes,
+    invalidate_recipe_plan_shopping_lists_for_products,
+    update_recipe_product_requirements,
+    update_recipe_product_requirements_for_products,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -23,7 +40,15 @@ def test_service_create_recipe_plan(
     num_items = 1
     num_pescatarian = 1
     num_vegetarian = 1
-    applicable_recipes = []
+    applicable_recipes = pl.DataFrame(
+        schema={
+            "recipe_id": pl.Int64,
+            "default_num_portions": pl.Int64,
+            "is_pescatarian": pl.Boolean,
+            "is_vegetarian": pl.Boolean,
+            "num_plan_usages": pl.Int64,
+        }
+    )
 
     applicable_recipes_mock = mocker.patch(
         "nest.recipes.plans.services.find_recipes_applicable_for_plan",
@@ -60,6 +85,125 @@ def test_service_create_recipe_plan(
     create_items_mock.assert_called_once()
 
 
+@pytest.mark.homes(
+    home1={"street_address": "Road 1", "weekly_budget": Decimal("1000.00")},
+    home2={"street_address": "Road 2", "weekly_budget": Decimal("100.00")},
+)
+@pytest.mark.recipes(
+    **{f"recipe{i}": {"title": f"Recipe {i}", "slug": f"recipe-{i}"} for i in range(7)}
+)
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_service_create_weekly_recipe_plans_for_homes(
+    django_assert_max_num_queries, homes, recipes, product, max_workers
+):
+    """
+    Test that create_weekly_recipe_plans_for_homes creates plans for all homes that
+    has an applicable plan, both when solving plans in and out of process.
+    """
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe=recipe, product=product, required_amount=Decimal("0.5")
+            )
+            for recipe in recipes.values()
+        ]
+    )
+    home1 = homes["home1"]
+    home2 = homes["home2"]
+
+    with django_assert_max_num_queries(8):
+        home_ids = create_weekly_recipe_plans_for_homes(
+            homes=[HomeRecord.from_home(home1), HomeRecord.from_home(home2)],
+            from_date=timezone.now().date(),
+            auto_generated=True,
+            max_workers=max_workers,
+        )
+
+    # All 7 recipes needs 4 products in total, which exceeds the budget of home 2.
+    assert home_ids == [home1.id]
+    assert not RecipePlan.objects.filter(home=home2).exists()
+
+    plan = RecipePlan.objects.get(home=home1)
+    plan_items = list(plan.plan_items.all())
+
+    assert sorted(item.recipe_id for item in plan_items) == sorted(
+        recipe.id for recipe in recipes.values()
+    )
+    assert [item.ordering for item in plan_items] == list(range(1, 8))
+
+
+@pytest.mark.homes(
+    home1={"street_address": "Road 1"},
+    home2={"street_address": "Road 2"},
+)
+@pytest.mark.recipes(
+    **{f"recipe{i}": {"title": f"Recipe {i}", "slug": f"recipe-{i}"} for i in range(7)}
+)
+def test_service_create_weekly_recipe_plans_for_homes_errors(homes, recipes, mocker):
+    """
+    Test that create_weekly_recipe_plans_for_homes only skips homes where no plan
+    could be found or whose worker process died, and that other errors propagate.
+    """
+    home_records = [HomeRecord.from_home(home) for home in homes.values()]
+    recipe_ids = [recipe.id for recipe in recipes.values()]
+
+    mocker.patch(
+        "nest.recipes.plans.services._solve_weekly_recipe_plan",
+        side_effect=TypeError("Programming error"),
+    )
+
+    with pytest.raises(TypeError):
+        create_weekly_recipe_plans_for_homes(
+            homes=home_records, from_date=timezone.now().date(), max_workers=1
+        )
+
+    def get_future(*, result=None, exception=None):
+        future = Future()
+
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+        return future
+
+    executor_mock = mocker.patch("nest.recipes.plans.services.ProcessPoolExecutor")
+    mocker.patch("nest.recipes.plans.services.workers.dump_shared_recipe_plan_data")
+    submit_mock = executor_mock.return_value.__enter__.return_value.submit
+
+    # Homes whose worker died are skipped, as long as some plans were solved.
+    submit_mock.side_effect = [
+        get_future(result=recipe_ids),
+        get_future(exception=BrokenProcessPool()),
+    ]
+
+    home_ids = create_weekly_recipe_plans_for_homes(
+        homes=home_records, from_date=timezone.now().date(), max_workers=2
+    )
+
+    assert home_ids == [home_records[0].id]
+
+    submit_mock.side_effect = [
+        get_future(exception=BrokenProcessPool()),
+        get_future(exception=BrokenProcessPool()),
+    ]
+
+    with pytest.raises(BrokenProcessPool):
+        create_weekly_recipe_plans_for_homes(
+            homes=home_records, from_date=timezone.now().date(), max_workers=2
+        )
+
+    submit_mock.side_effect = [
+        get_future(result=recipe_ids),
+        get_future(exception=KeyError("home")),
+    ]
+
+    with pytest.raises(KeyError):
+        create_weekly_recipe_plans_for_homes(
+            homes=home_records, from_date=timezone.now().date(), max_workers=2
+        )
+
+
 @pytest.mark.recipes(
     recipe1={"title": " Recipe 1"},
     recipe2={"title": " Recipe 2"},
@@ -67,21 +211,148 @@ def test_service_create_recipe_plan(
 )
 @pytest.mark.recipe_plan(title="My plan")
 def test_service__create_recipe_plan_items(
-    django_assert_num_queries, recipes, recipe_plan
+    django_assert_num_queries, django_capture_on_commit_callbacks, recipes, recipe_plan
 ):
     """
     Test that the _create_recipe_plan_items creates plan items associated to the correct
-    recipe plan.
+    recipe plan, and that cached recipe details are invalidated.
     """
-    recipe_records = [
-        RecipeDetailRecordFactory.build(id=recipe.id) for recipe in recipes.values()
-    ]
+    recipe_ids = [recipe.id for recipe in recipes.values()]
 
     initial_count = RecipePlanItem.objects.filter(recipe_plan_id=recipe_plan.id).count()
+    initial_num_plan_usages = get_recipe(pk=recipe_ids[0]).num_plan_usages
 
-    with django_assert_num_queries(2):
-        _create_recipe_plan_items(plan_id=recipe_plan.id, recipes=recipe_records)
+    with (
+        django_assert_num_queries(3),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        _create_recipe_plan_items(plan_id=recipe_plan.id, recipe_ids=recipe_ids)
+
+    assert initial_num_plan_usages == 0
+    assert get_recipe(pk=recipe_ids[0]).num_plan_usages == 1
 
     assert RecipePlanItem.objects.filter(
         recipe_plan_id=recipe_plan.id
-    ).count() == initial_count + len(recipe_records)
+    ).count() == initial_count + len(recipe_ids)
+    assert set(
+        Recipe.objects.filter(id__in=recipe_ids).values_list(
+            "num_plan_usages", flat=True
+        )
+    ) == {1}
+
+
+@pytest.mark.recipe
+@pytest.mark.products(
+    product1={"name": "Product 1", "unit": "kg", "unit_quantity": Decimal("1.00")},
+    product2={"name": "Product 2", "unit": "kg", "unit_quantity": None},
+    product3={"name": "Product 3"},
+)
+@pytest.mark.recipe_ingredients(
+    ingredient1={"title": "Cod", "product": "product1"},
+    ingredient2={"title": "Parsly", "product": "product2"},
+)
+@pytest.mark.recipe_ingredient_item_groups(
+    group1={"ordering": 1}, group2={"ordering": 2}
+)
+@pytest.mark.recipe_ingredient_items(
+    item1={
+        "ingredient_group": "group1",
+        "ingredient": "ingredient1",
+        "portion_quantity": Decimal("250.00"),
+        "portion_quantity_unit": "g",
+    },
+    item2={
+        "ingredient_group": "group2",
+        "ingredient": "ingredient1",
+        "portion_quantity": Decimal("500.00"),
+        "portion_quantity_unit": "g",
+    },
+    item3={
+        "ingredient_group": "group2",
+        "ingredient": "ingredient2",
+        "portion_quantity": Decimal("100.00"),
+        "portion_quantity_unit": "g",
+    },
+)
+def test_service_update_recipe_product_requirements(
+    django_assert_num_queries, recipe, products, recipe_ingredient_items
+):
+    """
+    Test that update_recipe_product_requirements replaces the existing requirements
+    with the required amount of each product in the recipe.
+    """
+    RecipeProductRequirement.objects.create(
+        recipe=recipe, product=products["product3"], required_amount=Decimal("1")
+    )
+
+    with django_assert_num_queries(6):
+        update_recipe_product_requirements(recipe_ids=[recipe.id])
+
+    requirements = {
+        requirement.product_id: requirement.required_amount
+        for requirement in RecipeProductRequirement.objects.filter(recipe=recipe)
+    }
+
+    assert requirements == {
+        # Amounts of the same product are combined.
+        products["product1"].id: Decimal("0.75"),
+        # Product 2 is missing unit quantity.
+        products["product2"].id: None,
+    }
+
+    product = products["product1"]
+    product.unit_quantity = Decimal("0.50")
+    product.save()
+
+    update_recipe_product_requirements_for_products(product_ids=[product.id])
+
+    assert RecipeProductRequirement.objects.get(
+        recipe=recipe, product=product
+    ).required_amount == Decimal("1.5")
+
+
+@pytest.mark.recipes(recipe1={"title": "Recipe 1"}, recipe2={"title": "Recipe 2"})
+@pytest.mark.products(product1={"name": "Product 1"}, product2={"name": "Product 2"})
+@pytest.mark.recipe_plans(plan1={"title": "Plan 1"}, plan2={"title": "Plan 2"})
+@pytest.mark.recipe_plan_items(
+    plan_item1={"recipe_plan": "plan1", "recipe": "recipe1"},
+    plan_item2={"recipe_plan": "plan2", "recipe": "recipe2"},
+)
+def test_service_invalidate_recipe_plan_shopping_lists_for_products(
+    django_assert_num_queries, recipes, products, recipe_plans, recipe_plan_items
+):
+    """
+    Test that only cached shopping lists for plans using the given products are
+    invalidated.
+    """
+    plan1 = recipe_plans["plan1"]
+    plan2 = recipe_plans["plan2"]
+
+    RecipeProductRequirement.objects.bulk_create(
+        [
+            RecipeProductRequirement(
+                recipe=recipes["recipe1"],
+                product=products["product1"],
+                required_amount=Decimal("1"),
+            ),
+            RecipeProductRequirement(
+                recipe=recipes["recipe2"],
+                product=products["product2"],
+                required_amount=Decimal("1"),
+            ),
+        ]
+    )
+
+    get_shopping_list_for_recipe_plan(plan_id=plan1.id)
+    get_shopping_list_for_recipe_plan(plan_id=plan2.id)
+
+    with django_assert_num_queries(1):
+        invalidate_recipe_plan_shopping_lists_for_products(
+            product_ids=[products["product1"].id]
+        )
+
+    with django_assert_num_queries(1):
+        get_shopping_list_for_recipe_plan(plan_id=plan1.id)
+
+    with django_assert_num_queries(0):
+        get_shopping_list_for_recipe_plan(plan_id=plan2.id)
@@ -101,7 +101,7 @@ def test_service_create_or_update_recipe_steps(
 
     initial_step_count = RecipeStep.objects.count()
 
-    with immediate_on_commit, django_assert_num_queries(4):
+    with immediate_on_commit, django_assert_num_queries(5):
         create_or_update_recipe_steps(recipe_id=recipe.id, steps=data)
 
     # A step already exists, but a new one should be created as well, bringing the total
@@ -112,6 +112,12 @@ def test_service_create_or_update_recipe_steps(
 
     assert recipe_step.duration == timedelta(minutes=new_duration)
 
+    recipe.refresh_from_db()
+
+    assert recipe.preparation_time == timedelta(minutes=5)
+    assert recipe.cooking_time == timedelta(minutes=new_duration)
+    assert recipe.total_time == timedelta(minutes=new_duration + 5)
+
     create_ingredient_items_mock.assert_called_once_with(
         recipe_id=recipe.id, steps=data
     )